@@ -0,0 +1,22 @@
+"""Executor._safe_decode, applied to every output line of foreground and live runs."""
+import pytest
+
+from executor import Executor
+
+LINES = 1000
+
+SAMPLES = {
+    "ascii": b"zotonic | 12:00:01 [info] <0.123.0> processed request 42 in 3ms\n",
+    "ansi": b"\x1b[32mzotonic\x1b[0m | ===> \x1b[1mCompiling\x1b[0m z_module_indexer\n",
+    "utf8": "superleme | configuração do módulo ação concluída — ñ ü\n".encode("utf-8"),
+    "latin1": "superleme | configuração inválida\n".encode("latin-1"),
+    "control": b"progress \x08\x08\x08 50%\r\x07 done\x1b[2K\n",
+}
+
+
+@pytest.mark.parametrize("kind", sorted(SAMPLES))
+def bench_safe_decode(benchmark, kind):
+    lines = [SAMPLES[kind]] * LINES
+    decode = Executor._safe_decode
+    result = benchmark(lambda: [decode(line) for line in lines])
+    assert len(result) == LINES
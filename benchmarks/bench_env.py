@@ -0,0 +1,52 @@
+"""`.env` updates done before Docker runs (ConfigManager.update_docker_versions, EnvFile)."""
+import os
+
+from config import ConfigManager, EnvFile
+
+CONFIG = {"postgres_version": "17-alpine", "languages": '{"erlang": "28", "elixir": "1.19.4", "node": "25.2.1"}'}
+
+
+def _env_file(tmp_path, keys=40):
+    path = tmp_path / ".env"
+    lines = ["# generated for the benchmark", "COMPOSE_PROJECT_NAME=zotonic"]
+    lines += [f"SETTING_{i}=value_{i}" for i in range(keys)]
+    path.write_text("\n".join(lines) + "\n")
+    return str(tmp_path)
+
+
+def bench_update_unchanged(benchmark, tmp_path):
+    """Values already in the file: parse and compare, no write (first call of a session)."""
+    cwd = _env_file(tmp_path)
+    ConfigManager.update_docker_versions(cwd, CONFIG)
+    mtime = os.stat(os.path.join(cwd, ".env")).st_mtime_ns
+
+    def update():
+        ConfigManager._env_synced.clear()
+        return ConfigManager.update_docker_versions(cwd, CONFIG)
+
+    assert benchmark(update) is False
+    assert os.stat(os.path.join(cwd, ".env")).st_mtime_ns == mtime
+
+
+def bench_update_memoized(benchmark, tmp_path):
+    """Repeated calls in the same session: one stat."""
+    cwd = _env_file(tmp_path)
+    ConfigManager.update_docker_versions(cwd, CONFIG)
+    assert benchmark(ConfigManager.update_docker_versions, cwd, CONFIG) is False
+
+
+def bench_update_changed(benchmark, tmp_path):
+    """A version change on every call: merge and atomic rewrite."""
+    cwd = _env_file(tmp_path)
+    versions = iter(range(10 ** 9))
+
+    def update():
+        return ConfigManager.update_docker_versions(cwd, dict(CONFIG, postgres_version=f"{next(versions)}-alpine"))
+
+    assert benchmark(update) is True
+
+
+def bench_env_file_parse(benchmark, tmp_path):
+    path = os.path.join(_env_file(tmp_path, keys=400), ".env")
+    env = benchmark(EnvFile, path)
+    assert env.get("SETTING_399") == "value_399"
@@ -0,0 +1,45 @@
+"""
+Output loops of Executor: the foreground loop of run_command and the live
+split view of run_multiple, driven by children that print as fast as they can
+(locally and through the fake docker).
+"""
+from conftest import chatty_child
+from executor import Executor
+
+LINES = 20_000
+
+
+def bench_foreground_output(benchmark, tmp_path):
+    command = chatty_child(LINES)
+    process = benchmark.pedantic(
+        Executor.run_command, args=(command, str(tmp_path)), kwargs={"background": False},
+        rounds=3, iterations=1
+    )
+    assert process.returncode == 0
+    benchmark.extra_info["lines"] = LINES
+
+
+def bench_foreground_docker(benchmark, fake_docker, compose_project, monkeypatch):
+    monkeypatch.setenv("FAKE_DOCKER_LINES", str(LINES))
+    process = benchmark.pedantic(
+        Executor.run_command, args=("make", compose_project),
+        kwargs={"background": False, "use_docker": True, "docker_config": {"postgres_version": "17-alpine"}},
+        rounds=3, iterations=1
+    )
+    assert process.returncode == 0
+    # The resource sampler calls `docker stats` concurrently; look for the run itself
+    assert any(line.startswith("compose ") for line in fake_docker.read_text().splitlines())
+    benchmark.extra_info["lines"] = LINES
+
+
+def bench_live_output(benchmark, tmp_path):
+    """Two chatty children in the split view (includes its fixed 1s wind-down)."""
+    left, right = tmp_path / "left", tmp_path / "right"
+    left.mkdir()
+    right.mkdir()
+    commands = [(chatty_child(LINES), str(left), False), (chatty_child(LINES), str(right), False)]
+
+    processes = benchmark.pedantic(Executor.run_multiple, args=(commands,), kwargs={"background": True},
+                                   rounds=3, iterations=1)
+    assert [p.returncode for p in processes] == [0, 0]
+    benchmark.extra_info["lines"] = 2 * LINES
@@ -0,0 +1,95 @@
+"""
+Pathing.auto_detect_folders on a generated home directory shaped like a
+developer machine: node_modules, _build, deps and .git trees next to the
+projects, plus other users' documents with unrelated package.json files.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+import pathing.scanner
+from pathing.main import Pathing
+
+# Size of the generated home (directories + files); BENCH_HOME_ENTRIES overrides it
+ENTRIES = int(os.environ.get("BENCH_HOME_ENTRIES", "100000"))
+
+
+class _Tree:
+    def __init__(self, base):
+        self.base = base
+        self.entries = 0
+
+    def mkdir(self, *parts):
+        path = os.path.join(self.base, *parts)
+        os.makedirs(path, exist_ok=True)
+        self.entries += 1
+        return path
+
+    def files(self, directory, count, prefix="f", content=""):
+        for i in range(count):
+            with open(os.path.join(directory, f"{prefix}{i}"), "w") as f:
+                f.write(content)
+        self.entries += count
+
+    def write(self, directory, name, content=""):
+        with open(os.path.join(directory, name), "w") as f:
+            f.write(content)
+        self.entries += 1
+
+
+def build_home(base, entries, with_extension=True):
+    """Create the synthetic /home. `entries` scales the heavy directories."""
+    t = _Tree(base)
+    scale = entries / 100_000
+
+    # /home/devel: zotonic checkout with a large _build
+    t.mkdir("devel", "zotonic", "apps_user", "superleme", "src")
+    for i in range(int(200 * scale)):
+        t.files(t.mkdir("devel", "zotonic", "_build", "default", "lib", f"dep{i}"), 50, "mod", "")
+
+    # /home/user: phoenix project with deps, chrome extension with node_modules, .git objects
+    phoenix = t.mkdir("user", "projects", "sl_phoenix")
+    t.write(phoenix, "mix.exs")
+    t.mkdir("user", "projects", "sl_phoenix", "lib")
+    for i in range(int(300 * scale)):
+        t.files(t.mkdir("user", "projects", "sl_phoenix", "deps", f"dep{i}"), 30)
+
+    plugin = t.mkdir("user", "projects", "plugin-simulacao")
+    t.write(plugin, "package.json", json.dumps({"name": "plugin-simulacao" if with_extension else "webapp"}))
+    t.write(plugin, "popup.html")
+    for i in range(int(1500 * scale)):
+        t.files(t.mkdir("user", "projects", "plugin-simulacao", "node_modules", f"pkg{i}"), 20)
+
+    for i in range(int(256 * scale)):
+        t.files(t.mkdir("user", "projects", "sl_phoenix", ".git", "objects", f"{i:02x}"), 40)
+
+    # Other users with ordinary files and a few unrelated package.json projects
+    for user in ("alice", "bob"):
+        for i in range(int(400 * scale)):
+            directory = t.mkdir(user, "documents", f"dir{i}")
+            t.files(directory, 50)
+            if i % 10 == 0:
+                t.write(directory, "package.json", json.dumps({"name": f"site{i}"}))
+
+    return t.entries
+
+
+@pytest.fixture(scope="module", params=[True, False], ids=["all-found", "extension-missing"])
+def home(request):
+    base = tempfile.mkdtemp(prefix="aedificator_bench_home_")
+    build_home(base, ENTRIES, with_extension=request.param)
+    yield base, request.param
+    shutil.rmtree(base, ignore_errors=True)
+
+
+def bench_auto_detect_folders(benchmark, monkeypatch, home):
+    base, with_extension = home
+    roots = [os.path.join(base, "devel"), os.path.join(base, "user"), base]
+    monkeypatch.setattr(pathing.scanner, "default_search_roots", lambda: roots)
+
+    detected = benchmark(Pathing.auto_detect_folders)
+    assert detected["superleme_path"] and detected["sl_phoenix_path"]
+    assert bool(detected["extension_path"]) == with_extension
@@ -0,0 +1,59 @@
+"""
+Background base-image prefetch (aedificator.docker.ImagePrefetcher) against the
+fake docker standing in for a local registry mirror: pull, tag to the
+canonical name, images queued while a prefetch is running, and failures.
+"""
+from aedificator.docker import ImagePrefetcher
+
+IMAGES = ["erlang:28", "postgres:17-alpine", "hexpm/elixir:1.19.4-erlang-28-debian-bookworm-slim"]
+MIRROR = "localhost:5000"
+
+
+def _prefetch(images):
+    prefetcher = ImagePrefetcher(images, mirror=MIRROR).start()
+    assert prefetcher.wait(timeout=30)
+    return prefetcher
+
+
+def bench_prefetch_mirror(benchmark, fake_docker, monkeypatch):
+    monkeypatch.setenv("FAKE_DOCKER_LATENCY", "0.01")
+    prefetcher = benchmark.pedantic(_prefetch, args=(IMAGES,), rounds=3, iterations=1)
+
+    assert prefetcher.state == {image: "ok" for image in IMAGES}
+    assert not prefetcher.failed
+    log = fake_docker.read_text().splitlines()
+    assert f"pull {MIRROR}/library/erlang:28" in log
+    assert f"tag {MIRROR}/library/erlang:28 erlang:28" in log
+    # Images with a namespace are not moved under library/
+    assert f"pull {MIRROR}/hexpm/elixir:1.19.4-erlang-28-debian-bookworm-slim" in log
+    assert prefetcher.status_line().startswith(f"Imagens base: {len(IMAGES)}/{len(IMAGES)} baixadas")
+    benchmark.extra_info["images"] = len(IMAGES)
+
+
+def bench_prefetch_queue_while_running(benchmark, fake_docker, monkeypatch):
+    """Images a second settings change brings in join the prefetch already running."""
+    monkeypatch.setenv("FAKE_DOCKER_LATENCY", "0.3")
+
+    def run():
+        prefetcher = ImagePrefetcher(IMAGES[:1], mirror=MIRROR).start()
+        queued = prefetcher.add(IMAGES[1:] + IMAGES[:1])
+        assert prefetcher.wait(timeout=30)
+        return prefetcher, queued
+
+    prefetcher, queued = benchmark.pedantic(run, rounds=1, iterations=1)
+    assert queued
+    assert prefetcher.images == IMAGES
+    assert prefetcher.state == {image: "ok" for image in IMAGES}
+    # Once finished it takes no more images: the menu starts a new prefetch
+    assert not prefetcher.add(["node:25.2.1"])
+
+
+def bench_prefetch_failure(benchmark, fake_docker, monkeypatch):
+    monkeypatch.setenv("FAKE_DOCKER_LATENCY", "0.01")
+    monkeypatch.setenv("FAKE_DOCKER_EXIT", "1")
+    prefetcher = benchmark.pedantic(_prefetch, args=(IMAGES[:1],), rounds=1, iterations=1)
+
+    assert list(prefetcher.failed) == IMAGES[:1]
+    assert "not found" in prefetcher.failed[IMAGES[0]]
+    assert "tag " not in fake_docker.read_text()
+    assert "falhas: erlang:28" in prefetcher.status_line()
@@ -0,0 +1,19 @@
+"""DockerTemplates rendering (Dockerfiles and docker-compose.yml)."""
+import pytest
+
+from aedificator.docker.templates import DockerTemplates
+
+RENDERS = {
+    "superleme_dockerfile": lambda: DockerTemplates.superleme_dockerfile("28", "17-alpine"),
+    "phoenix_dockerfile": lambda: DockerTemplates.phoenix_dockerfile("1.19.4", "28", "25.2.1"),
+    "superleme_phoenix_dockerfile": lambda: DockerTemplates.superleme_phoenix_dockerfile("28", "1.19.4", "25.2.1"),
+    "compose_superleme": lambda: DockerTemplates.docker_compose("superleme", "17-alpine"),
+    "compose_full": lambda: DockerTemplates.docker_compose("full", "17-alpine"),
+    "init_postgres": DockerTemplates.init_postgres_script,
+}
+
+
+@pytest.mark.parametrize("name", sorted(RENDERS))
+def bench_render(benchmark, name):
+    content = benchmark(RENDERS[name])
+    assert content
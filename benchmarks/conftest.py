@@ -0,0 +1,59 @@
+"""
+Shared setup of the benchmark suite: `src` on sys.path, a throw-away data
+directory (database and logs), the fake docker executable on PATH and
+synthetic children that print at a high rate.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FAKES = os.path.join(HERE, "fakes")
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+
+# Before anything from the tool is imported: it resolves the data directory on use
+DATA_DIR = tempfile.mkdtemp(prefix="aedificator_bench_data_")
+os.environ["AEDIFICATOR_DATA_DIR"] = DATA_DIR
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    from aedificator.memory import initialize_database, ensure_schema, MODELS
+    db = initialize_database()
+    ensure_schema(db, MODELS)
+    yield db
+    db.close()
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def fake_docker(monkeypatch, tmp_path):
+    """The fake `docker` first on PATH; returns the file its invocations are logged to."""
+    log = tmp_path / "docker.log"
+    monkeypatch.setenv("PATH", FAKES + os.pathsep + os.environ["PATH"])
+    monkeypatch.setenv("FAKE_DOCKER_LOG", str(log))
+    return log
+
+
+@pytest.fixture
+def compose_project(tmp_path):
+    """A Zotonic checkout with a docker-compose.yml (the path has to contain 'zotonic')."""
+    root = tmp_path / "zotonic"
+    root.mkdir()
+    (root / "docker-compose.yml").write_text("services:\n  zotonic:\n    image: zotonic:latest\n")
+    (root / ".env").write_text("# local overrides\nCOMPOSE_PROJECT_NAME=zotonic\nPOSTGRES_VERSION=16-alpine\n")
+    return str(root)
+
+
+def chatty_child(lines: int, width: int = 80) -> str:
+    """Shell command of a child printing `lines` lines (with ANSI colors and accents) as fast as it can."""
+    script = (
+        "import sys\n"
+        "w = sys.stdout.write\n"
+        f"for i in range({lines}):\n"
+        f"    w('\\x1b[36m[%06d]\\x1b[0m compilando módulo ação ' % i + 'x' * {max(width - 40, 0)} + '\\n')\n"
+    )
+    return f"{sys.executable} -c \"{script}\""
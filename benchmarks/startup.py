@@ -0,0 +1,128 @@
+"""
+Benchmark: CLI start-up (time-to-first-menu) and import profile.
+
+Seeds a throw-away data directory so start-up goes straight to the main menu,
+then runs src/cli.py under `python -X importtime` through a small driver that
+replaces Menu.show_main_menu with a probe: it prints the time since the driver
+started and returns before prompting. Nothing in the tool itself is involved.
+
+    python benchmarks/startup.py [--repeat 10] [--top 15]
+"""
+import argparse
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SRC = os.path.join(ROOT, "src")
+CLI = os.path.join(SRC, "cli.py")
+
+# Modules that should only be imported by the menu action that needs them
+# (asyncio is not listed: prompt_toolkit, behind questionary, imports it)
+LAZY_MODULES = ["jinja2", "pyrlang", "aedificator.docker", "backup", "playhouse.migrate", "rich.pretty"]
+
+_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+_PROBE = re.compile(r'startup-probe: ([\d.]+) ms')
+
+# Driver run in place of `python src/cli.py`: the clock starts before any import
+_DRIVER = """
+import time
+_started = time.perf_counter()
+import runpy
+import sys
+sys.path.insert(0, {src!r})
+import menu
+
+def _probe(self):
+    print(f"startup-probe: {{(time.perf_counter() - _started) * 1000:.1f}} ms")
+
+menu.Menu.show_main_menu = _probe
+sys.argv = [{cli!r}]
+runpy.run_path({cli!r}, run_name="__main__")
+"""
+
+_SEED = """
+import os
+from aedificator.memory import initialize_database, ensure_schema, Paths, DockerConfiguration, MODELS
+db = initialize_database()
+ensure_schema(db, MODELS)
+Paths.create(superleme_path=os.environ["SL"], sl_phoenix_path=os.environ["PHX"], extension_path=os.environ["EXT"])
+DockerConfiguration.create(project_name="superleme", use_docker=True, postgres_version="17-alpine",
+                           languages='{"erlang": "28", "postgresql": "17-alpine"}')
+DockerConfiguration.create(project_name="sl_phoenix", use_docker=False, languages="{}")
+"""
+
+
+def seed(base):
+    projects = {
+        "SL": os.path.join(base, "home", "zotonic", "apps_user", "superleme"),
+        "PHX": os.path.join(base, "home", "sl_phoenix"),
+        "EXT": os.path.join(base, "home", "plugin-simulacao"),
+    }
+    for path in projects.values():
+        os.makedirs(path)
+    env = dict(os.environ, AEDIFICATOR_DATA_DIR=os.path.join(base, "data"), PYTHONPATH=SRC, **projects)
+    subprocess.run([sys.executable, "-c", _SEED], env=env, check=True)
+    return env
+
+
+def parse_importtime(stderr):
+    """Return {module: (self_us, cumulative_us)} for top-level and nested imports."""
+    modules = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    base = tempfile.mkdtemp(prefix="aedificator_bench_startup_")
+    try:
+        env = seed(base)
+        driver = _DRIVER.format(src=SRC, cli=CLI)
+
+        wall, probe = [], []
+        modules = {}
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", driver],
+                env=env, stdin=subprocess.DEVNULL, capture_output=True, text=True
+            )
+            wall.append(time.perf_counter() - started)
+            match = _PROBE.search(result.stdout)
+            if not match:
+                print(result.stdout)
+                print(result.stderr[-2000:])
+                sys.exit("start-up probe not reached")
+            probe.append(float(match.group(1)))
+            modules = parse_importtime(result.stderr)
+
+        print(f"{args.repeat} runs (-X importtime adds overhead to both figures)")
+        print(f"  process wall time    median {statistics.median(wall) * 1000:7.1f} ms   min {min(wall) * 1000:7.1f} ms")
+        print(f"  time-to-first-menu   median {statistics.median(probe):7.1f} ms   min {min(probe):7.1f} ms")
+        print(f"  modules imported     {len(modules)}")
+
+        print(f"\nTop {args.top} imports by cumulative time (last run):")
+        for name, (self_us, cumulative_us) in sorted(modules.items(), key=lambda m: m[1][1], reverse=True)[:args.top]:
+            print(f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:7.1f} ms self  {name}")
+
+        eager = [name for name in LAZY_MODULES if name in modules]
+        print("\nLazy modules imported at start-up: " + (", ".join(eager) if eager else "none"))
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 from rich.console import Console
 from rich.theme import Theme
-from rich.pretty import install as _install_pretty
 
 # Theme colors for nicer console output
 _theme = Theme({
@@ -13,7 +12,4 @@ _theme = Theme({
 # Shared, configured Console for the package
 console = Console(theme=_theme, markup=True, emoji=True, highlight=True)
 
-# Install pretty reprs to use the configured console
-_install_pretty(console=console)
-
 __all__ = ["console"]
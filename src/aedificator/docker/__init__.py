@@ -6,8 +6,12 @@ This package handles Docker-related operations including:
 - Docker image building
 - Image pushing to registries
 - docker-compose.yml generation
+- Background prefetch of base images
+- Shared dependency cache volumes
 """
 
 from .manager import DockerManager
+from .prefetch import ImagePrefetcher
+from .cache import CacheVolumes, CACHE_VOLUMES
 
-__all__ = ["DockerManager"]
+__all__ = ["DockerManager", "ImagePrefetcher", "CacheVolumes", "CACHE_VOLUMES"]
@@ -0,0 +1,141 @@
+"""
+Named volumes holding the hex, npm and rebar3 download caches, shared by the
+Superleme and Phoenix services and by every one-off `docker compose run`.
+"""
+
+import json
+import os
+import re
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional
+from .. import console
+
+# key -> (volume name, mount point in the containers, variable pointing the tool at it,
+#         projects whose runs read the cache)
+CACHE_VOLUMES = {
+    "hex": ("aedificator_hex_cache", "/cache/hex", "HEX_HOME", ("superleme", "sl_phoenix")),
+    "npm": ("aedificator_npm_cache", "/cache/npm", "npm_config_cache", ("sl_phoenix",)),
+    "rebar3": ("aedificator_rebar3_cache", "/cache/rebar3", "REBAR_CACHE_DIR", ("superleme", "sl_phoenix")),
+}
+
+_UNITS = {"B": 1, "kB": 1000, "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3, "TB": 1000 ** 4}
+
+
+def _parse_size(text: str) -> Optional[int]:
+    """Bytes from docker's human sizes ("1.25GB", "0B")."""
+    match = re.match(r'^\s*([\d.]+)\s*([kKMGT]?B)\s*$', text or "")
+    if not match:
+        return None
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+class CacheVolumes:
+    """Mount flags and usage statistics of the shared dependency caches."""
+
+    @staticmethod
+    def run_flags(cwd: str) -> str:
+        """
+        `docker compose run` options mounting the caches, for compose files that
+        do not declare them (generated before the caches existed, or written by
+        hand); empty when the compose file already mounts them.
+        """
+        for name in ("docker-compose.yml", "docker-compose.yaml"):
+            try:
+                with open(os.path.join(cwd, name), 'r') as f:
+                    compose = f.read()
+                break
+            except OSError:
+                continue
+        else:
+            return ""
+
+        flags = []
+        for volume, mount, variable, _ in CACHE_VOLUMES.values():
+            if volume not in compose:
+                flags.append(f"-v {volume}:{mount} -e {variable}={mount}")
+        return " ".join(flags)
+
+    @staticmethod
+    def _created_at(docker: str = "docker") -> Dict[str, datetime]:
+        names = [volume for volume, _, _, _ in CACHE_VOLUMES.values()]
+        try:
+            result = subprocess.run(
+                [docker, "volume", "inspect", "--format", "{{.Name}} {{.CreatedAt}}"] + names,
+                capture_output=True, text=True, timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return {}
+        created = {}
+        for line in result.stdout.splitlines():
+            name, _, stamp = line.partition(" ")
+            try:
+                created[name] = datetime.fromisoformat(stamp.strip()).astimezone().replace(tzinfo=None)
+            except ValueError:
+                continue
+        return created
+
+    @staticmethod
+    def _sizes(docker: str = "docker") -> Dict[str, int]:
+        try:
+            result = subprocess.run(
+                [docker, "system", "df", "-v", "--format", "json"],
+                capture_output=True, text=True, timeout=120
+            )
+            volumes = json.loads(result.stdout).get("Volumes") or []
+        except (OSError, subprocess.TimeoutExpired, ValueError, AttributeError):
+            return {}
+        return {entry.get("Name"): _parse_size(entry.get("Size")) for entry in volumes}
+
+    @staticmethod
+    def stats(docker: str = "docker") -> List[Dict]:
+        """
+        Per cache: volume size and the Docker runs of the projects using it since
+        the volume was created. How much each run would have downloaded without
+        the cache is not known (most runs fetch little or nothing), so no savings
+        figure is derived from these.
+        """
+        from ..memory import CommandRun
+
+        created = CacheVolumes._created_at(docker)
+        sizes = CacheVolumes._sizes(docker)
+        rows = []
+        for key, (volume, mount, _, projects) in CACHE_VOLUMES.items():
+            size = sizes.get(volume)
+            runs = 0
+            if volume in created:
+                try:
+                    runs = (CommandRun.select()
+                            .where(CommandRun.use_docker & CommandRun.project.in_(projects)
+                                   & (CommandRun.started_at >= created[volume]))
+                            .count())
+                except Exception:
+                    runs = 0
+            rows.append({
+                "cache": key,
+                "volume": volume,
+                "mount": mount,
+                "exists": volume in created,
+                "size": size,
+                "runs": runs,
+            })
+        return rows
+
+    @staticmethod
+    def show_stats():
+        from rich.table import Table
+        from process.sampler import format_bytes
+
+        rows = CacheVolumes.stats()
+        table = Table(title="Caches de dependências (volumes Docker)")
+        table.add_column("Cache")
+        table.add_column("Volume")
+        table.add_column("Tamanho", justify="right")
+        table.add_column("Execuções desde a criação", justify="right")
+        for row in rows:
+            if not row["exists"]:
+                table.add_row(row["cache"], row["volume"], "[dim]ainda não criado[/dim]", "-")
+                continue
+            size = format_bytes(row["size"]) if row["size"] is not None else "?"
+            table.add_row(row["cache"], row["volume"], size, str(row["runs"]))
+        console.print(table)
@@ -3,12 +3,13 @@ Main Docker manager that coordinates all Docker operations.
 """
 
 import os
-import json
-from typing import Dict
+from typing import Dict, List
 from .. import console
-from ..memory import DockerConfiguration
+from ..memory import ConfigCache, LanguageVersions
 from .templates import DockerTemplates
 from .operations import DockerOperations
+from ..tracing import traced
+from config import ConfigManager
 
 
 class DockerManager:
@@ -17,7 +18,8 @@ class DockerManager:
     @staticmethod
     def load_config_from_db(project_name: str) -> Dict:
         """
-        Load Docker configuration from database.
+        Load Docker configuration from database (served by ConfigCache, so
+        repeated calls during one operation do not query again).
 
         Args:
             project_name: 'superleme' or 'sl_phoenix'
@@ -25,23 +27,16 @@ class DockerManager:
         Returns:
             Dictionary with configuration
         """
-        try:
-            config = DockerConfiguration.get(
-                DockerConfiguration.project_name == project_name
-            )
-            return {
-                "use_docker": config.use_docker,
-                "postgres_version": config.postgres_version,
-                "languages": config.languages,
-                "compose_file": config.compose_file,
-            }
-        except:
+        config = ConfigCache.get(project_name)
+        if config is None:
             console.print(
                 f"[warning]Configuração para {project_name} não encontrada no banco de dados[/warning]"
             )
             return {}
+        return config.as_dict()
 
     @staticmethod
+    @traced("docker.generate_superleme_dockerfile", "output_path")
     def generate_superleme_dockerfile(
         output_path: str, project_name: str = "superleme"
     ):
@@ -60,7 +55,7 @@ class DockerManager:
             )
             return
 
-        languages = json.loads(config.get("languages", "{}"))
+        languages = LanguageVersions.parse(config.get("languages"))
         erlang_version = languages.get("erlang", "28")
         postgres_version = config.get("postgres_version", "17-alpine")
 
@@ -82,6 +77,7 @@ class DockerManager:
         )
 
     @staticmethod
+    @traced("docker.generate_phoenix_dockerfile", "output_path")
     def generate_phoenix_dockerfile(output_path: str, project_name: str = "sl_phoenix"):
         """
         Generate Dockerfile for SL Phoenix based on database configuration.
@@ -98,7 +94,7 @@ class DockerManager:
             )
             return
 
-        languages = json.loads(config.get("languages", "{}"))
+        languages = LanguageVersions.parse(config.get("languages"))
         elixir_version = languages.get("elixir", "1.19.4")
         erlang_version = languages.get("erlang", "28")
         node_version = languages.get("node", "25.2.1")
@@ -121,6 +117,7 @@ class DockerManager:
         )
 
     @staticmethod
+    @traced("docker.generate_superleme_phoenix_dockerfile", "output_path")
     def generate_superleme_phoenix_dockerfile(output_path: str):
         """
         Generate combined Dockerfile for Superleme + Phoenix based on database configurations.
@@ -138,8 +135,8 @@ class DockerManager:
             return
 
         # Get versions from both configs
-        superleme_langs = json.loads(superleme_config.get("languages", "{}"))
-        phoenix_langs = json.loads(phoenix_config.get("languages", "{}"))
+        superleme_langs = LanguageVersions.parse(superleme_config.get("languages"))
+        phoenix_langs = LanguageVersions.parse(phoenix_config.get("languages"))
 
         erlang_version = superleme_langs.get("erlang", "28")
         elixir_version = phoenix_langs.get("elixir", "1.19.4")
@@ -163,6 +160,7 @@ class DockerManager:
         )
 
     @staticmethod
+    @traced("docker.generate_docker_compose", "output_path", "stack_type")
     def generate_docker_compose(output_path: str, stack_type: str = "full"):
         """
         Generate docker-compose.yml for different stack configurations.
@@ -199,36 +197,7 @@ class DockerManager:
         )
         console.print(f"Versão PostgreSQL: {postgres_version}")
 
-        env_dir = os.path.dirname(output_path)
-        env_file = os.path.join(env_dir, '.env')
-        env_lines = {}
-        if os.path.exists(env_file):
-            try:
-                with open(env_file, 'r') as f:
-                    for line in f:
-                        if '=' in line:
-                            k, v = line.rstrip('\n').split('=', 1)
-                            env_lines[k] = v
-            except Exception:
-                env_lines = {}
-
-        env_lines['POSTGRES_VERSION'] = postgres_version
-        try:
-            langs = json.loads(superleme_config.get('languages', '{}'))
-            if langs.get('erlang'):
-                env_lines['ERLANG_VERSION'] = langs.get('erlang')
-            if langs.get('elixir'):
-                env_lines['ELIXIR_VERSION'] = langs.get('elixir')
-            if langs.get('node'):
-                env_lines['NODE_VERSION'] = langs.get('node')
-        except Exception:
-            pass
-
-        with open(env_file, 'w') as f:
-            for k, v in env_lines.items():
-                f.write(f"{k}={v}\n")
-
-        console.print(f"[success].env criado em: {env_file}[/success]")
+        ConfigManager.update_docker_versions(os.path.dirname(output_path), superleme_config, postgres_version)
 
     @staticmethod
     def build_image(
@@ -238,11 +207,51 @@ class DockerManager:
         build_context: str,
         build_args: dict | None = None,
     ):
-        """Build Docker image. Delegates to DockerOperations."""
-        DockerOperations.build_image(
+        """Build Docker image. Delegates to DockerOperations. Returns the exit code."""
+        return DockerOperations.build_image(
             dockerfile_path, image_name, image_tag, build_context, build_args
         )
 
+    @staticmethod
+    @traced("docker.build_project_image", "project_name", "image_tag")
+    def build_project_image(project_name: str, project_dir: str, image_tag: str = "latest"):
+        """
+        Build the image of a project with the versions stored in the database,
+        generating its Dockerfile first if needed.
+
+        Args:
+            project_name: 'superleme' (project_dir is the zotonic root) or 'sl_phoenix'
+            project_dir: Build context directory
+            image_tag: Tag for the image
+
+        Returns:
+            Exit code of docker build (None if it could not be started)
+        """
+        config = DockerManager.load_config_from_db(project_name)
+        langs = LanguageVersions.parse(config.get('languages'))
+
+        if project_name == "superleme":
+            dockerfile_path = os.path.join(project_dir, "Dockerfile.superleme")
+            if not os.path.exists(dockerfile_path):
+                console.print("[warning]Dockerfile do Superleme não encontrado. Gerando...[/warning]")
+                DockerManager.generate_superleme_dockerfile(dockerfile_path)
+            build_args = {
+                'POSTGRES_VERSION': config.get('postgres_version'),
+                'ERLANG_VERSION': langs.get('erlang')
+            }
+            return DockerManager.build_image(dockerfile_path, "zotonic", image_tag, project_dir, build_args)
+
+        dockerfile_path = os.path.join(project_dir, "Dockerfile.phoenix")
+        if not os.path.exists(dockerfile_path):
+            console.print("[warning]Dockerfile do Phoenix não encontrado. Gerando...[/warning]")
+            DockerManager.generate_phoenix_dockerfile(dockerfile_path)
+        build_args = {
+            'ELIXIR_VERSION': langs.get('elixir'),
+            'ERLANG_VERSION': langs.get('erlang'),
+            'NODE_VERSION': langs.get('node')
+        }
+        return DockerManager.build_image(dockerfile_path, "sl_phoenix", image_tag, project_dir, build_args)
+
     @staticmethod
     def push_image(image_name: str, image_tag: str, registry: str = None):
         """Push Docker image. Delegates to DockerOperations."""
@@ -262,3 +271,13 @@ class DockerManager:
     def prune_images(all_images: bool = False):
         """Prune unused Docker images. Delegates to DockerOperations."""
         DockerOperations.prune_images(all_images)
+
+    @staticmethod
+    def project_volumes(cwd: str) -> Dict[str, str]:
+        """Volumes of the compose project in `cwd`. Delegates to DockerOperations."""
+        return DockerOperations.project_volumes(cwd)
+
+    @staticmethod
+    def remove_volumes(names: List[str]) -> bool:
+        """Remove Docker volumes. Delegates to DockerOperations."""
+        return DockerOperations.remove_volumes(names)
@@ -3,15 +3,19 @@ Docker operations for building and pushing images.
 """
 
 import os
-from typing import Optional
+import re
+import subprocess
+from typing import Dict, List, Optional
 from .. import console
-from ..executor import Executor
+from executor import Executor
+from ..tracing import traced
 
 
 class DockerOperations:
     """Handles Docker build and push operations."""
 
     @staticmethod
+    @traced("docker.build_image", "image_name", "image_tag", "build_args")
     def build_image(
         dockerfile_path: str,
         image_name: str,
@@ -44,9 +48,11 @@ class DockerOperations:
         command = f"docker build -f {dockerfile_path} -t {image_name}:{image_tag}{arg_flags} {build_context}"
 
         # Use executor to run with real-time output
-        Executor.run_command(command, build_context, background=False, use_docker=False)
+        process = Executor.run_command(command, build_context, background=False, use_docker=False)
+        return process.returncode if process else None
 
     @staticmethod
+    @traced("docker.push_image", "image_name", "image_tag", "registry")
     def push_image(image_name: str, image_tag: str, registry: Optional[str] = None, cwd: Optional[str] = None):
         """
         Push Docker image to registry.
@@ -132,3 +138,51 @@ class DockerOperations:
         command = f"docker image prune {all_flag} -f"
 
         Executor.run_command(command, cwd, background=False, use_docker=False)
+
+    @staticmethod
+    def compose_project(cwd: str) -> str:
+        """Compose project name of `cwd`: COMPOSE_PROJECT_NAME from .env, else the directory name as compose normalizes it."""
+        from config import EnvFile
+        name = EnvFile(os.path.join(cwd, ".env")).get("COMPOSE_PROJECT_NAME")
+        if name:
+            return name.strip().strip('"\'')
+        return re.sub(r"[^a-z0-9_-]", "", os.path.basename(os.path.abspath(cwd)).lower())
+
+    @staticmethod
+    def project_volumes(cwd: str) -> Dict[str, str]:
+        """Existing volumes of the compose project in `cwd`: compose key (zotonic_build) -> Docker name."""
+        project = DockerOperations.compose_project(cwd)
+        try:
+            result = subprocess.run(
+                ["docker", "volume", "ls", "--filter", f"label=com.docker.compose.project={project}",
+                 "--format", '{{.Name}} {{.Label "com.docker.compose.volume"}}'],
+                capture_output=True, text=True, timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return {}
+        volumes = {}
+        for line in result.stdout.splitlines():
+            name, _, key = line.strip().partition(" ")
+            if name:
+                volumes[key or name] = name
+        return volumes
+
+    @staticmethod
+    @traced("docker.remove_volumes", "names")
+    def remove_volumes(names: List[str]) -> bool:
+        """Remove the containers using the volumes (stopped or one-off ones included), then the volumes."""
+        for name in names:
+            containers = subprocess.run(
+                ["docker", "ps", "-aq", "--filter", f"volume={name}"],
+                capture_output=True, text=True
+            ).stdout.split()
+            if containers:
+                console.print(f"[info]Removendo {len(containers)} container(s) que usam {name}...[/info]")
+                subprocess.run(["docker", "rm", "-f"] + containers, capture_output=True)
+
+            result = subprocess.run(["docker", "volume", "rm", name], capture_output=True, text=True)
+            if result.returncode != 0:
+                console.print(f"[error]Falha ao remover volume {name}: {result.stderr.strip()}[/error]")
+                return False
+            console.print(f"[success]Volume removido: {name}[/success]")
+        return True
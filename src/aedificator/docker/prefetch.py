@@ -0,0 +1,198 @@
+"""
+Background pull of the base images the generated Dockerfiles and compose file
+need, so the next rebuild after a version change does not stall on downloads.
+"""
+
+import os
+import re
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional, Set
+from ..memory import LanguageVersions
+from .templates import DockerTemplates
+
+# Pull from this registry (e.g. a local pull-through cache, `localhost:5000`) and tag
+# the result with the canonical name the Dockerfiles use
+REGISTRY_MIRROR = os.environ.get("AEDIFICATOR_REGISTRY_MIRROR", "").rstrip("/")
+
+_ARG = re.compile(r'^\s*ARG\s+([A-Za-z_][A-Za-z0-9_]*)=(\S+)', re.MULTILINE)
+_FROM = re.compile(r'^\s*FROM\s+(?:--platform=\S+\s+)?(\S+)', re.MULTILINE | re.IGNORECASE)
+_VARIABLE = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}|\$([A-Za-z_][A-Za-z0-9_]*)')
+_LAYER = re.compile(r'^([0-9a-f]{12}): (.+)$')
+
+
+def dockerfile_images(content: str) -> List[str]:
+    """Images in the FROM lines of a Dockerfile, with ARG defaults substituted and build stages left out."""
+    args = dict(_ARG.findall(content))
+    stages = {m.lower() for m in re.findall(r'^\s*FROM\s+\S+\s+AS\s+(\S+)', content, re.MULTILINE | re.IGNORECASE)}
+    images = []
+    for reference in _FROM.findall(content):
+        image = _VARIABLE.sub(lambda m: args.get(m.group(1) or m.group(2), ""), reference)
+        if image.lower() not in stages and image != "scratch" and image not in images:
+            images.append(image)
+    return images
+
+
+class ImagePrefetcher:
+    """
+    Pulls a list of images one after the other in a daemon thread; status_line()
+    summarizes the progress for the menus (layers done of the image being pulled).
+    """
+
+    def __init__(self, images: List[str], docker: str = "docker", mirror: str = REGISTRY_MIRROR):
+        self.images = list(images)
+        self.docker = docker
+        self.mirror = mirror
+        # image -> "pendente", "baixando", "ok" or the error message
+        self.state: Dict[str, str] = {image: "pendente" for image in self.images}
+        self.current: Optional[str] = None
+        self.layers: Dict[str, str] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # -- which images -------------------------------------------------------------
+
+    @staticmethod
+    def base_images(docker_configs: Dict[str, Dict]) -> List[str]:
+        """Base images implied by the configs of the projects that use Docker."""
+        images: List[str] = []
+        superleme = docker_configs.get('superleme') or {}
+        phoenix = docker_configs.get('sl_phoenix') or {}
+
+        if superleme.get('use_docker'):
+            langs = LanguageVersions.parse(superleme.get('languages'))
+            postgres_version = superleme.get('postgres_version') or "17-alpine"
+            images += dockerfile_images(DockerTemplates.superleme_dockerfile(langs.get('erlang', '28'), postgres_version))
+            images.append(f"postgres:{postgres_version}")
+        if phoenix.get('use_docker'):
+            langs = LanguageVersions.parse(phoenix.get('languages'))
+            images += dockerfile_images(DockerTemplates.phoenix_dockerfile(
+                langs.get('elixir', '1.19.4'), langs.get('erlang', '28'), langs.get('node', '25.2.1')
+            ))
+
+        unique: List[str] = []
+        for image in images:
+            if image not in unique:
+                unique.append(image)
+        return unique
+
+    @staticmethod
+    def local_images(docker: str = "docker") -> Set[str]:
+        """`repository:tag` of the images already in the local Docker store."""
+        try:
+            result = subprocess.run(
+                [docker, "image", "ls", "--format", "{{.Repository}}:{{.Tag}}"],
+                capture_output=True, text=True, timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return set()
+        if result.returncode != 0:
+            return set()
+        return set(result.stdout.split())
+
+    @staticmethod
+    def stale(previous: List[str], current: List[str]) -> List[str]:
+        """Images the previous configuration referenced and the current one does not."""
+        return [image for image in previous if image not in current]
+
+    # -- pulling ------------------------------------------------------------------
+
+    def _source(self, image: str) -> str:
+        if not self.mirror:
+            return image
+        name = image if "/" in image.split(":")[0] else f"library/{image}"
+        return f"{self.mirror}/{name}"
+
+    def _pull(self, image: str):
+        self.current, self.layers = image, {}
+        self.state[image] = "baixando"
+        source = self._source(image)
+        try:
+            process = subprocess.Popen(
+                [self.docker, "pull", source],
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace"
+            )
+        except OSError as e:
+            self.state[image] = str(e)
+            return
+
+        last = ""
+        for line in process.stdout:
+            line = line.strip()
+            match = _LAYER.match(line)
+            if match:
+                self.layers[match.group(1)] = match.group(2)
+            elif line:
+                last = line
+        if process.wait() != 0:
+            self.state[image] = last or f"docker pull saiu com código {process.returncode}"
+            return
+
+        if source != image:
+            tag = subprocess.run([self.docker, "tag", source, image], capture_output=True, text=True)
+            if tag.returncode != 0:
+                self.state[image] = tag.stderr.strip() or "docker tag falhou"
+                return
+        self.state[image] = "ok"
+
+    def _next(self) -> Optional[str]:
+        with self._lock:
+            pending = [image for image in self.images if self.state[image] == "pendente"]
+            if not pending:
+                self.current = None
+                self.finished_at = time.time()
+                return None
+            return pending[0]
+
+    def _run(self):
+        while True:
+            image = self._next()
+            if image is None:
+                return
+            self._pull(image)
+
+    def add(self, images: List[str]) -> bool:
+        """Queue more images on a running prefetch; False once it has finished (start a new one instead)."""
+        with self._lock:
+            if self.done:
+                return False
+            for image in images:
+                if image not in self.state:
+                    self.images.append(image)
+                    self.state[image] = "pendente"
+            return True
+
+    def start(self):
+        if self._thread is None:
+            self.started_at = time.time()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="image-prefetch")
+            self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.done
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def failed(self) -> Dict[str, str]:
+        return {image: state for image, state in self.state.items() if state not in ("pendente", "baixando", "ok")}
+
+    def status_line(self) -> str:
+        finished = sum(1 for state in self.state.values() if state not in ("pendente", "baixando"))
+        if self.done:
+            elapsed = self.finished_at - self.started_at
+            line = f"Imagens base: {finished - len(self.failed)}/{len(self.images)} baixadas em {elapsed:.0f}s"
+            return line + (f", falhas: {', '.join(self.failed)}" if self.failed else "")
+        line = f"Imagens base: {finished}/{len(self.images)}"
+        if self.current:
+            complete = sum(1 for status in self.layers.values() if status in ("Pull complete", "Already exists"))
+            line += f" | baixando {self.current} ({complete}/{len(self.layers)} camadas)"
+        return line
@@ -4,7 +4,9 @@ The module will render templates found in the `templates/` folder adjacent to th
 """
 
 import os
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from ..tracing import traced
+
+_env = None
 
 
 class DockerTemplates:
@@ -12,33 +14,41 @@ class DockerTemplates:
 
     @staticmethod
     def _load_template(template_name: str) -> str:
-        tmpl_dir = os.path.join(os.path.dirname(__file__), 'templates')
-        env = Environment(
-            loader=FileSystemLoader(tmpl_dir),
-            autoescape=select_autoescape(['j2'])
-        )
-        template = env.get_template(template_name)
+        # jinja2 is only needed when a file is generated, import it on first use
+        global _env
+        if _env is None:
+            from jinja2 import Environment, FileSystemLoader, select_autoescape
+            tmpl_dir = os.path.join(os.path.dirname(__file__), 'templates')
+            _env = Environment(
+                loader=FileSystemLoader(tmpl_dir),
+                autoescape=select_autoescape(['j2'])
+            )
+        template = _env.get_template(template_name)
         return template
 
     @staticmethod
+    @traced("docker.templates.superleme_dockerfile")
     def superleme_dockerfile(erlang_version: str, postgres_version: str) -> str:
         """Render Superleme Dockerfile Jinja2 template."""
         template = DockerTemplates._load_template('superleme.Dockerfile.j2')
         return template.render(erlang_version=erlang_version, postgres_version=postgres_version)
 
     @staticmethod
+    @traced("docker.templates.phoenix_dockerfile")
     def phoenix_dockerfile(elixir_version: str, erlang_version: str, node_version: str) -> str:
         """Render Phoenix Dockerfile Jinja2 template."""
         template = DockerTemplates._load_template('phoenix.Dockerfile.j2')
         return template.render(elixir_version=elixir_version, erlang_version=erlang_version, node_version=node_version)
 
     @staticmethod
+    @traced("docker.templates.superleme_phoenix_dockerfile")
     def superleme_phoenix_dockerfile(erlang_version: str, elixir_version: str, node_version: str) -> str:
         """Render Superleme + Phoenix combined Dockerfile Jinja2 template."""
         template = DockerTemplates._load_template('superleme_phoenix.Dockerfile.j2')
         return template.render(erlang_version=erlang_version, elixir_version=elixir_version, node_version=node_version)
 
     @staticmethod
+    @traced("docker.templates.docker_compose")
     def docker_compose(stack_type: str, postgres_version: str) -> str:
         """Render docker-compose Jinja2 template.
 
@@ -56,6 +66,7 @@ class DockerTemplates:
         return template.render(**context)
 
     @staticmethod
+    @traced("docker.templates.init_postgres_script")
     def init_postgres_script() -> str:
         """Render PostgreSQL initialization script Jinja2 template."""
         template = DockerTemplates._load_template('init-postgres.sh.j2')
@@ -1,32 +1,24 @@
 from pathing.main import Pathing
+from pathing.cache import LocationCache
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt
 import questionary
 import os
-import sys
-import subprocess
-import glob
 from . import console
-from .memory import initialize_database, Paths, DockerConfiguration
+from .memory import initialize_database, ensure_schema, Paths, DockerConfiguration, ConfigCache, MODELS
 from menu import Menu
-from .paths import get_data_dir, get_backup_file
 
 class Main():
     def __init__(self):
         self.console = console
         # Initialize database and create tables
         db = initialize_database()
-        db.create_tables([Paths, DockerConfiguration])
+        ensure_schema(db, MODELS)
 
         selected = Pathing.find_folders()
 
-        has_docker_config = False
-        try:
-            DockerConfiguration.get(DockerConfiguration.project_name == 'superleme')
-            has_docker_config = True
-        except:
-            pass
+        has_docker_config = ConfigCache.get('superleme') is not None
 
         is_first_install = not selected or not has_docker_config
 
@@ -58,7 +50,12 @@ class Main():
             if not need_redetection:
                 self.console.print("[info]Detectando pastas do projeto automaticamente...[/info]")
 
-            auto_detected = Pathing.auto_detect_folders()
+            # Cached candidates and their neighbourhood first, full scan only on a miss
+            missing = [
+                key for key in ("superleme_path", "sl_phoenix_path", "extension_path")
+                if not (selected and getattr(selected, key) and os.path.exists(getattr(selected, key)))
+            ]
+            auto_detected = LocationCache.locate(missing)
             detected_count = sum(1 for v in auto_detected.values() if v)
 
             if detected_count > 0:
@@ -140,24 +137,9 @@ class Main():
                 docker_configs['sl_phoenix'] = {'use_docker': False, 'languages': '{}'}
         else:
             # Load existing Docker configurations
-            try:
-                superleme_config = DockerConfiguration.get(DockerConfiguration.project_name == 'superleme')
-                docker_configs['superleme'] = {
-                    'use_docker': superleme_config.use_docker,
-                    'postgres_version': superleme_config.postgres_version,
-                    'languages': superleme_config.languages
-                }
-            except:
-                docker_configs['superleme'] = {'use_docker': False}
-
-            try:
-                phoenix_config = DockerConfiguration.get(DockerConfiguration.project_name == 'sl_phoenix')
-                docker_configs['sl_phoenix'] = {
-                    'use_docker': phoenix_config.use_docker,
-                    'languages': phoenix_config.languages
-                }
-            except:
-                docker_configs['sl_phoenix'] = {'use_docker': False}
+            for project_name in ('superleme', 'sl_phoenix'):
+                config = ConfigCache.get(project_name)
+                docker_configs[project_name] = config.as_dict() if config else {'use_docker': False}
 
         # Use database (if valid) > auto-detection > user selection (in that priority order)
         # Helper to get valid path from database or None
@@ -194,6 +176,14 @@ class Main():
                 extension_path=self.extension_folder
             )
 
+        current_paths = {
+            "superleme_path": self.superleme_folder,
+            "sl_phoenix_path": self.sl_phoenix_folder,
+            "extension_path": self.extension_folder,
+        }
+        LocationCache.remember(current_paths)
+        LocationCache.watch(current_paths)
+
         # Save Docker configurations
         if is_first_install:
             zotonic_root = os.path.dirname(os.path.dirname(self.superleme_folder))
@@ -215,6 +205,11 @@ class Main():
                 languages=docker_configs['sl_phoenix'].get('languages')
             )
 
+        # Optional background download of the newest backup (AEDIFICATOR_PREFETCH_BACKUP=1)
+        if os.environ.get("AEDIFICATOR_PREFETCH_BACKUP") == "1":
+            from backup import BackupManager
+            BackupManager.prefetch_latest_in_background()
+
         # Initialize and show menu
         menu = Menu(
             superleme_path=self.superleme_folder,
@@ -236,101 +231,6 @@ class Main():
         if not download_backup:
             self.console.print("[info]Backup não será baixado[/info]")
             return
-        
-        # Find .pem file in ~/.ssh
-        ssh_dir = os.path.expanduser("~/.ssh")
-        pem_files = glob.glob(os.path.join(ssh_dir, "*.pem"))
-        
-        if not pem_files:
-            self.console.print("[warning]Nenhum arquivo .pem encontrado em ~/.ssh[/warning]")
-            self.console.print("[info]Selecione o arquivo .pem usando o navegador de arquivos[/info]")
-            pem_file = Pathing.select_file(ssh_dir)
-            
-            if not pem_file or not os.path.exists(pem_file):
-                self.console.print("[error]Arquivo .pem não encontrado. Backup não será baixado.[/error]")
-                return
-        elif len(pem_files) == 1:
-            pem_file = pem_files[0]
-            self.console.print(f"[success]Arquivo .pem encontrado: {pem_file}[/success]")
-        else:
-            # Multiple .pem files found, let user choose with file browser
-            self.console.print(f"[info]Encontrados {len(pem_files)} arquivos .pem em ~/.ssh[/info]")
-            self.console.print("[info]Selecione o arquivo .pem desejado usando o navegador de arquivos[/info]")
-            pem_file = Pathing.select_file(ssh_dir)
-            
-            if not pem_file or not os.path.exists(pem_file):
-                self.console.print("[error]Arquivo .pem não selecionado. Backup não será baixado.[/error]")
-                return
-        
-        # List files in remote directory
-        remote_host = "ubuntu@teste1x.superleme.com.br"
-        remote_dir = "/home/ubuntu/bkps"
-        
-        self.console.print(f"\n[info]Listando arquivos em {remote_host}:{remote_dir}[/info]")
-        
-        try:
-            ssh_command = f'ssh -i "{pem_file}" {remote_host} "ls -1 {remote_dir}/*.backup"'
-            result = subprocess.run(
-                ssh_command,
-                shell=True,
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            
-            # Parse filenames from output
-            files = [os.path.basename(f.strip()) for f in result.stdout.strip().split('\n') if f.strip()]
-            
-            if not files:
-                self.console.print("[error]Nenhum arquivo .backup encontrado no servidor[/error]")
-                return
-            
-            # Let user select file
-            selected_file = questionary.select(
-                "Selecione o arquivo de backup para baixar:",
-                choices=files
-            ).ask()
-            
-            if not selected_file:
-                self.console.print("[info]Nenhum arquivo selecionado. Backup não será baixado.[/info]")
-                return
-            
-        except subprocess.CalledProcessError as e:
-            self.console.print(f"[error]Erro ao listar arquivos no servidor:[/error]")
-            self.console.print(f"[error]{e.stderr}[/error]")
-            return
-        except Exception as e:
-            self.console.print(f"[error]Erro ao conectar ao servidor: {str(e)}[/error]")
-            return
-        
-        backup_file = get_backup_file()
-        
-        remote_file = f"{remote_dir}/{selected_file}"
-        scp_command = f'scp -v -i "{pem_file}" {remote_host}:{remote_file} "{backup_file}"'
-        
-        self.console.print(f"\n[info]Executando: {scp_command}[/info]\n")
-        sys.stdout.flush()
-        sys.stderr.flush()
-        
-        try:
-            result = subprocess.run(
-                scp_command,
-                shell=True,
-                check=True
-            )
-            
-            sys.stdout.flush()
-            sys.stderr.flush()
-            
-            if os.path.exists(backup_file):
-                self.console.print(f"[success]Backup baixado com sucesso: {backup_file}[/success]")
-            else:
-                self.console.print("[warning]Comando executado, mas arquivo não encontrado no destino[/warning]")
-                
-        except subprocess.CalledProcessError as e:
-            self.console.print(f"[error]Erro ao baixar backup:[/error]")
-            self.console.print(f"[error]{e.stderr}[/error]")
-        except Exception as e:
-            self.console.print(f"[error]Erro ao executar comando SCP: {str(e)}[/error]")
 
-    
\ No newline at end of file
+        from backup import BackupManager
+        BackupManager.download_backup()
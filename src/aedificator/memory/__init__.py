@@ -1,4 +1,5 @@
-from .db import database, initialize_database
-from .models import Paths, DockerConfiguration
+from .db import database, initialize_database, ensure_schema
+from .models import Paths, DockerConfiguration, BackupSnapshot, RestoreRun, RestoreProfile, ProjectLocation, CommandRun, BeamSample, Job, MODELS
+from .config import ConfigCache, ProjectConfig, LanguageVersions
 
-__all__ = ["database", "initialize_database", "Paths", "DockerConfiguration"]
+__all__ = ["database", "initialize_database", "ensure_schema", "Paths", "DockerConfiguration", "BackupSnapshot", "RestoreRun", "RestoreProfile", "ProjectLocation", "CommandRun", "BeamSample", "Job", "MODELS", "ConfigCache", "ProjectConfig", "LanguageVersions"]
@@ -0,0 +1,102 @@
+import json
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Dict, Optional
+from .db import database
+from .models import DockerConfiguration
+
+
+@dataclass(frozen=True)
+class LanguageVersions:
+    """Parsed form of DockerConfiguration.languages ({"erlang": "28", "node": "25.2.1", ...})."""
+    erlang: Optional[str] = None
+    elixir: Optional[str] = None
+    node: Optional[str] = None
+    postgresql: Optional[str] = None
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def parse(text: Optional[str]) -> "LanguageVersions":
+        """Parse the stored JSON text; the same text is only decoded once per process."""
+        try:
+            data = json.loads(text) if text else {}
+        except ValueError:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        return LanguageVersions(**{f.name: str(data[f.name]) for f in fields(LanguageVersions) if data.get(f.name)})
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return getattr(self, name, None) or default
+
+    def as_dict(self) -> Dict[str, str]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if getattr(self, f.name)}
+
+    def to_json(self) -> str:
+        return json.dumps(self.as_dict())
+
+
+@dataclass(frozen=True)
+class ProjectConfig:
+    """One DockerConfiguration row with `languages` already parsed."""
+    project_name: str
+    use_docker: bool = False
+    postgres_version: Optional[str] = None
+    compose_file: Optional[str] = None
+    languages: LanguageVersions = field(default_factory=LanguageVersions)
+    languages_text: Optional[str] = None
+
+    @staticmethod
+    def from_row(row: DockerConfiguration) -> "ProjectConfig":
+        return ProjectConfig(
+            project_name=row.project_name,
+            use_docker=bool(row.use_docker),
+            postgres_version=row.postgres_version,
+            compose_file=row.compose_file,
+            languages=LanguageVersions.parse(row.languages),
+            languages_text=row.languages,
+        )
+
+    def as_dict(self) -> Dict:
+        """The docker_config dict passed around by Menu/Executor/ConfigManager."""
+        return {
+            'use_docker': self.use_docker,
+            'postgres_version': self.postgres_version,
+            'languages': self.languages_text,
+            'compose_file': self.compose_file,
+        }
+
+
+class ConfigCache:
+    """
+    Every DockerConfiguration row, loaded in one query and kept in memory.
+
+    Writes through the model (save/delete_instance) invalidate the cache; writes
+    committed by another process are noticed through SQLite's `data_version`,
+    which changes whenever another connection commits to the database file.
+    """
+
+    _configs: Optional[Dict[str, ProjectConfig]] = None
+    _version = None
+
+    @staticmethod
+    def _data_version():
+        db = database()
+        # data_version is per connection, and peewee opens one per thread
+        return id(db.connection()), db.execute_sql("PRAGMA data_version").fetchone()[0]
+
+    @staticmethod
+    def all() -> Dict[str, ProjectConfig]:
+        version = ConfigCache._data_version()
+        if ConfigCache._configs is None or version != ConfigCache._version:
+            ConfigCache._configs = {row.project_name: ProjectConfig.from_row(row) for row in DockerConfiguration.select()}
+            ConfigCache._version = version
+        return ConfigCache._configs
+
+    @staticmethod
+    def get(project_name: str) -> Optional[ProjectConfig]:
+        return ConfigCache.all().get(project_name)
+
+    @staticmethod
+    def invalidate():
+        ConfigCache._configs = None
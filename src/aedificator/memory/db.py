@@ -1,20 +1,46 @@
-import os
 from peewee import SqliteDatabase
-from aedificator.paths import get_data_dir, get_db_path
+from aedificator.paths import get_db_path
 
 
-DB_DIR = get_data_dir()
-DB_FILE = get_db_path()
+# Deferred until initialize_database(), so importing the models does not touch the disk
+_db = SqliteDatabase(None)
+
+# Applied to every connection. WAL lets readers run while another aedificator
+# process (menu, CLI, daemon) writes; busy_timeout makes a writer wait for the
+# lock instead of failing with "database is locked".
+PRAGMAS = {
+    'journal_mode': 'wal',
+    'busy_timeout': 5000,
+    'synchronous': 'normal',
+}
 
 
 def database():
-    """Return a peewee SqliteDatabase instance pointing at DB_FILE."""
-    os.makedirs(DB_DIR, exist_ok=True)
-    return SqliteDatabase(DB_FILE)
+    """Return the shared peewee SqliteDatabase used by the models."""
+    return _db
 
 
 def initialize_database(db=None):
-    """Initialize database connection and create tables if they do not exist."""
+    """Point the database at the data directory and open the connection."""
     db = db or database()
+    if db.deferred:
+        db.init(get_db_path(), pragmas=PRAGMAS)
     db.connect(reuse_if_open=True)
     return db
+
+
+def ensure_schema(db, models):
+    """Create missing tables and add columns introduced after a table was first created."""
+    db.create_tables(models)
+    migrator = None
+    for model in models:
+        table = model._meta.table_name
+        existing = {column.name for column in db.get_columns(table)}
+        missing = [
+            field for field in model._meta.sorted_fields
+            if field.column_name not in existing
+        ]
+        if missing:
+            from playhouse.migrate import SqliteMigrator, migrate
+            migrator = migrator or SqliteMigrator(db)
+            migrate(*[migrator.add_column(table, field.column_name, field) for field in missing])
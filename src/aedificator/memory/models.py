@@ -1,4 +1,4 @@
-from peewee import Model, TextField, BooleanField
+from peewee import Model, TextField, BooleanField, IntegerField, FloatField, DateTimeField
 from .db import database
 
 _db = database()
@@ -24,3 +24,131 @@ class DockerConfiguration(BaseModel):
 
     class Meta:
         table_name = "docker_configurations"
+
+    # Keep ConfigCache in step with writes made by this process
+    def save(self, *args, **kwargs):
+        from .config import ConfigCache
+        try:
+            return super().save(*args, **kwargs)
+        finally:
+            ConfigCache.invalidate()
+
+    def delete_instance(self, *args, **kwargs):
+        from .config import ConfigCache
+        try:
+            return super().delete_instance(*args, **kwargs)
+        finally:
+            ConfigCache.invalidate()
+
+class BackupSnapshot(BaseModel):
+    sha256 = TextField(unique=True)  # Content hash, also the file name inside the store
+    remote_name = TextField(null=True)  # e.g. superleme_20251021.backup
+    remote_date = TextField(null=True)  # YYYY-MM-DD parsed from the remote file name
+    size = IntegerField(default=0)
+    path = TextField()
+    downloaded_at = DateTimeField()
+    last_used_at = DateTimeField(null=True)
+
+    class Meta:
+        table_name = "backup_snapshots"
+
+class RestoreRun(BaseModel):
+    backup_sha256 = TextField(null=True)
+    started_at = DateTimeField()
+    finished_at = DateTimeField(null=True)
+    exit_code = IntegerField(null=True)
+    bytes_total = IntegerField(default=0)
+    tables = IntegerField(default=0)
+    phases = TextField(null=True)  # JSON: {"schema": 1.2, "data": 830.5, "indexes": 210.0, ...}
+    largest_tables = TextField(null=True)  # JSON list of {"name", "bytes", "seconds"}
+    profile = TextField(null=True)  # Restore profile name, None for a full restore
+
+    class Meta:
+        table_name = "restore_runs"
+
+class RestoreProfile(BaseModel):
+    name = TextField(unique=True)
+    description = TextField(null=True)
+    exclude_schemas = TextField(null=True)  # JSON list: ["audit"]
+    exclude_tables = TextField(null=True)  # JSON list of fnmatch patterns: ["*_log", "schema_superleme.historico_*"]
+
+    class Meta:
+        table_name = "restore_profiles"
+
+class ProjectLocation(BaseModel):
+    key = TextField()  # superleme_path, sl_phoenix_path, extension_path
+    path = TextField()
+    device = IntegerField(null=True)
+    inode = IntegerField(null=True)
+    mtime = IntegerField(null=True)  # st_mtime_ns of the directory when last seen
+    last_seen = DateTimeField()
+
+    class Meta:
+        table_name = "project_locations"
+        indexes = ((("key", "path"), True),)
+
+class CommandRun(BaseModel):
+    project = TextField()  # superleme, sl_phoenix, extension, or the working directory name
+    command = TextField()  # As typed, before the docker compose wrapping
+    use_docker = BooleanField(default=False)
+    background = BooleanField(default=False)
+    started_at = DateTimeField()
+    finished_at = DateTimeField(null=True)
+    duration = FloatField(null=True)  # Seconds
+    first_output = FloatField(null=True)  # Seconds until the first line of output
+    exit_code = IntegerField(null=True)
+    output_bytes = IntegerField(default=0)
+    output_lines = IntegerField(default=0)
+    log_path = TextField(null=True)
+    peak_cpu = FloatField(null=True)  # Percent of one core, whole process tree
+    peak_rss = IntegerField(null=True)  # Bytes, whole process tree
+    io_read_bytes = IntegerField(null=True)
+    io_write_bytes = IntegerField(null=True)
+    container_peak_cpu = FloatField(null=True)  # From docker stats, for docker compose runs
+    container_peak_mem = IntegerField(null=True)
+
+    class Meta:
+        table_name = "command_runs"
+        indexes = ((("project", "command", "started_at"), False),)
+
+class BeamSample(BaseModel):
+    run_id = IntegerField(null=True, index=True)  # CommandRun.id of the run the node was started by
+    taken_at = DateTimeField()
+    memory_total = IntegerField(null=True)  # Bytes, from erlang:memory/0
+    memory_processes = IntegerField(null=True)
+    memory_binary = IntegerField(null=True)
+    memory_ets = IntegerField(null=True)
+    memory_atom = IntegerField(null=True)
+    memory_code = IntegerField(null=True)
+    process_count = IntegerField(null=True)
+    port_count = IntegerField(null=True)
+    run_queue = IntegerField(null=True)  # Sum over the schedulers
+    scheduler_utilization = FloatField(null=True)  # Percent, all schedulers
+    top_reductions = TextField(null=True)  # JSON list of {"pid", "name", "value"} (needs recon in the node)
+    top_memory = TextField(null=True)
+
+    class Meta:
+        table_name = "beam_samples"
+
+class Job(BaseModel):
+    project = TextField()  # superleme, sl_phoenix, extension, or the working directory name
+    command = TextField()  # As typed, before the docker compose wrapping
+    cwd = TextField()
+    state = TextField(default="running")  # running, exited, failed, stopped, lost
+    pid = IntegerField(null=True)  # Leader of the job's process group
+    pid_start = IntegerField(null=True)  # Its start time (clock ticks after boot), tells a reused pid apart
+    log_path = TextField(null=True)
+    owner = TextField(default="menu")  # menu (this session's process) or daemon
+    daemon_job = IntegerField(null=True)  # Job id in the daemon's table, for owner == daemon
+    run_id = IntegerField(null=True)  # CommandRun.id
+    started_at = DateTimeField()
+    finished_at = DateTimeField(null=True)
+    exit_code = IntegerField(null=True)
+
+    class Meta:
+        table_name = "jobs"
+        indexes = ((("state", "started_at"), False),)
+
+
+# Every model, in creation order; used to create/migrate the schema at start-up
+MODELS = [Paths, DockerConfiguration, BackupSnapshot, RestoreRun, RestoreProfile, ProjectLocation, CommandRun, BeamSample, Job]
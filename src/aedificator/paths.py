@@ -10,8 +10,8 @@ def get_src_dir() -> str:
 
 
 def get_data_dir() -> str:
-    """Return the `src/data` directory, creating it if necessary."""
-    p = os.path.join(get_src_dir(), "data")
+    """Return the `src/data` directory (or $AEDIFICATOR_DATA_DIR), creating it if necessary."""
+    p = os.environ.get("AEDIFICATOR_DATA_DIR") or os.path.join(get_src_dir(), "data")
     os.makedirs(p, exist_ok=True)
     return p
 
@@ -23,6 +23,20 @@ def get_logs_dir() -> str:
     return p
 
 
+def get_profiles_dir() -> str:
+    """Return the `src/data/logs/profiles` directory (`--profile` output), creating it if necessary."""
+    p = os.path.join(get_logs_dir(), "profiles")
+    os.makedirs(p, exist_ok=True)
+    return p
+
+
+def get_traces_dir() -> str:
+    """Return the `src/data/traces` directory (Chrome trace JSON files), creating it if necessary."""
+    p = os.path.join(get_data_dir(), "traces")
+    os.makedirs(p, exist_ok=True)
+    return p
+
+
 def get_db_path() -> str:
     """Return the full path to the Aedificator sqlite DB file."""
     return os.path.join(get_data_dir(), "aedificator.db")
@@ -31,3 +45,15 @@ def get_db_path() -> str:
 def get_backup_file() -> str:
     """Return the full path to the default backup file in `src/data`."""
     return os.path.join(get_data_dir(), "backup.backup")
+
+
+def get_backups_dir() -> str:
+    """Return the `src/data/backups` directory (content-addressed backup store)."""
+    p = os.path.join(get_data_dir(), "backups")
+    os.makedirs(p, exist_ok=True)
+    return p
+
+
+def get_daemon_socket() -> str:
+    """Return the unix socket path of the resident daemon (`src/data/aedificator.sock`)."""
+    return os.path.join(get_data_dir(), "aedificator.sock")
@@ -0,0 +1,270 @@
+"""
+Profiler for Aedificator's own Python code (`cli.py --profile` or AEDIFICATOR_PROFILE).
+
+    with profiled("live_output"):
+        ...
+
+AEDIFICATOR_PROFILE=1 (or `--profile`) uses a stack sampler: one thread reads
+the stacks of every thread every few milliseconds and weights each sample by
+the CPU time that thread used since the previous sample, so threads blocked on
+a pipe, a sleep or a prompt cost nothing. Regions may nest; each one writes its
+own files to data/logs/profiles:
+
+    <name>_<timestamp>.txt      top functions by self CPU time, CPU per thread
+    <name>_<timestamp>.folded   collapsed stacks (speedscope.app, flamegraph.pl)
+
+AEDIFICATOR_PROFILE=cprofile uses cProfile instead: exact call counts, but only
+for the thread that opened the region and only for the outermost region. It
+writes <name>_<timestamp>.prof (pstats) and the .txt summary.
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from . import console
+from .paths import get_profiles_dir, get_src_dir
+
+# Seconds between samples
+SAMPLE_INTERVAL = float(os.environ.get("AEDIFICATOR_PROFILE_INTERVAL", "0.01"))
+# Functions listed in the .txt summary
+TOP_FUNCTIONS = 40
+# Profiles kept in data/logs/profiles (each one is two files)
+MAX_PROFILES = 50
+
+
+def mode() -> Optional[str]:
+    """'sample', 'cprofile' or None (profiling off)."""
+    value = os.environ.get("AEDIFICATOR_PROFILE", "").strip().lower()
+    if value in ("", "0", "off", "false"):
+        return None
+    return "cprofile" if value == "cprofile" else "sample"
+
+
+def _thread_cpu(native_id: int) -> Optional[float]:
+    """CPU seconds used by one thread of this process (Linux schedstat, ns resolution)."""
+    try:
+        with open(f"/proc/self/task/{native_id}/schedstat", "rb") as f:
+            return int(f.read().split()[0]) / 1e9
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+_SRC_DIR = get_src_dir() + os.sep
+_labels: Dict[object, str] = {}
+
+
+def _filename(code) -> str:
+    filename = code.co_filename
+    if filename.startswith(_SRC_DIR):
+        return filename[len(_SRC_DIR):]
+    if "site-packages" + os.sep in filename:
+        return filename.split("site-packages" + os.sep, 1)[1]
+    return os.path.basename(filename)
+
+
+def _label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        label = f"{code.co_name} ({_filename(code)}:{code.co_firstlineno})"
+        _labels[code] = label
+    return label
+
+
+def _output_base(name: str) -> str:
+    slug = re.sub(r"\W+", "_", name.lower()).strip("_") or "profile"
+    base = os.path.join(get_profiles_dir(), f"{slug}_{time.strftime('%Y%m%d_%H%M%S')}")
+    candidate, counter = base, 2
+    while os.path.exists(candidate + ".txt"):
+        candidate = f"{base}_{counter}"
+        counter += 1
+    return candidate
+
+
+def _prune():
+    summaries = sorted(
+        (entry for entry in os.scandir(get_profiles_dir()) if entry.name.endswith(".txt")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True
+    )
+    for old in summaries[MAX_PROFILES:]:
+        stem = old.path[:-len(".txt")]
+        for suffix in (".txt", ".folded", ".prof"):
+            try:
+                os.unlink(stem + suffix)
+            except OSError:
+                pass
+
+
+class _Region:
+    """Samples collected while one profiled() block is open."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.samples = 0
+        self.self_cpu: Counter = Counter()
+        self.line_cpu: Counter = Counter()
+        self.total_cpu: Counter = Counter()
+        self.thread_cpu: Counter = Counter()
+        self.stacks: Counter = Counter()
+
+    def add(self, thread_name: str, labels: List[str], line: str, weight: float):
+        self.samples += 1
+        if weight <= 0:
+            return
+        self.self_cpu[labels[-1]] += weight
+        self.line_cpu[line] += weight
+        for label in set(labels):
+            self.total_cpu[label] += weight
+        self.thread_cpu[thread_name] += weight
+        self.stacks[";".join([thread_name] + labels)] += weight
+
+    def write(self, overhead: float) -> str:
+        base = _output_base(self.name)
+        elapsed = time.perf_counter() - self.started
+        total = sum(self.thread_cpu.values()) or 1e-9
+
+        with open(base + ".folded", "w") as f:
+            for stack, seconds in self.stacks.most_common():
+                f.write(f"{stack} {max(int(seconds * 1e6), 1)}\n")
+
+        with open(base + ".txt", "w") as f:
+            f.write(f"Perfil: {self.name}\n")
+            f.write(f"Duração: {elapsed:.2f}s, {self.samples} amostras a cada {SAMPLE_INTERVAL * 1000:.0f} ms\n")
+            f.write(f"CPU: {sum(self.thread_cpu.values()):.3f}s (amostrador: {overhead:.3f}s)\n\n")
+            f.write(f"{'self CPU':>10} {'%':>6} {'total CPU':>10} {'%':>6}  função\n")
+            for label, seconds in self.self_cpu.most_common(TOP_FUNCTIONS):
+                cumulative = self.total_cpu[label]
+                f.write(f"{seconds:>9.3f}s {seconds / total * 100:>5.1f}% {cumulative:>9.3f}s {cumulative / total * 100:>5.1f}%  {label}\n")
+            # C calls (readline, write, str.decode) have no frame of their own: their
+            # time shows up on the Python line that called them
+            f.write(f"\n{'self CPU':>10} {'%':>6}  linha\n")
+            for line, seconds in self.line_cpu.most_common(TOP_FUNCTIONS):
+                f.write(f"{seconds:>9.3f}s {seconds / total * 100:>5.1f}%  {line}\n")
+            f.write("\nCPU por thread:\n")
+            for thread_name, seconds in self.thread_cpu.most_common():
+                f.write(f"{seconds:>9.3f}s {seconds / total * 100:>5.1f}%  {thread_name}\n")
+        return base + ".txt"
+
+
+class _StackSampler:
+    """One sampling thread shared by all open regions."""
+
+    def __init__(self):
+        self._regions: List[_Region] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._cpu: Dict[int, float] = {}
+
+    def add(self, region: _Region):
+        with self._lock:
+            self._regions.append(region)
+            if self._thread is None:
+                # A sampler that is still shutting down keeps its own event
+                self._stop = threading.Event()
+                self._cpu = {}
+                self._thread = threading.Thread(target=self._run, args=(self._stop,), daemon=True, name="profiler")
+                self._thread.start()
+
+    def remove(self, region: _Region) -> float:
+        """Close a region; returns the CPU used by the sampler thread so far."""
+        with self._lock:
+            self._regions.remove(region)
+            thread = self._thread
+            last = not self._regions
+            if last:
+                self._thread = None
+                self._stop.set()
+        overhead = _thread_cpu(thread.native_id) or 0.0
+        if last:
+            thread.join()
+        return overhead
+
+    def _run(self, stop: threading.Event):
+        own = threading.get_ident()
+        last = time.perf_counter()
+        while not stop.wait(SAMPLE_INTERVAL):
+            now = time.perf_counter()
+            wall, last = now - last, now
+            threads = {thread.ident: thread for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                thread = threads.get(ident)
+                if thread is None:
+                    continue
+                cpu = _thread_cpu(thread.native_id)
+                if cpu is None:
+                    weight = wall  # no per-thread clock: wall-clock samples
+                else:
+                    previous = self._cpu.get(ident)
+                    self._cpu[ident] = cpu
+                    if previous is None:
+                        continue
+                    weight = cpu - previous
+
+                code = frame.f_code
+                line = f"{code.co_name} ({_filename(code)}:{frame.f_lineno})"
+                labels = []
+                while frame is not None:
+                    labels.append(_label(frame.f_code))
+                    frame = frame.f_back
+                labels.reverse()
+                with self._lock:
+                    for region in self._regions:
+                        region.add(thread.name, labels, line, weight)
+
+
+_sampler = _StackSampler()
+_cprofile_active = False
+
+
+@contextmanager
+def profiled(name: str):
+    """Profile a block when profiling is on (see the module docstring); otherwise a no-op."""
+    global _cprofile_active
+    kind = mode()
+    if kind is None:
+        yield
+        return
+
+    if kind == "cprofile":
+        if _cprofile_active:
+            yield
+            return
+        _cprofile_active = True
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            _cprofile_active = False
+            base = _output_base(name)
+            profile.dump_stats(base + ".prof")
+            with open(base + ".txt", "w") as f:
+                f.write(f"Perfil: {name} (cProfile, thread {threading.current_thread().name})\n\n")
+                pstats.Stats(profile, stream=f).sort_stats("tottime").print_stats(TOP_FUNCTIONS)
+            _prune()
+            console.print(f"[info]Perfil salvo em {base}.txt[/info]")
+        return
+
+    region = _Region(name)
+    _sampler.add(region)
+    try:
+        yield
+    finally:
+        overhead = _sampler.remove(region)
+        if region.samples:
+            path = region.write(overhead)
+            _prune()
+            console.print(f"[info]Perfil salvo em {path}[/info]")
@@ -0,0 +1,201 @@
+"""
+Nested timing spans exported as Chrome trace JSON (chrome://tracing, ui.perfetto.dev).
+
+    @traced("docker.build_image", "image_name", "image_tag")
+    def build_image(...): ...
+
+    with span("backup.pg_restore", profile=name) as s:
+        ...
+        s.set(exit_code=code)      # or annotate(exit_code=code) from a callee
+
+The outermost span opened on a thread starts a trace; spans nested on the same
+thread join it until that span closes, and the trace is then written to
+data/traces/<name>_<timestamp>.json. Short traces are not written. Other threads
+start traces of their own; a worker that is part of an operation joins it
+explicitly:
+
+    parent = current()
+    def work():
+        with joined(parent):
+            ...
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from .paths import get_traces_dir
+
+# Traces shorter than this are discarded (a `docker images` is not worth a file)
+MIN_TRACE_SECONDS = float(os.environ.get("AEDIFICATOR_TRACE_MIN_SECONDS", "1.0"))
+# Trace files kept in data/traces
+MAX_TRACES = 50
+
+# Chrome trace timestamps are microseconds; perf_counter is anchored to wall time once
+_EPOCH = time.time() - time.perf_counter()
+
+
+def _now_us() -> float:
+    return (_EPOCH + time.perf_counter()) * 1e6
+
+
+class Span:
+    def __init__(self, name: str, attrs: Dict):
+        self.name = name
+        self.attrs = attrs
+        self.start = _now_us()
+        self.tid = threading.get_ident()
+
+    def set(self, **attrs):
+        """Add attributes (shown in the trace viewer's details pane)."""
+        self.attrs.update(attrs)
+
+
+class _Trace:
+    def __init__(self, root: Span):
+        self.root = root
+        self.events: List[Dict] = []
+        self.threads: Dict[int, str] = {}
+        self.lock = threading.Lock()
+
+    def add(self, name: str, start: float, duration: float, tid: int, attrs: Dict):
+        event = {
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": round(start, 1),
+            "dur": round(duration, 1),
+            "pid": os.getpid(),
+            "tid": tid,
+            "args": {key: value if isinstance(value, (int, float, bool, type(None))) else str(value) for key, value in attrs.items()},
+        }
+        with self.lock:
+            self.events.append(event)
+            self.threads.setdefault(tid, threading.current_thread().name)
+
+    def export(self) -> str:
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+            for tid, name in self.threads.items()
+        ]
+        filename = f"{self.root.name}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        path = os.path.join(get_traces_dir(), filename)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}, f)
+
+        traces = sorted(
+            (entry for entry in os.scandir(get_traces_dir()) if entry.name.endswith(".json")),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True
+        )
+        for old in traces[MAX_TRACES:]:
+            try:
+                os.unlink(old.path)
+            except OSError:
+                pass
+        return path
+
+
+# Per thread: `trace` it records into and `stack` of its open spans
+_local = threading.local()
+
+
+def enabled() -> bool:
+    return os.environ.get("AEDIFICATOR_TRACE", "1") != "0"
+
+
+def current() -> Optional[_Trace]:
+    """The trace this thread records into, to hand to a worker thread's joined()."""
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def joined(trace: Optional[_Trace]):
+    """Record this thread's spans into `trace` (from current() on the parent thread) instead of a trace of its own."""
+    previous = current()
+    _local.trace = trace if trace is not None else previous
+    try:
+        yield
+    finally:
+        _local.trace = previous
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time a block; nested blocks on this thread (or a joined() worker) become child spans."""
+    if not enabled():
+        yield Span(name, attrs)
+        return
+
+    current_span = Span(name, attrs)
+    trace = current()
+    root = trace is None
+    if root:
+        trace = _local.trace = _Trace(current_span)
+    stack = _local.__dict__.setdefault("stack", [])
+    stack.append(current_span)
+    try:
+        yield current_span
+    except BaseException as e:
+        current_span.set(error=type(e).__name__)
+        raise
+    finally:
+        stack.pop()
+        duration = _now_us() - current_span.start
+        trace.add(name, current_span.start, duration, current_span.tid, current_span.attrs)
+        if root:
+            _local.trace = None
+            if duration >= MIN_TRACE_SECONDS * 1e6:
+                try:
+                    trace.export()
+                except OSError:
+                    pass
+
+
+def annotate(**attrs):
+    """Add attributes to the innermost open span of this thread (no-op outside a span)."""
+    stack = getattr(_local, "stack", None)
+    if stack:
+        stack[-1].set(**attrs)
+
+
+def record(name: str, start: float, duration: float, **attrs):
+    """
+    Add an already finished interval to this thread's trace (no-op without one).
+
+    `start` and `duration` are seconds; `start` is a time.perf_counter() value.
+    Used for timings reported by external tools (psql \\timing, pg_restore phases).
+    """
+    trace = current()
+    if trace is not None:
+        trace.add(name, (_EPOCH + start) * 1e6, duration * 1e6, threading.get_ident(), attrs)
+
+
+def traced(name: Optional[str] = None, *arg_names: str):
+    """
+    Decorator form of span(); `arg_names` are parameters recorded as attributes.
+
+        @traced("executor.run_command", "command", "cwd", "use_docker")
+    """
+    def decorator(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+        signature = inspect.signature(func) if arg_names else None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            attrs = {}
+            if signature is not None:
+                try:
+                    bound = signature.bind_partial(*args, **kwargs)
+                    attrs = {arg: bound.arguments[arg] for arg in arg_names if arg in bound.arguments}
+                except TypeError:
+                    pass
+            with span(span_name, **attrs):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
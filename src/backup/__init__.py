@@ -1,5 +1,7 @@
 """Database backup operations."""
 
 from .manager import BackupManager
+from .store import BackupStore
+from .profiles import RestoreProfiles
 
-__all__ = ['BackupManager']
+__all__ = ['BackupManager', 'BackupStore', 'RestoreProfiles']
@@ -2,71 +2,149 @@ import subprocess
 import os
 import sys
 import glob
+import json
 import time
+import tempfile
+import threading
 import questionary
+from datetime import datetime
+from typing import List, Optional
+from rich.live import Live
+from rich.table import Table
 from aedificator import console
+from aedificator.memory import BackupSnapshot, RestoreRun, RestoreProfile
 from executor import Executor
-from aedificator.paths import get_backup_file, get_data_dir
+from aedificator.paths import get_backups_dir, get_logs_dir
 from pathing.main import Pathing
+from .store import BackupStore
+from .validation import BackupValidator
+from .progress import RestoreProgress, PHASE_LABELS
+from .profiles import RestoreProfiles
+from .sql import SqlScriptRunner
+from aedificator.tracing import traced, annotate, span
+
+
+REMOTE_HOST = "ubuntu@teste1x.superleme.com.br"
+REMOTE_DIR = "/home/ubuntu/bkps"
 
 
 class BackupManager:
     """Manages database backup operations."""
 
     @staticmethod
-    def download_backup():
-        """Download backup file from remote server."""
-        console.print("\n[info]Download de Novo Backup[/info]")
+    def _find_pem_file(interactive: bool = True) -> Optional[str]:
+        """Locate the .pem key in ~/.ssh, asking the user when it is ambiguous."""
+        env_pem = os.environ.get("AEDIFICATOR_PEM_FILE")
+        if env_pem and os.path.exists(env_pem):
+            return env_pem
 
-        # Find .pem file
         ssh_dir = os.path.expanduser("~/.ssh")
         pem_files = glob.glob(os.path.join(ssh_dir, "*.pem"))
 
+        if len(pem_files) == 1:
+            if interactive:
+                console.print(f"[success]Arquivo .pem encontrado: {pem_files[0]}[/success]")
+            return pem_files[0]
+
+        if not interactive:
+            return None
+
         if not pem_files:
             console.print("[warning]Nenhum arquivo .pem encontrado em ~/.ssh[/warning]")
             console.print("[info]Selecione o arquivo .pem usando o navegador de arquivos[/info]")
-            pem_file = Pathing.select_file(ssh_dir)
-
-            if not pem_file or not os.path.exists(pem_file):
-                console.print("[error]Arquivo .pem não encontrado. Download cancelado.[/error]")
-                return
-        elif len(pem_files) == 1:
-            pem_file = pem_files[0]
-            console.print(f"[success]Arquivo .pem encontrado: {pem_file}[/success]")
         else:
             console.print(f"[info]Encontrados {len(pem_files)} arquivos .pem em ~/.ssh[/info]")
             console.print("[info]Selecione o arquivo .pem desejado usando o navegador de arquivos[/info]")
-            pem_file = Pathing.select_file(ssh_dir)
 
-            if not pem_file or not os.path.exists(pem_file):
-                console.print("[error]Arquivo .pem não selecionado. Download cancelado.[/error]")
-                return
+        pem_file = Pathing.select_file(ssh_dir)
+        if not pem_file or not os.path.exists(pem_file):
+            return None
+        return pem_file
 
-        # List remote backups
-        remote_host = "ubuntu@teste1x.superleme.com.br"
-        remote_dir = "/home/ubuntu/bkps"
+    @staticmethod
+    def _list_remote_backups(pem_file: str, batch: bool = False) -> List[str]:
+        """Return the .backup file names available on the remote server."""
+        batch_flag = "-o BatchMode=yes " if batch else ""
+        ssh_command = f'ssh {batch_flag}-i "{pem_file}" {REMOTE_HOST} "ls -1 {REMOTE_DIR}/*.backup"'
+        result = subprocess.run(
+            ssh_command,
+            shell=True,
+            check=True,
+            capture_output=True,
+            text=True
+        )
+        return [os.path.basename(f.strip()) for f in result.stdout.strip().split('\n') if f.strip()]
 
-        console.print(f"\n[info]Listando arquivos em {remote_host}:{remote_dir}[/info]")
+    @staticmethod
+    @traced("backup.fetch", "remote_name")
+    def _fetch(pem_file: str, remote_name: str, log_file=None) -> Optional[BackupSnapshot]:
+        """Download `remote_name` into the local store, unless it is already there."""
+        existing = BackupStore.find_by_remote(remote_name)
+        if existing:
+            if log_file is None:
+                console.print(f"[success]Backup já disponível localmente, download ignorado: {BackupStore.describe(existing)}[/success]")
+            return existing
+
+        partial_file = BackupStore.partial_path(remote_name)
+        remote_file = f"{REMOTE_DIR}/{remote_name}"
+        verbose_flag = "-v " if log_file is None else "-q -o BatchMode=yes "
+        scp_command = f'scp {verbose_flag}-i "{pem_file}" {REMOTE_HOST}:{remote_file} "{partial_file}"'
+
+        if log_file is None:
+            console.print(f"\n[info]Executando: {scp_command}[/info]\n")
+            sys.stdout.flush()
+            sys.stderr.flush()
 
         try:
-            ssh_command = f'ssh -i "{pem_file}" {remote_host} "ls -1 {remote_dir}/*.backup"'
-            result = subprocess.run(
-                ssh_command,
+            subprocess.run(
+                scp_command,
                 shell=True,
                 check=True,
-                capture_output=True,
-                text=True
+                stdout=log_file,
+                stderr=log_file
             )
+            if log_file is None:
+                sys.stdout.flush()
+                sys.stderr.flush()
+
+            if not os.path.exists(partial_file):
+                if log_file is None:
+                    console.print("[warning]Comando executado, mas arquivo não encontrado no destino[/warning]")
+                return None
 
-            files = [os.path.basename(f.strip()) for f in result.stdout.strip().split('\n') if f.strip()]
+            return BackupStore.add(partial_file, remote_name)
+        finally:
+            if os.path.exists(partial_file):
+                os.remove(partial_file)
+
+    @staticmethod
+    @traced("backup.download_backup")
+    def download_backup():
+        """Download backup file from remote server."""
+        console.print("\n[info]Download de Novo Backup[/info]")
+
+        pem_file = BackupManager._find_pem_file()
+        if not pem_file:
+            console.print("[error]Arquivo .pem não encontrado. Download cancelado.[/error]")
+            return
+
+        console.print(f"\n[info]Listando arquivos em {REMOTE_HOST}:{REMOTE_DIR}[/info]")
+
+        try:
+            files = BackupManager._list_remote_backups(pem_file)
 
             if not files:
                 console.print("[error]Nenhum arquivo .backup encontrado no servidor[/error]")
                 return
 
+            choices = []
+            for name in files:
+                label = f"{name} (local)" if BackupStore.find_by_remote(name) else name
+                choices.append(questionary.Choice(label, value=name))
+
             selected_file = questionary.select(
                 "Selecione o arquivo de backup para baixar:",
-                choices=files
+                choices=choices
             ).ask()
 
             if not selected_file:
@@ -81,31 +159,10 @@ class BackupManager:
             console.print(f"[error]Erro ao conectar ao servidor: {str(e)}[/error]")
             return
 
-        data_dir = get_data_dir()
-        backup_file = get_backup_file()
-
-        remote_file = f"{remote_dir}/{selected_file}"
-        scp_command = f'scp -v -i "{pem_file}" {remote_host}:{remote_file} "{backup_file}"'
-
-        console.print(f"\n[info]Executando: {scp_command}[/info]\n")
-        sys.stdout.flush()
-        sys.stderr.flush()
-
         try:
-            result = subprocess.run(
-                scp_command,
-                shell=True,
-                check=True
-            )
-
-            sys.stdout.flush()
-            sys.stderr.flush()
-
-            if os.path.exists(backup_file):
-                console.print(f"[success]Backup baixado com sucesso: {backup_file}[/success]")
-            else:
-                console.print("[warning]Comando executado, mas arquivo não encontrado no destino[/warning]")
-
+            snapshot = BackupManager._fetch(pem_file, selected_file)
+            if snapshot:
+                console.print(f"[success]Backup disponível: {snapshot.path}[/success]")
         except subprocess.CalledProcessError as e:
             console.print(f"[error]Erro ao baixar backup:[/error]")
             console.print(f"[error]{e.stderr}[/error]")
@@ -113,32 +170,150 @@ class BackupManager:
             console.print(f"[error]Erro ao executar comando SCP: {str(e)}[/error]")
 
     @staticmethod
-    def restore_database(zotonic_root, use_docker):
-        """Restore database from backup file."""
-        backup_file = get_backup_file()
+    def prefetch_latest_in_background() -> Optional[threading.Thread]:
+        """
+        Download the newest remote backup in a background thread, if it is not stored yet.
+
+        Opt-in via AEDIFICATOR_PREFETCH_BACKUP=1. Runs non-interactively, so it needs an
+        unambiguous .pem key (a single one in ~/.ssh or AEDIFICATOR_PEM_FILE). Output goes
+        to a log file so it does not interfere with the menu.
+        """
+        if os.environ.get("AEDIFICATOR_PREFETCH_BACKUP") != "1":
+            return None
+
+        pem_file = BackupManager._find_pem_file(interactive=False)
+        if not pem_file:
+            return None
+
+        log_filename = os.path.join(get_logs_dir(), f"backup_prefetch_{time.strftime('%Y%m%d_%H%M%S')}.log")
+
+        def prefetch():
+            with open(log_filename, 'w') as log_file:
+                try:
+                    files = BackupManager._list_remote_backups(pem_file, batch=True)
+                    if not files:
+                        return
+                    newest = max(files, key=lambda name: (BackupStore.parse_remote_date(name) or "", name))
+                    log_file.write(f"Prefetch: {newest}\n")
+                    log_file.flush()
+                    snapshot = BackupManager._fetch(pem_file, newest, log_file=log_file)
+                    if snapshot:
+                        log_file.write(f"Disponível: {snapshot.path}\n")
+                except Exception as e:
+                    log_file.write(f"Erro no prefetch: {e}\n")
+
+        thread = threading.Thread(target=prefetch, daemon=True)
+        thread.start()
+        console.print(f"[info]Pré-carregando backup mais recente em background (log: {log_filename})[/info]")
+        return thread
+
+    @staticmethod
+    @traced("backup.restore_database", "use_docker")
+    def restore_database(zotonic_root, use_docker, snapshot: Optional[BackupSnapshot] = None, profile: Optional[RestoreProfile] = None):
+        """
+        Restore database from a backup in the local store.
 
-        if not os.path.exists(backup_file):
-            console.print(f"[error]Arquivo de backup não encontrado: {backup_file}[/error]")
+        `profile` restores only the DDL of the tables/schemas it excludes; None is a full restore.
+        Returns True when the restore completed.
+        """
+        if snapshot is None:
+            BackupStore.import_legacy()
+            snapshot = BackupStore.select_snapshot()
+
+        if not snapshot:
+            console.print(f"[error]Nenhum backup encontrado no armazenamento local: {get_backups_dir()}[/error]")
             console.print("[info]Execute 'Baixar Novo Backup do Banco' nas Configurações primeiro.[/info]")
-            return
+            return False
 
-        console.print(f"[info]Usando backup: {backup_file}[/info]")
+        backup_file = snapshot.path
+        BackupStore.mark_used(snapshot)
+        annotate(snapshot=snapshot.sha256[:12], size=snapshot.size, profile=profile.name if profile else None)
+        console.print(f"[info]Usando backup: {BackupStore.describe(snapshot)}[/info]")
+        if profile:
+            console.print(f"[info]Perfil de restauração: {profile.name}[/info]")
+
+        validator = BackupValidator(backup_file, snapshot.sha256, snapshot.size)
 
         if use_docker:
-            BackupManager._restore_docker(zotonic_root, backup_file)
+            restored = BackupManager._restore_docker(zotonic_root, backup_file, validator, profile)
         else:
-            BackupManager._restore_local(zotonic_root, backup_file)
+            restored = BackupManager._restore_local(zotonic_root, backup_file, validator, profile)
+
+        if restored:
+            console.print("[success]Processo de restauração finalizado![/success]")
+        return restored
+
+    @staticmethod
+    def _report_invalid(validator: BackupValidator):
+        """Print why the archive was rejected."""
+        console.print("[error]Backup inválido, restauração abortada antes de alterar o banco:[/error]")
+        for error in validator.errors:
+            console.print(f"[error]  - {error}[/error]")
+
+    @staticmethod
+    def _apply_profile(validator: BackupValidator, profile: Optional[RestoreProfile]) -> List[str]:
+        """Return the TOC to restore, with the data entries excluded by `profile` commented out."""
+        if not profile:
+            return validator.toc_lines
+        toc_lines, skipped = RestoreProfiles.filter_toc(validator.toc_lines, profile)
+        console.print(f"[info]Perfil '{profile.name}': dados de {len(skipped)} tabela(s) serão ignorados (DDL mantido)[/info]")
+        return toc_lines
 
-        console.print("[success]Processo de restauração finalizado![/success]")
+    @staticmethod
+    def _restore_log_path() -> str:
+        return os.path.join(get_logs_dir(), f"restore_{time.strftime('%Y%m%d_%H%M%S')}.log")
+
+    @staticmethod
+    @traced("backup.run", "command")
+    def _run_logged(command: str, cwd: str, log_file) -> int:
+        """Run a short command, appending its output to the restore log."""
+        log_file.write(f"\n$ {command}\n")
+        log_file.flush()
+        result = subprocess.run(command, shell=True, cwd=cwd, stdout=log_file, stderr=subprocess.STDOUT)
+        annotate(exit_code=result.returncode)
+        return result.returncode
 
     @staticmethod
-    def _restore_docker(zotonic_root, backup_file):
+    def _restore_docker(zotonic_root, backup_file, validator: BackupValidator, profile: Optional[RestoreProfile] = None) -> bool:
         """Restore database in Docker environment."""
-        console.print("[info]Iniciando container PostgreSQL...[/info]")
-        Executor.run_command("docker compose up -d postgres", zotonic_root, background=False, use_docker=False)
+        log_filename = BackupManager._restore_log_path()
+        with open(log_filename, 'w', encoding='utf-8', errors='replace') as log_file:
+            restored = BackupManager._restore_docker_steps(zotonic_root, backup_file, validator, profile, log_file)
+        console.print(f"Log: {log_filename}")
+        return restored
 
-        console.print("[info]Aguardando PostgreSQL ficar pronto...[/info]")
-        Executor.run_command("sleep 5", zotonic_root, background=False, use_docker=False)
+    @staticmethod
+    def _restore_docker_steps(zotonic_root, backup_file, validator: BackupValidator, profile: Optional[RestoreProfile], log_file) -> bool:
+        # Checksum/header validation streams the archive while the container starts
+        console.print("[info]Validando arquivo de backup em paralelo...[/info]")
+        validator.start()
+
+        console.print("[info]Iniciando container PostgreSQL e aguardando healthcheck...[/info]")
+        if BackupManager._run_logged("docker compose up -d --wait postgres", zotonic_root, log_file) != 0:
+            console.print("[error]Não foi possível iniciar o container PostgreSQL[/error]")
+            return False
+
+        if not validator.wait("docker compose exec -T postgres pg_restore", zotonic_root):
+            BackupManager._report_invalid(validator)
+            return False
+        console.print(f"[success]Backup validado ({len(validator.toc_lines)} linhas no TOC)[/success]")
+
+        toc_lines = BackupManager._apply_profile(validator, profile)
+        list_option = ""
+        if profile:
+            # pg_restore -L needs the list as a file inside the container
+            with span("backup.upload_list", entries=len(toc_lines)):
+                upload = subprocess.run(
+                    'docker compose exec -T postgres sh -c "cat > /tmp/aedificator_restore.list"',
+                    shell=True,
+                    cwd=zotonic_root,
+                    input="\n".join(toc_lines) + "\n",
+                    text=True
+                )
+            if upload.returncode != 0:
+                console.print("[error]Não foi possível enviar a lista de restauração para o container[/error]")
+                return False
+            list_option = " -L /tmp/aedificator_restore.list"
 
         # Read DB user from zotonic_site.config template
         zotonic_db_user = "postgres"  # Default fallback
@@ -163,65 +338,216 @@ class BackupManager:
 
         console.print(f"[info]DB Admin: {db_user}, Zotonic User: {zotonic_db_user}[/info]")
 
-        # Create roles
-        console.print("[info]Criando roles...[/info]")
-        Executor.run_command(
-            f'docker compose exec -T postgres psql -U {db_user} -c "DO $$ BEGIN IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = \'postgres\') THEN CREATE ROLE postgres WITH LOGIN SUPERUSER; END IF; END$$;"',
-            zotonic_root, background=False, use_docker=False
-        )
-
-        Executor.run_command(
-            f'docker compose exec -T postgres psql -U {db_user} -c "DROP ROLE IF EXISTS superleme_ro; CREATE ROLE superleme_ro;"',
-            zotonic_root, background=False, use_docker=False
-        )
-
+        # Roles are created idempotently in one transaction; DROP/CREATE DATABASE
+        # cannot run inside a transaction block, so they follow in the same session.
+        roles_sql = [
+            "DO $$ BEGIN IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'postgres') THEN CREATE ROLE postgres WITH LOGIN SUPERUSER; END IF; END $$",
+            "DO $$ BEGIN IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'superleme_ro') THEN CREATE ROLE superleme_ro; END IF; END $$",
+        ]
         if db_user != "superleme":
-            Executor.run_command(
-                f'docker compose exec -T postgres psql -U {db_user} -c "DROP ROLE IF EXISTS superleme; CREATE ROLE superleme WITH LOGIN PASSWORD \'superleme\';"',
-                zotonic_root, background=False, use_docker=False
-            )
-
-
-        # Recreate database
-        console.print("[info]Recriando banco de dados...[/info]")
-        Executor.run_command(
-            f'docker compose exec -T postgres psql -U {db_user} -c "DROP DATABASE IF EXISTS superleme;"',
-            zotonic_root, background=False, use_docker=False
-        )
-        Executor.run_command(
-            f'docker compose exec -T postgres psql -U {db_user} -c "CREATE DATABASE superleme OWNER superleme;"',
-            zotonic_root, background=False, use_docker=False
-        )
+            roles_sql += [
+                "DO $$ BEGIN IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'superleme') THEN CREATE ROLE superleme; END IF; END $$",
+                "ALTER ROLE superleme WITH LOGIN PASSWORD 'superleme'",
+            ]
+        database_sql = [
+            "DROP DATABASE IF EXISTS superleme",
+            "CREATE DATABASE superleme OWNER superleme",
+        ]
+
+        console.print("[info]Criando roles e recriando banco de dados...[/info]")
+        admin = SqlScriptRunner(f"docker compose exec -T postgres psql -U {db_user}", zotonic_root, log_file)
+        if not admin.run([(roles_sql, True), (database_sql, False)], title="Preparação do banco"):
+            console.print("[error]Falha ao preparar o banco, restauração abortada[/error]")
+            return False
 
         # Restore backup
         console.print("[info]Restaurando backup...[/info]")
-        restore_cmd = f'cat "{backup_file}" | docker compose exec -T postgres pg_restore -U {db_user} --verbose -d superleme'
-        Executor.run_command(restore_cmd, zotonic_root, background=False, use_docker=False)
+        progress = RestoreProgress(toc_lines, os.path.getsize(backup_file))
+        started_at = datetime.now()
+        restore_cmd = f'docker compose exec -T postgres pg_restore -U {db_user} --verbose -d superleme{list_option}'
+        exit_code = BackupManager._run_pg_restore(restore_cmd, zotonic_root, backup_file, progress, log_file)
+        # Grants run whatever pg_restore returned: a production dump usually restores
+        # with harmless errors (OWNER/ACL of production roles, FKs into tables a
+        # profile left out), and the database is still usable
+        grants_started = time.monotonic()
 
         # Fix permissions on schema (grant to the user defined in zotonic_site.config)
         console.print(f"[info]Corrigindo permissões do schema para usuário: {zotonic_db_user}[/info]")
 
-        permissions_sql = f"""
-            GRANT USAGE ON SCHEMA schema_superleme TO {zotonic_db_user};
-            GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA schema_superleme TO {zotonic_db_user};
-            GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA schema_superleme TO {zotonic_db_user};
-            GRANT ALL PRIVILEGES ON ALL FUNCTIONS IN SCHEMA schema_superleme TO {zotonic_db_user};
-            ALTER DEFAULT PRIVILEGES IN SCHEMA schema_superleme GRANT ALL ON TABLES TO {zotonic_db_user};
-            ALTER DEFAULT PRIVILEGES IN SCHEMA schema_superleme GRANT ALL ON SEQUENCES TO {zotonic_db_user};
+        permissions_sql = [
+            f"GRANT USAGE ON SCHEMA schema_superleme TO {zotonic_db_user}",
+            f"GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA schema_superleme TO {zotonic_db_user}",
+            f"GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA schema_superleme TO {zotonic_db_user}",
+            f"GRANT ALL PRIVILEGES ON ALL FUNCTIONS IN SCHEMA schema_superleme TO {zotonic_db_user}",
+            f"ALTER DEFAULT PRIVILEGES IN SCHEMA schema_superleme GRANT ALL ON TABLES TO {zotonic_db_user}",
+            f"ALTER DEFAULT PRIVILEGES IN SCHEMA schema_superleme GRANT ALL ON SEQUENCES TO {zotonic_db_user}",
+        ]
+
+        grants = SqlScriptRunner(f"docker compose exec -T postgres psql -U {db_user} -d superleme", zotonic_root, log_file)
+        granted = grants.run([(permissions_sql, True)], title="Permissões")
+
+        progress.add_phase_timing("grants", time.monotonic() - grants_started)
+        BackupManager._record_run(validator.expected_sha256, started_at, exit_code, progress, profile)
+
+        restored = BackupManager._report_pg_restore(exit_code, progress)
+        if not granted:
+            console.print("[warning]Permissões não foram aplicadas[/warning]")
+            return False
+        console.print("[success]Permissões configuradas![/success]")
+        return restored
+
+    @staticmethod
+    def _report_pg_restore(exit_code: int, progress: RestoreProgress) -> bool:
+        """
+        Print the outcome of pg_restore. A non-zero exit is a partial restore when
+        pg_restore went through the whole archive (it prints "errors ignored on
+        restore"), and a failure otherwise. Returns False only on failure.
+        """
+        if exit_code == 0:
+            console.print("\n[info]Banco restaurado com sucesso![/info]")
+            return True
+
+        count = progress.errors_ignored if progress.errors_ignored is not None else progress.error_count
+        for message in progress.errors:
+            console.print(f"  [dim]{message}[/dim]", highlight=False)
+        if count > len(progress.errors):
+            console.print(f"  [dim]... e mais {count - len(progress.errors)} (veja o log)[/dim]")
+        if progress.errors_ignored is not None:
+            console.print(f"\n[warning]Banco restaurado parcialmente: {count} erro(s) ignorado(s) pelo pg_restore[/warning]")
+            return True
+        console.print(f"\n[error]Restauração falhou: pg_restore terminou com código {exit_code} ({count} erro(s))[/error]")
+        return False
+
+    @staticmethod
+    def _restore_local(zotonic_root, backup_file, validator: BackupValidator, profile: Optional[RestoreProfile] = None) -> bool:
+        """Restore database locally without Docker."""
+        if not validator.validate("sudo -u postgres pg_restore"):
+            BackupManager._report_invalid(validator)
+            return False
+
+        toc_lines = BackupManager._apply_profile(validator, profile)
+        restore_cmd = 'sudo -u postgres pg_restore --verbose -d superleme'
+        list_path = None
+        if profile:
+            # Written to /tmp so the postgres user can read it
+            with tempfile.NamedTemporaryFile('w', prefix='aedificator_restore_', suffix='.list', delete=False) as list_file:
+                list_file.write("\n".join(toc_lines) + "\n")
+            list_path = list_file.name
+            os.chmod(list_path, 0o644)
+            restore_cmd += f' -L "{list_path}"'
+
+        try:
+            console.print("[info]Restaurando backup localmente...[/info]")
+            progress = RestoreProgress(toc_lines, os.path.getsize(backup_file))
+            started_at = datetime.now()
+            log_filename = BackupManager._restore_log_path()
+            with open(log_filename, 'w', encoding='utf-8', errors='replace') as log_file:
+                exit_code = BackupManager._run_pg_restore(restore_cmd, zotonic_root, backup_file, progress, log_file)
+        finally:
+            if list_path:
+                try:
+                    os.unlink(list_path)
+                except OSError:
+                    pass
+        BackupManager._record_run(validator.expected_sha256, started_at, exit_code, progress, profile)
+        restored = BackupManager._report_pg_restore(exit_code, progress)
+        console.print(f"Log: {log_filename}")
+        return restored
+
+    @staticmethod
+    @traced("backup.pg_restore", "command")
+    def _run_pg_restore(command: str, cwd: str, backup_file: str, progress: RestoreProgress, log_file) -> int:
         """
+        Run pg_restore feeding the archive through stdin, with a live progress view.
 
-        Executor.run_command(
-            f'docker compose exec -T postgres psql -U {db_user} -d superleme -c "{permissions_sql}"',
-            zotonic_root, background=False, use_docker=False
+        Feeding stdin ourselves lets us count the archive bytes consumed, which drives
+        the throughput and ETA figures. The raw verbose output goes to the restore log.
+        """
+        console.print(f"[info]Executando:[/info] {command} < {backup_file}")
+        log_file.write(f"\n$ {command} < {backup_file}\n")
+        log_file.flush()
+
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            executable='/bin/bash',
+            bufsize=0
         )
 
-        # Post-restore sync
-        console.print("\n[info]Banco restaurado com sucesso![/info]")
-        console.print("[success]Permissões configuradas![/success]")
-        
+        def feed():
+            try:
+                with open(backup_file, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                        process.stdin.write(chunk)
+                        progress.feed_bytes(len(chunk))
+            except OSError:
+                pass  # pg_restore exited early (BrokenPipe)
+            finally:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+
+        def read_output():
+            for line_bytes in iter(process.stdout.readline, b''):
+                line_str = Executor._safe_decode(line_bytes)
+                log_file.write(line_str)
+                progress.feed_line(line_str)
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        reader = threading.Thread(target=read_output, daemon=True)
+        feeder.start()
+        reader.start()
+
+        try:
+            with Live(progress.render(), console=console, refresh_per_second=4) as live:
+                while process.poll() is None:
+                    live.update(progress.render())
+                    time.sleep(0.25)
+                reader.join(timeout=5)
+                progress.finish()
+                live.update(progress.render())
+        finally:
+            if process.poll() is None:
+                process.terminate()
+                process.wait()
+            feeder.join(timeout=1)
+            reader.join(timeout=1)
+            log_file.flush()
+
+        annotate(exit_code=process.returncode, bytes=progress.bytes_read, tables=progress.tables_done)
+        if process.returncode != 0:
+            console.print(f"[warning]pg_restore terminou com código {process.returncode} (veja o log)[/warning]")
+        return process.returncode
+
     @staticmethod
-    def _restore_local(zotonic_root, backup_file):
-        """Restore database locally without Docker."""
-        console.print("[info]Restaurando backup localmente...[/info]")
-        restore_cmd = f'sudo -u postgres pg_restore --verbose -d superleme "{backup_file}"'
-        Executor.run_command(restore_cmd, zotonic_root, background=False, use_docker=False)
+    def _record_run(backup_sha256: Optional[str], started_at: datetime, exit_code: int, progress: RestoreProgress, profile: Optional[RestoreProfile] = None):
+        """Save phase timings of a restore to the run history and print them."""
+        summary = progress.summary()
+        annotate(**{f"phase_{phase}_s": seconds for phase, seconds in summary["phases"].items()})
+
+        timings = Table(title="Tempo por fase")
+        timings.add_column("Fase")
+        timings.add_column("Duração", justify="right")
+        for phase, seconds in summary["phases"].items():
+            timings.add_row(PHASE_LABELS.get(phase, phase), f"{seconds:.1f}s")
+        console.print(timings)
+
+        try:
+            RestoreRun.create(
+                backup_sha256=backup_sha256,
+                started_at=started_at,
+                finished_at=datetime.now(),
+                exit_code=exit_code,
+                bytes_total=summary["bytes_total"],
+                tables=summary["tables"],
+                phases=json.dumps(summary["phases"]),
+                largest_tables=json.dumps(summary["largest_tables"]),
+                profile=profile.name if profile else None
+            )
+        except Exception as e:
+            console.print(f"[warning]Não foi possível salvar o histórico da restauração: {e}[/warning]")
@@ -0,0 +1,128 @@
+import fnmatch
+import json
+from typing import List, Optional, Tuple
+import questionary
+from aedificator import console
+from aedificator.memory import RestoreProfile
+from .progress import parse_toc_line
+
+FULL_RESTORE_LABEL = "Completo (todos os dados)"
+
+
+class RestoreProfiles:
+    """Named restore profiles that skip the data (not the DDL) of selected tables or schemas."""
+
+    @staticmethod
+    def exclusions(profile: RestoreProfile) -> Tuple[List[str], List[str]]:
+        """Return (schemas, table patterns) excluded by a profile."""
+        schemas = json.loads(profile.exclude_schemas) if profile.exclude_schemas else []
+        tables = json.loads(profile.exclude_tables) if profile.exclude_tables else []
+        return schemas, tables
+
+    @staticmethod
+    def is_excluded(schema: str, table: str, schemas: List[str], patterns: List[str]) -> bool:
+        """Match a table against excluded schemas and `table` / `schema.table` fnmatch patterns."""
+        if schema in schemas:
+            return True
+        qualified = f"{schema}.{table}"
+        return any(fnmatch.fnmatch(table, p) or fnmatch.fnmatch(qualified, p) for p in patterns)
+
+    @staticmethod
+    def filter_toc(toc_lines: List[str], profile: RestoreProfile) -> Tuple[List[str], List[str]]:
+        """
+        Comment out the TABLE DATA entries excluded by `profile` in a `pg_restore -l` listing.
+
+        Returns the list to pass to `pg_restore -L` and the names of the skipped tables.
+        Entry order is preserved, which matters when the archive is read from stdin.
+        """
+        schemas, patterns = RestoreProfiles.exclusions(profile)
+        filtered = []
+        skipped = []
+        for line in toc_lines:
+            entry = parse_toc_line(line)
+            if entry and entry["desc"] == "TABLE DATA" and RestoreProfiles.is_excluded(entry["schema"], entry["name"], schemas, patterns):
+                filtered.append(f";{line}")
+                skipped.append(f"{entry['schema']}.{entry['name']}")
+            else:
+                filtered.append(line)
+        return filtered, skipped
+
+    @staticmethod
+    def get(name: str) -> Optional[RestoreProfile]:
+        return RestoreProfile.get_or_none(RestoreProfile.name == name)
+
+    @staticmethod
+    def select() -> Tuple[bool, Optional[RestoreProfile]]:
+        """Ask which profile to restore with. Returns (confirmed, profile); profile None means full restore."""
+        profiles = list(RestoreProfile.select().order_by(RestoreProfile.name))
+        if not profiles:
+            return True, None
+
+        labels = {FULL_RESTORE_LABEL: None}
+        for profile in profiles:
+            label = f"{profile.name} - {profile.description}" if profile.description else profile.name
+            labels[label] = profile
+
+        choice = questionary.select(
+            "Perfil de restauração:",
+            choices=list(labels.keys()) + ["Voltar"]
+        ).ask()
+        if not choice or choice == "Voltar":
+            return False, None
+        return True, labels[choice]
+
+    @staticmethod
+    def _ask_list(message: str, current: List[str]) -> List[str]:
+        answer = questionary.text(message, default=", ".join(current)).ask() or ""
+        return [item.strip() for item in answer.split(",") if item.strip()]
+
+    @staticmethod
+    def manage():
+        """Create, edit and delete restore profiles."""
+        console.print("\n[info]Perfis de Restauração[/info]")
+
+        profiles = list(RestoreProfile.select().order_by(RestoreProfile.name))
+        for profile in profiles:
+            schemas, tables = RestoreProfiles.exclusions(profile)
+            console.print(f"  [bold]{profile.name}[/bold]: schemas={schemas or '-'} tabelas={tables or '-'}")
+
+        choice = questionary.select(
+            "Escolha uma operação:",
+            choices=["Criar perfil", "Editar perfil", "Remover perfil", "Voltar"]
+        ).ask()
+
+        if choice == "Criar perfil":
+            name = questionary.text("Nome do perfil:").ask()
+            if not name:
+                return
+            if RestoreProfiles.get(name):
+                console.print(f"[error]Perfil já existe: {name}[/error]")
+                return
+            profile = RestoreProfile(name=name)
+        elif choice in ("Editar perfil", "Remover perfil"):
+            if not profiles:
+                console.print("[warning]Nenhum perfil cadastrado[/warning]")
+                return
+            name = questionary.select("Perfil:", choices=[p.name for p in profiles]).ask()
+            profile = RestoreProfiles.get(name) if name else None
+            if not profile:
+                return
+            if choice == "Remover perfil":
+                if questionary.confirm(f"Remover o perfil {name}?", default=False).ask():
+                    profile.delete_instance()
+                    console.print("[success]Perfil removido[/success]")
+                return
+        else:
+            return
+
+        schemas, tables = RestoreProfiles.exclusions(profile)
+        profile.description = questionary.text("Descrição:", default=profile.description or "").ask()
+        schemas = RestoreProfiles._ask_list("Schemas sem dados (separados por vírgula):", schemas)
+        tables = RestoreProfiles._ask_list(
+            "Tabelas sem dados (padrões fnmatch, ex: *_log, *audit*, schema_superleme.historico_*):",
+            tables
+        )
+        profile.exclude_schemas = json.dumps(schemas)
+        profile.exclude_tables = json.dumps(tables)
+        profile.save()
+        console.print(f"[success]Perfil salvo: {profile.name}[/success]")
@@ -0,0 +1,253 @@
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from rich.console import Group
+from rich.table import Table
+from rich.text import Text
+
+# Section of the restore a `pg_restore --verbose` "creating <DESC>" line belongs to
+PHASE_BY_DESC = {
+    "INDEX": "indexes",
+    "CONSTRAINT": "constraints",
+    "FK CONSTRAINT": "constraints",
+    "CHECK CONSTRAINT": "constraints",
+    "TRIGGER": "constraints",
+    "ACL": "grants",
+    "DEFAULT ACL": "grants",
+}
+
+PHASE_LABELS = {
+    "schema": "Esquema (pre-data)",
+    "data": "Carga de dados",
+    "indexes": "Índices",
+    "constraints": "Constraints",
+    "grants": "Grants",
+}
+
+# Object types pg_restore -l may list, longest first so "TABLE DATA" wins over "TABLE"
+_TOC_DESCS = sorted([
+    "TABLE DATA", "TABLE", "INDEX", "CONSTRAINT", "FK CONSTRAINT", "CHECK CONSTRAINT",
+    "TRIGGER", "ACL", "DEFAULT ACL", "SEQUENCE", "SEQUENCE SET", "SEQUENCE OWNED BY",
+    "VIEW", "MATERIALIZED VIEW", "MATERIALIZED VIEW DATA", "FUNCTION", "PROCEDURE",
+    "SCHEMA", "EXTENSION", "COMMENT", "DEFAULT", "TYPE", "DOMAIN", "RULE", "BLOBS",
+    "LARGE OBJECT", "ENCODING", "STDSTRINGS", "SEARCHPATH", "DATABASE", "AGGREGATE",
+], key=len, reverse=True)
+
+_TOC_LINE = re.compile(r'^\s*(?P<id>\d+);\s+\d+\s+\d+\s+(?P<rest>.*)$')
+_PROCESSING_DATA = re.compile(r'processing data for table "?(?P<table>[^"]+)"?')
+_CREATING = re.compile(r'creating (?P<desc>[A-Z][A-Z ]*[A-Z]) "?(?P<tag>[^"]*)"?')
+# "pg_restore: error: ..." (12+) or "pg_restore: [archiver (db)] ..." (older); the
+# summary line is only printed when pg_restore got through the whole archive
+_ERROR = re.compile(r'^pg_restore: (?:error: |\[archiver \(db\)\] )(?P<message>.*)$')
+_ERRORS_IGNORED = re.compile(r'errors ignored on restore: (?P<count>\d+)')
+
+# Error messages kept for the end-of-restore report
+MAX_ERRORS_KEPT = 5
+
+
+def parse_toc_line(line: str) -> Optional[Dict[str, str]]:
+    """Split a `pg_restore -l` entry into id, desc, schema, name and owner (None for comments)."""
+    match = _TOC_LINE.match(line)
+    if not match:
+        return None
+    rest = match.group('rest')
+    for desc in _TOC_DESCS:
+        if rest.startswith(desc + " "):
+            fields = rest[len(desc) + 1:].split(" ")
+            schema = fields[0] if fields else ""
+            owner = fields[-1] if len(fields) > 2 else ""
+            name = " ".join(fields[1:-1]) if len(fields) > 2 else " ".join(fields[1:])
+            return {"id": match.group('id'), "desc": desc, "schema": schema, "name": name, "owner": owner}
+    return {"id": match.group('id'), "desc": rest.split(" ")[0], "schema": "", "name": "", "owner": ""}
+
+
+def _format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+def _format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+class RestoreProgress:
+    """
+    Tracks a pg_restore run from its verbose output and the bytes fed to its stdin.
+
+    Object counts come from the archive TOC read up front. pg_restore -l does not
+    expose per-entry data sizes, so data progress is measured on the archive byte
+    stream: the archive is read sequentially from stdin, so bytes consumed while a
+    table is being processed are attributed to that table.
+    """
+
+    def __init__(self, toc_lines: List[str], total_bytes: int):
+        self.total_bytes = total_bytes
+        self.bytes_read = 0
+        self.counts: Dict[str, int] = {}
+        for line in toc_lines:
+            entry = parse_toc_line(line)
+            if entry:
+                self.counts[entry["desc"]] = self.counts.get(entry["desc"], 0) + 1
+
+        self.tables_total = self.counts.get("TABLE DATA", 0)
+        self.tables_done = 0
+        self.created: Dict[str, int] = {}
+        self.finished_tables: List[Dict] = []
+        self.current_table: Optional[Dict] = None
+        self.phase: Optional[str] = None
+        self.phase_started: Optional[float] = None
+        self.phase_timings: Dict[str, float] = {}
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+        self.errors: List[str] = []
+        self.error_count = 0
+        # Set from pg_restore's closing summary: it restored everything it could
+        self.errors_ignored: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def feed_bytes(self, n: int):
+        """Account bytes written to pg_restore's stdin."""
+        with self._lock:
+            self.bytes_read += n
+
+    def _enter_phase(self, phase: str, now: float):
+        if phase == self.phase:
+            return
+        if self.phase is not None:
+            self.phase_timings[self.phase] = self.phase_timings.get(self.phase, 0.0) + now - self.phase_started
+        self.phase = phase
+        self.phase_started = now
+
+    def _close_table(self, now: float):
+        if self.current_table is None:
+            return
+        table = self.current_table
+        table["bytes"] = self.bytes_read - table["start_bytes"]
+        table["seconds"] = now - table["start_time"]
+        self.finished_tables.append(table)
+        self.tables_done += 1
+        self.current_table = None
+
+    def feed_line(self, line: str):
+        """Update state from one line of `pg_restore --verbose` output."""
+        now = time.monotonic()
+        with self._lock:
+            match = _ERRORS_IGNORED.search(line)
+            if match:
+                self.errors_ignored = int(match.group('count'))
+                return
+
+            match = _ERROR.match(line.strip())
+            if match:
+                self.error_count += 1
+                if len(self.errors) < MAX_ERRORS_KEPT:
+                    self.errors.append(match.group('message'))
+                return
+
+            match = _PROCESSING_DATA.search(line)
+            if match:
+                self._close_table(now)
+                self._enter_phase("data", now)
+                self.current_table = {
+                    "name": match.group('table'),
+                    "start_bytes": self.bytes_read,
+                    "start_time": now,
+                }
+                return
+
+            match = _CREATING.search(line)
+            if match:
+                self._close_table(now)
+                desc = match.group('desc')
+                self.created[desc] = self.created.get(desc, 0) + 1
+                self._enter_phase(PHASE_BY_DESC.get(desc, "schema" if self.tables_done == 0 else self.phase or "schema"), now)
+
+    def finish(self):
+        """Close the running table and phase."""
+        now = time.monotonic()
+        with self._lock:
+            self._close_table(now)
+            if self.phase is not None:
+                self.phase_timings[self.phase] = self.phase_timings.get(self.phase, 0.0) + now - self.phase_started
+                self.phase = None
+            self.finished = now
+
+    def add_phase_timing(self, phase: str, seconds: float):
+        """Record a phase measured outside pg_restore (e.g. the post-restore grants script)."""
+        with self._lock:
+            self.phase_timings[phase] = self.phase_timings.get(phase, 0.0) + seconds
+
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated time left for the data stream, based on the average throughput so far."""
+        elapsed = time.monotonic() - self.started
+        if self.bytes_read <= 0 or elapsed <= 0 or not self.total_bytes:
+            return None
+        rate = self.bytes_read / elapsed
+        return max(self.total_bytes - self.bytes_read, 0) / rate
+
+    def render(self):
+        """Build the live progress view."""
+        now = time.monotonic()
+        with self._lock:
+            elapsed = now - self.started
+            rate = self.bytes_read / elapsed if elapsed > 0 else 0
+            percent = (self.bytes_read / self.total_bytes * 100) if self.total_bytes else 0
+
+            summary = Table.grid(padding=(0, 2))
+            summary.add_row("Fase:", PHASE_LABELS.get(self.phase, self.phase or "iniciando"))
+            summary.add_row("Arquivo:", f"{_format_bytes(self.bytes_read)} / {_format_bytes(self.total_bytes)} ({percent:.1f}%)")
+            summary.add_row("Throughput:", f"{_format_bytes(rate)}/s")
+            summary.add_row("Tempo / ETA:", f"{_format_duration(elapsed)} / {_format_duration(self.eta_seconds())}")
+            summary.add_row("Tabelas:", f"{self.tables_done}/{self.tables_total}")
+            summary.add_row(
+                "Índices / Constraints / Grants:",
+                f"{self.created.get('INDEX', 0)}/{self.counts.get('INDEX', 0)}  "
+                f"{self.created.get('CONSTRAINT', 0) + self.created.get('FK CONSTRAINT', 0)}/"
+                f"{self.counts.get('CONSTRAINT', 0) + self.counts.get('FK CONSTRAINT', 0)}  "
+                f"{self.created.get('ACL', 0)}/{self.counts.get('ACL', 0)}"
+            )
+
+            tables = Table(title="Tabelas", expand=True)
+            tables.add_column("Tabela")
+            tables.add_column("Dados", justify="right")
+            tables.add_column("Tempo", justify="right")
+            tables.add_column("Bytes/s", justify="right")
+
+            if self.current_table:
+                current_bytes = self.bytes_read - self.current_table["start_bytes"]
+                current_seconds = now - self.current_table["start_time"]
+                tables.add_row(
+                    Text(self.current_table["name"], style="bold cyan"),
+                    _format_bytes(current_bytes),
+                    _format_duration(current_seconds),
+                    f"{_format_bytes(current_bytes / current_seconds if current_seconds > 0 else 0)}/s",
+                )
+            for table in sorted(self.finished_tables, key=lambda t: t["bytes"], reverse=True)[:8]:
+                tables.add_row(
+                    table["name"],
+                    _format_bytes(table["bytes"]),
+                    _format_duration(table["seconds"]),
+                    f"{_format_bytes(table['bytes'] / table['seconds'] if table['seconds'] > 0 else 0)}/s",
+                )
+
+            return Group(summary, tables)
+
+    def summary(self) -> Dict:
+        """Data saved with the restore run history."""
+        with self._lock:
+            return {
+                "bytes_total": self.bytes_read,
+                "tables": self.tables_done,
+                "phases": {phase: round(seconds, 3) for phase, seconds in self.phase_timings.items()},
+                "largest_tables": [
+                    {"name": t["name"], "bytes": t["bytes"], "seconds": round(t["seconds"], 3)}
+                    for t in sorted(self.finished_tables, key=lambda t: t["bytes"], reverse=True)[:20]
+                ],
+            }
@@ -0,0 +1,125 @@
+import re
+import subprocess
+import time
+from typing import List, Optional, Tuple
+from rich.table import Table
+from aedificator import console
+from aedificator.tracing import traced, record, annotate
+
+# Printed by psql (\echo) before each statement so output can be attributed to it;
+# BEGIN/COMMIT get the marker without an index, their output belongs to no statement
+_MARKER = "@@aedificator_stmt"
+_NO_STATEMENT = "-"
+_TIMING = re.compile(r'^Time: ([\d.,]+) ms')
+_ERROR = re.compile(r'(ERROR|FATAL):\s*(.*)$')
+
+
+class SqlScriptRunner:
+    """
+    Runs a SQL script through one psql session with per-statement timing.
+
+    A script is a list of segments `(statements, transactional)`. Transactional
+    segments are wrapped in BEGIN/COMMIT; statements Postgres refuses to run in a
+    transaction block (CREATE/DROP DATABASE) go in non-transactional segments.
+    psql stops at the first error (ON_ERROR_STOP), so a failing transactional
+    segment is rolled back and nothing after it runs.
+    """
+
+    def __init__(self, psql_command: str, cwd: str, log_file=None):
+        self.psql_command = psql_command
+        self.cwd = cwd
+        self.log_file = log_file
+
+    @staticmethod
+    def build_script(segments: List[Tuple[List[str], bool]]) -> Tuple[str, List[str]]:
+        """Return the psql script and the flat list of statements it runs."""
+        lines = ["\\set ON_ERROR_STOP on", "\\timing on"]
+        statements = []
+        for segment, transactional in segments:
+            if transactional:
+                lines.append(f"\\echo {_MARKER} {_NO_STATEMENT}")
+                lines.append("BEGIN;")
+            for statement in segment:
+                lines.append(f"\\echo {_MARKER} {len(statements)}")
+                lines.append(statement.strip().rstrip(";") + ";")
+                statements.append(statement.strip())
+            if transactional:
+                lines.append(f"\\echo {_MARKER} {_NO_STATEMENT}")
+                lines.append("COMMIT;")
+        return "\n".join(lines) + "\n", statements
+
+    @traced("backup.sql", "title")
+    def run(self, segments: List[Tuple[List[str], bool]], title: str = "") -> bool:
+        """Run the script; print a per-statement timing/error report. Returns True on success."""
+        script, statements = SqlScriptRunner.build_script(segments)
+        timings: List[Optional[float]] = [None] * len(statements)
+        errors: List[Optional[str]] = [None] * len(statements)
+        current = None
+
+        if self.log_file:
+            self.log_file.write(f"\n-- {title}\n{script}\n")
+            self.log_file.flush()
+
+        started = time.perf_counter()
+        result = subprocess.run(
+            f"{self.psql_command} -X -f -",
+            shell=True,
+            cwd=self.cwd,
+            input=script,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors='replace'
+        )
+        elapsed = time.perf_counter() - started
+
+        for line in result.stdout.splitlines():
+            if self.log_file:
+                self.log_file.write(line + "\n")
+            if line.startswith(_MARKER):
+                index = line.split()[1]
+                current = None if index == _NO_STATEMENT else int(index)
+                continue
+            match = _TIMING.match(line)
+            if match and current is not None:
+                timings[current] = float(match.group(1).replace(",", "."))
+                continue
+            match = _ERROR.search(line)
+            if match:
+                if current is not None:
+                    errors[current] = match.group(2)
+                else:
+                    console.print(f"[error]{line}[/error]")
+        if self.log_file:
+            self.log_file.flush()
+
+        report = Table(title=f"{title} ({elapsed:.2f}s)" if title else None)
+        report.add_column("#", justify="right")
+        report.add_column("Comando")
+        report.add_column("Tempo", justify="right")
+        report.add_column("Status")
+        # psql only reports server time per statement; in the trace they are laid
+        # end to end from the start of the session, so their offsets are approximate
+        offset = started
+        for idx, statement in enumerate(statements):
+            summary = " ".join(statement.split())
+            if timings[idx] is not None:
+                record("backup.sql.statement", offset, timings[idx] / 1000, statement=summary, error=errors[idx])
+                offset += timings[idx] / 1000
+            if len(summary) > 70:
+                summary = summary[:67] + "..."
+            if errors[idx]:
+                status = f"[red]{errors[idx]}[/red]"
+            elif timings[idx] is not None:
+                status = "[green]ok[/green]"
+            else:
+                status = "[yellow]não executado[/yellow]"
+            time_str = f"{timings[idx]:.1f} ms" if timings[idx] is not None else "-"
+            report.add_row(str(idx + 1), summary, time_str, status)
+        console.print(report)
+
+        annotate(statements=len(statements), exit_code=result.returncode)
+        if result.returncode != 0:
+            console.print(f"[error]psql terminou com código {result.returncode}; a transação em andamento foi revertida[/error]")
+            return False
+        return True
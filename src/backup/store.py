@@ -0,0 +1,189 @@
+import hashlib
+import os
+import re
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+import questionary
+from aedificator import console
+from aedificator.memory import BackupSnapshot
+from aedificator.paths import get_backups_dir, get_backup_file
+
+# Retention policy for the local store: at most AEDIFICATOR_BACKUP_KEEP snapshots
+# and AEDIFICATOR_BACKUP_BUDGET_GB on disk (these defaults when unset or invalid).
+# The most recently used snapshots are kept first.
+DEFAULT_KEEP = 3
+DEFAULT_BUDGET_GB = 20.0
+
+_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class BackupStore:
+    """Content-addressed store of downloaded backups (`src/data/backups/<sha256>.backup`)."""
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        """Return the SHA-256 hex digest of a file, streaming it in chunks."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def parse_remote_date(remote_name: str) -> Optional[str]:
+        """Extract the snapshot date from names like `superleme_20251021.backup`."""
+        match = re.search(r'(\d{4})(\d{2})(\d{2})', remote_name or "")
+        if not match:
+            return None
+        return f"{match.group(1)}-{match.group(2)}-{match.group(3)}"
+
+    @staticmethod
+    def partial_path(remote_name: str) -> str:
+        """Return a unique temporary path inside the store for an in-flight download."""
+        return os.path.join(get_backups_dir(), f".{remote_name}.{uuid.uuid4().hex[:8]}.partial")
+
+    @staticmethod
+    def find_by_remote(remote_name: str) -> Optional[BackupSnapshot]:
+        """Return the stored snapshot downloaded from `remote_name`, if it is still on disk."""
+        for snapshot in BackupSnapshot.select().where(BackupSnapshot.remote_name == remote_name):
+            if os.path.exists(snapshot.path) and os.path.getsize(snapshot.path) == snapshot.size:
+                return snapshot
+        return None
+
+    @staticmethod
+    def add(file_path: str, remote_name: str) -> BackupSnapshot:
+        """Move a downloaded file into the store and record its metadata."""
+        sha256 = BackupStore.hash_file(file_path)
+        size = os.path.getsize(file_path)
+        dest = os.path.join(get_backups_dir(), f"{sha256}.backup")
+
+        existing = BackupSnapshot.get_or_none(BackupSnapshot.sha256 == sha256)
+        if existing and os.path.exists(existing.path):
+            # Same content already stored under another name: keep a single copy, and
+            # answer to the new name so find_by_remote does not download it again
+            os.remove(file_path)
+            existing.remote_name = remote_name
+            existing.remote_date = BackupStore.parse_remote_date(remote_name) or existing.remote_date
+            existing.last_used_at = datetime.now()
+            existing.save()
+            return existing
+
+        os.replace(file_path, dest)
+        if existing:
+            existing.path = dest
+            existing.size = size
+            existing.save()
+            snapshot = existing
+        else:
+            snapshot = BackupSnapshot.create(
+                sha256=sha256,
+                remote_name=remote_name,
+                remote_date=BackupStore.parse_remote_date(remote_name),
+                size=size,
+                path=dest,
+                downloaded_at=datetime.now()
+            )
+
+        BackupStore.prune(protect=snapshot)
+        return snapshot
+
+    @staticmethod
+    def list_snapshots() -> List[BackupSnapshot]:
+        """Return stored snapshots, newest first. Rows whose file vanished are dropped."""
+        snapshots = []
+        for snapshot in BackupSnapshot.select():
+            if os.path.exists(snapshot.path):
+                snapshots.append(snapshot)
+            else:
+                snapshot.delete_instance()
+        snapshots.sort(key=lambda s: (s.remote_date or "", s.downloaded_at), reverse=True)
+        return snapshots
+
+    @staticmethod
+    def latest() -> Optional[BackupSnapshot]:
+        """Return the snapshot with the most recent remote date."""
+        snapshots = BackupStore.list_snapshots()
+        return snapshots[0] if snapshots else None
+
+    @staticmethod
+    def find(sha_prefix: str) -> Optional[BackupSnapshot]:
+        """Return the snapshot whose hash starts with `sha_prefix` or whose remote name matches."""
+        for snapshot in BackupStore.list_snapshots():
+            if snapshot.sha256.startswith(sha_prefix) or snapshot.remote_name == sha_prefix:
+                return snapshot
+        return None
+
+    @staticmethod
+    def mark_used(snapshot: BackupSnapshot):
+        """Record that a snapshot was just used, so the retention policy keeps it."""
+        snapshot.last_used_at = datetime.now()
+        snapshot.save()
+
+    @staticmethod
+    def retention() -> Tuple[int, int]:
+        """(max snapshots, max bytes) from the environment, falling back to the defaults."""
+        try:
+            max_versions = int(os.environ.get("AEDIFICATOR_BACKUP_KEEP", DEFAULT_KEEP))
+        except ValueError:
+            console.print("[warning]AEDIFICATOR_BACKUP_KEEP inválido, usando o padrão[/warning]")
+            max_versions = DEFAULT_KEEP
+        try:
+            budget_gb = float(os.environ.get("AEDIFICATOR_BACKUP_BUDGET_GB", DEFAULT_BUDGET_GB))
+        except ValueError:
+            console.print("[warning]AEDIFICATOR_BACKUP_BUDGET_GB inválido, usando o padrão[/warning]")
+            budget_gb = DEFAULT_BUDGET_GB
+        return max_versions, int(budget_gb * 1024 ** 3)
+
+    @staticmethod
+    def prune(protect: Optional[BackupSnapshot] = None):
+        """Evict least recently used snapshots beyond the retention policy (see retention())."""
+        max_versions, max_bytes = BackupStore.retention()
+        snapshots = BackupStore.list_snapshots()
+        snapshots.sort(key=lambda s: max(s.last_used_at or s.downloaded_at, s.downloaded_at), reverse=True)
+
+        kept = []
+        total = 0
+        for snapshot in snapshots:
+            is_protected = protect is not None and snapshot.sha256 == protect.sha256
+            over_budget = len(kept) >= max_versions or (kept and total + snapshot.size > max_bytes)
+            if over_budget and not is_protected:
+                console.print(f"[info]Removendo backup antigo do armazenamento local: {snapshot.remote_name}[/info]")
+                try:
+                    os.remove(snapshot.path)
+                except OSError:
+                    pass
+                snapshot.delete_instance()
+                continue
+            kept.append(snapshot)
+            total += snapshot.size
+
+    @staticmethod
+    def import_legacy():
+        """Move the old fixed-path `backup.backup` into the store, if present."""
+        legacy_file = get_backup_file()
+        if not os.path.exists(legacy_file):
+            return None
+        console.print(f"[info]Importando backup existente para o armazenamento local: {legacy_file}[/info]")
+        return BackupStore.add(legacy_file, os.path.basename(legacy_file))
+
+    @staticmethod
+    def describe(snapshot: BackupSnapshot) -> str:
+        """Human-readable one-line label for menus."""
+        size_mb = snapshot.size / (1024 * 1024)
+        date = snapshot.remote_date or snapshot.downloaded_at.strftime("%Y-%m-%d")
+        return f"{snapshot.remote_name} ({date}, {size_mb:.0f} MB, {snapshot.sha256[:12]})"
+
+    @staticmethod
+    def select_snapshot() -> Optional[BackupSnapshot]:
+        """Let the user pick one of the stored snapshots (skips the prompt when there is only one)."""
+        snapshots = BackupStore.list_snapshots()
+        if len(snapshots) <= 1:
+            return snapshots[0] if snapshots else None
+
+        labels = {BackupStore.describe(s): s for s in snapshots}
+        choice = questionary.select(
+            "Selecione o backup para restaurar:",
+            choices=list(labels.keys())
+        ).ask()
+        return labels.get(choice)
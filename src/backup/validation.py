@@ -0,0 +1,147 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from typing import List, Optional
+from aedificator.tracing import traced, current, joined
+
+# pg_dump custom-format archives start with this magic, followed by the
+# archive version (major, minor, rev), int size, offset size and format.
+PGDMP_MAGIC = b"PGDMP"
+ARCHIVE_FORMAT_CUSTOM = 1
+
+_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class BackupValidator:
+    """
+    Pre-flight checks for a pg_dump archive, run before any destructive restore step.
+
+    The checksum pass streams the whole file, so it is started in a background
+    thread and joined after the PostgreSQL container is up.
+    """
+
+    def __init__(self, backup_file: str, expected_sha256: Optional[str] = None, expected_size: Optional[int] = None):
+        self.backup_file = backup_file
+        self.expected_sha256 = expected_sha256
+        self.expected_size = expected_size
+        self.errors: List[str] = []
+        self.toc_lines: List[str] = []
+        # Why the host's pg_restore could not read the TOC; wait() retries with its toc_command
+        self.toc_error: Optional[str] = None
+        self._thread = None
+
+    @traced("backup.validate.header")
+    def check_header(self):
+        """Check that the file is a non-empty pg_dump custom-format archive."""
+        if not os.path.exists(self.backup_file):
+            self.errors.append(f"Arquivo não encontrado: {self.backup_file}")
+            return False
+
+        size = os.path.getsize(self.backup_file)
+        if size == 0:
+            self.errors.append("Arquivo de backup vazio")
+            return False
+        if self.expected_size is not None and size != self.expected_size:
+            self.errors.append(f"Tamanho inesperado: {size} bytes (esperado {self.expected_size})")
+            return False
+
+        with open(self.backup_file, 'rb') as f:
+            header = f.read(11)
+        if not header.startswith(PGDMP_MAGIC) or len(header) < 11:
+            self.errors.append("Cabeçalho inválido: não é um arquivo do pg_dump (PGDMP)")
+            return False
+        if header[10] != ARCHIVE_FORMAT_CUSTOM:
+            self.errors.append(f"Formato de arquivo não suportado ({header[10]}), esperado formato custom (-Fc)")
+            return False
+        return True
+
+    @traced("backup.validate.checksum")
+    def check_checksum(self):
+        """Stream the archive and compare its SHA-256 with the one recorded at download time."""
+        if not self.expected_sha256:
+            return True
+        digest = hashlib.sha256()
+        with open(self.backup_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        if digest.hexdigest() != self.expected_sha256:
+            self.errors.append("Checksum SHA-256 não confere: arquivo corrompido ou truncado")
+            return False
+        return True
+
+    @traced("backup.validate.toc", "command")
+    def list_toc(self, command: str, cwd: Optional[str] = None, final: bool = True):
+        """
+        Read the archive table of contents with `pg_restore -l` (`command` is the pg_restore
+        invocation). When not `final` a failure only sets toc_error, for another pg_restore to retry.
+        """
+        error = None
+        try:
+            with open(self.backup_file, 'rb') as stdin:
+                result = subprocess.run(
+                    f"{command} -l",
+                    shell=True,
+                    cwd=cwd,
+                    stdin=stdin,
+                    capture_output=True,
+                    text=True,
+                    errors='replace'
+                )
+        except Exception as e:
+            error = f"Não foi possível executar pg_restore -l: {e}"
+        else:
+            if result.returncode != 0:
+                error = f"pg_restore -l falhou: {result.stderr.strip()}"
+            else:
+                lines = result.stdout.splitlines()
+                if not [line for line in lines if line and not line.startswith(';')]:
+                    error = "TOC do arquivo está vazio"
+                else:
+                    self.toc_lines = lines
+                    self.toc_error = None
+                    return True
+
+        if final:
+            self.errors.append(error)
+        else:
+            self.toc_error = error
+        return False
+
+    def start(self):
+        """Run header, checksum and (when pg_restore exists on the host) TOC checks in a background thread."""
+        # The checks are steps of the caller's operation: their spans go to its trace
+        parent = current()
+
+        def run():
+            with joined(parent):
+                if not self.check_header():
+                    return
+                # The host's pg_restore may be older than the archive; the TOC is then read again in wait()
+                if shutil.which("pg_restore"):
+                    self.list_toc("pg_restore", final=False)
+                self.check_checksum()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        return self
+
+    @traced("backup.validate.wait")
+    def wait(self, toc_command: Optional[str] = None, cwd: Optional[str] = None) -> bool:
+        """
+        Join the background checks. When the TOC could not be read on the host,
+        read it with `toc_command` (e.g. pg_restore inside the container).
+        """
+        if self._thread:
+            self._thread.join()
+        if not self.errors and not self.toc_lines:
+            if toc_command:
+                self.list_toc(toc_command, cwd)
+            elif self.toc_error:
+                self.errors.append(self.toc_error)
+        return not self.errors
+
+    def validate(self, toc_command: str = "pg_restore", cwd: Optional[str] = None) -> bool:
+        """Run all checks synchronously."""
+        return self.start().wait(toc_command, cwd)
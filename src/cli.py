@@ -1,7 +1,28 @@
-from aedificator.main import Main
+import os
+import sys
 import traceback
 
 if __name__ == "__main__":
+    # --profile[=cprofile] before any subcommand: profile Aedificator's own code (aedificator/profiling.py)
+    if len(sys.argv) > 1 and sys.argv[1].split("=", 1)[0] == "--profile":
+        flag = sys.argv.pop(1)
+        os.environ["AEDIFICATOR_PROFILE"] = flag.split("=", 1)[1] if "=" in flag else "sample"
+
+    if len(sys.argv) > 1:
+        # With the daemon running, run/make are only forwarded to it (no rich/peewee here);
+        # not when profiling, which has to happen in this process
+        profiling = os.environ.get("AEDIFICATOR_PROFILE", "").lower() not in ("", "0", "off", "false")
+        if sys.argv[1] in ("run", "make") and not profiling:
+            from daemon.client import DaemonClient
+            code = DaemonClient().forward(sys.argv[1:])
+            if code is not None:
+                sys.exit(code)
+
+        # Subcommands skip path detection and the interactive menu
+        from commands import CommandManager
+        sys.exit(CommandManager.main(sys.argv[1:]))
+
+    from aedificator.main import Main
     try:
         AedificatorClient = Main()
     except Exception as err:
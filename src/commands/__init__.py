@@ -0,0 +1,5 @@
+"""Non-interactive command line subcommands."""
+
+from .manager import CommandManager
+
+__all__ = ['CommandManager']
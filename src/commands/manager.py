@@ -0,0 +1,330 @@
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from peewee import OperationalError
+from aedificator import console
+from aedificator.memory import initialize_database, ensure_schema, Paths, ConfigCache, MODELS
+from aedificator.paths import get_logs_dir
+from aedificator.profiling import profiled
+
+# Accepted project names -> (Paths column, DockerConfiguration.project_name, log prefix)
+PROJECTS = {
+    "superleme": ("superleme_path", "superleme", "superleme"),
+    "phoenix": ("sl_phoenix_path", "sl_phoenix", "sl_phoenix"),
+    "sl_phoenix": ("sl_phoenix_path", "sl_phoenix", "sl_phoenix"),
+    "extension": ("extension_path", None, "extension"),
+}
+
+EXIT_OK = 0
+EXIT_FAILURE = 1
+EXIT_USAGE = 2
+
+
+class CommandManager:
+    """
+    Non-interactive subcommands (`cli.py run|make|restore|build-image|logs|daemon`).
+
+    Projects are resolved from the stored configuration; nothing is detected or
+    prompted, and the menu is never built. Each command returns an exit code.
+    """
+
+    @staticmethod
+    def build_parser() -> argparse.ArgumentParser:
+        parser = argparse.ArgumentParser(
+            prog="aedificator",
+            description="Executa ações do Aedificator sem o menu interativo."
+        )
+        sub = parser.add_subparsers(dest="command", required=True)
+
+        run = sub.add_parser("run", help="Executa um comando na pasta do projeto")
+        run.add_argument("project", choices=PROJECTS)
+        run.add_argument("--docker", action=argparse.BooleanOptionalAction, default=None,
+                         help="Força (ou desativa) a execução via Docker")
+        run.add_argument("argv", nargs=argparse.REMAINDER, help="Comando a executar (use -- antes dele)")
+
+        make = sub.add_parser("make", help="Executa targets do Makefile do projeto")
+        make.add_argument("project", choices=PROJECTS)
+        make.add_argument("targets", nargs="+")
+        make.add_argument("--docker", action=argparse.BooleanOptionalAction, default=None)
+
+        restore = sub.add_parser("restore", help="Restaura o banco a partir do armazenamento local de backups")
+        restore.add_argument("--snapshot", help="Prefixo do SHA-256 ou nome remoto (padrão: o mais recente)")
+        restore.add_argument("--profile", help="Nome do perfil de restauração (padrão: completo)")
+        restore.add_argument("--docker", action=argparse.BooleanOptionalAction, default=None)
+
+        build = sub.add_parser("build-image", help="Builda a imagem Docker de um projeto")
+        build.add_argument("project", choices=["superleme", "phoenix", "sl_phoenix", "all"])
+        build.add_argument("--tag", default="latest")
+
+        logs = sub.add_parser("logs", help="Mostra o log mais recente")
+        logs.add_argument("prefix", nargs="?", help="Projeto ou prefixo do log (superleme, sl_phoenix, restore, ...)")
+        logs.add_argument("-n", "--lines", type=int, default=50)
+        logs.add_argument("-f", "--follow", action="store_true")
+        logs.add_argument("--list", action="store_true", help="Lista os arquivos de log")
+
+        zotonic = sub.add_parser("zotonic", help="Chama o nó Zotonic em execução via RPC (status, reload, flush, restart, stop)")
+        zotonic.add_argument("action", choices=["status", "restart", "reload", "flush", "stop"])
+        zotonic.add_argument("--site", help="Site Zotonic (padrão: $AEDIFICATOR_ZOTONIC_SITE ou superleme)")
+
+        watch = sub.add_parser("watch", help="Recompila e recarrega módulos do Superleme a cada alteração")
+        watch.add_argument("--docker", action=argparse.BooleanOptionalAction, default=None)
+
+        sub.add_parser("cache-stats", help="Mostra tamanho e uso dos caches de dependências (hex, npm, rebar3)")
+
+        daemon = sub.add_parser("daemon", help="Controla o daemon residente")
+        daemon.add_argument("action", choices=["start", "stop", "status", "jobs", "serve"])
+
+        return parser
+
+    @staticmethod
+    def main(argv: List[str]) -> int:
+        args = CommandManager.build_parser().parse_args(argv)
+        handler = {
+            "run": CommandManager.run,
+            "make": CommandManager.make,
+            "restore": CommandManager.restore,
+            "build-image": CommandManager.build_image,
+            "logs": CommandManager.logs,
+            "zotonic": CommandManager.zotonic,
+            "watch": CommandManager.watch,
+            "cache-stats": CommandManager.cache_stats,
+            "daemon": CommandManager.daemon,
+        }[args.command]
+
+        if args.command not in ("logs", "daemon"):
+            db = initialize_database()
+            # run/make only read tables that exist since the first release (the
+            # history table is created on first use); skip the schema check there
+            # to keep the path to the child process short
+            if args.command in ("restore", "build-image"):
+                ensure_schema(db, MODELS)
+        try:
+            with profiled(f"cli {args.command}"):
+                return handler(args)
+        except KeyboardInterrupt:
+            return 130
+
+    @staticmethod
+    def resolve(project: str) -> Tuple[Optional[str], Dict]:
+        """Return (working directory, docker config) of a project, or (None, {}) when not configured."""
+        column, config_name, _ = PROJECTS[project]
+        try:
+            paths = Paths.select().first()
+        except OperationalError:
+            # Fresh data directory: the schema is only created by the first interactive run
+            paths = None
+        path = getattr(paths, column) if paths else None
+        if not path or not os.path.isdir(path):
+            console.print(f"[error]Projeto '{project}' não configurado ou caminho inexistente: {path}[/error]")
+            console.print("[info]Execute o aedificator sem argumentos para configurar os caminhos.[/info]")
+            return None, {}
+
+        if project == "superleme":
+            path = os.path.dirname(os.path.dirname(path))
+
+        config = ConfigCache.get(config_name) if config_name else None
+        return path, config.as_dict() if config else {'use_docker': False}
+
+    @staticmethod
+    def _exit_code(process) -> int:
+        if process is None:
+            return EXIT_FAILURE
+        return process.returncode
+
+    @staticmethod
+    def run(args) -> int:
+        argv = args.argv[1:] if args.argv[:1] == ["--"] else args.argv
+        if not argv:
+            console.print("[error]Informe o comando a executar, ex: run superleme -- make[/error]")
+            return EXIT_USAGE
+        cwd, docker_config = CommandManager.resolve(args.project)
+        if not cwd:
+            return EXIT_USAGE
+
+        from executor import Executor
+        use_docker = docker_config.get('use_docker', False) if args.docker is None else args.docker
+        process = Executor.run_command(" ".join(argv), cwd, background=False, use_docker=use_docker, docker_config=docker_config)
+        return CommandManager._exit_code(process)
+
+    @staticmethod
+    def make(args) -> int:
+        cwd, docker_config = CommandManager.resolve(args.project)
+        if not cwd:
+            return EXIT_USAGE
+
+        from executor import Executor
+        use_docker = docker_config.get('use_docker', False) if args.docker is None else args.docker
+        process = Executor.run_make(" ".join(args.targets), cwd, background=False, use_docker=use_docker, docker_config=docker_config)
+        return CommandManager._exit_code(process)
+
+    @staticmethod
+    def restore(args) -> int:
+        zotonic_root, docker_config = CommandManager.resolve("superleme")
+        if not zotonic_root:
+            return EXIT_USAGE
+
+        from backup import BackupManager, BackupStore, RestoreProfiles
+        BackupStore.import_legacy()
+        snapshot = BackupStore.find(args.snapshot) if args.snapshot else BackupStore.latest()
+        if not snapshot:
+            console.print(f"[error]Backup não encontrado: {args.snapshot or 'armazenamento vazio'}[/error]")
+            return EXIT_FAILURE
+
+        profile = None
+        if args.profile:
+            profile = RestoreProfiles.get(args.profile)
+            if not profile:
+                console.print(f"[error]Perfil de restauração não encontrado: {args.profile}[/error]")
+                return EXIT_USAGE
+
+        use_docker = docker_config.get('use_docker', False) if args.docker is None else args.docker
+        restored = BackupManager.restore_database(zotonic_root, use_docker, snapshot=snapshot, profile=profile)
+        return EXIT_OK if restored else EXIT_FAILURE
+
+    @staticmethod
+    def build_image(args) -> int:
+        from aedificator.docker import DockerManager
+
+        targets = ["superleme", "phoenix"] if args.project == "all" else [args.project]
+        for project in targets:
+            cwd, _ = CommandManager.resolve(project)
+            if not cwd:
+                return EXIT_USAGE
+            code = DockerManager.build_project_image(PROJECTS[project][1], cwd, args.tag)
+            if code != 0:
+                return code if code is not None else EXIT_FAILURE
+        return EXIT_OK
+
+    @staticmethod
+    def logs(args) -> int:
+        log_dir = get_logs_dir()
+        prefix = PROJECTS[args.prefix][2] if args.prefix in PROJECTS else (args.prefix or "")
+        files = sorted(
+            (entry for entry in os.scandir(log_dir) if entry.is_file() and entry.name.startswith(prefix)),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True
+        )
+
+        if args.list:
+            for entry in files:
+                print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry.stat().st_mtime))}  {entry.stat().st_size:>10}  {entry.path}")
+            return EXIT_OK
+        if not files:
+            console.print(f"[warning]Nenhum log encontrado em {log_dir}[/warning]")
+            return EXIT_FAILURE
+
+        path = files[0].path
+        console.print(f"[info]{path}[/info]", highlight=False)
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.readlines()
+            sys.stdout.write("".join(lines[-args.lines:] if args.lines > 0 else lines))
+            sys.stdout.flush()
+            if not args.follow:
+                return EXIT_OK
+            try:
+                while True:
+                    line = f.readline()
+                    if line:
+                        sys.stdout.write(line)
+                        sys.stdout.flush()
+                    else:
+                        time.sleep(0.2)
+            except KeyboardInterrupt:
+                return EXIT_OK
+
+    @staticmethod
+    def zotonic(args) -> int:
+        from erlang import ErlangNode, ZotonicRpc, RpcError, PYRLANG_AVAILABLE
+        from daemon import DaemonClient
+
+        rpc = ZotonicRpc(site=args.site)
+        if PYRLANG_AVAILABLE and not DaemonClient().available():
+            # No daemon holding a connection: this process becomes the control node
+            rpc.erlang = ErlangNode()
+            rpc.erlang.start()
+
+        started = time.perf_counter()
+        try:
+            result = rpc.execute(args.action)
+        except RpcError as e:
+            zotonic_root, docker_config = CommandManager.resolve("superleme")
+            if not zotonic_root:
+                return EXIT_USAGE
+            from executor import Executor
+            command = rpc.fallback_command(args.action, docker_config.get('use_docker', False))
+            console.print(f"[warning]Sem conexão direta com {rpc.node_name} ({e}); executando {command}[/warning]")
+            return CommandManager._exit_code(Executor.run_command(command, zotonic_root, background=False, use_docker=False))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if args.action == "status":
+            console.print(f"{result['node']}  |  ativo há {int(result['uptime'])}s  |  {elapsed_ms:.1f} ms")
+            for site, status in sorted(result["sites"].items()):
+                console.print(f"  {site}: {status}")
+        else:
+            console.print(f"{args.action}: {result} ({elapsed_ms:.1f} ms)")
+        return EXIT_OK
+
+    @staticmethod
+    def watch(args) -> int:
+        from erlang import ErlangNode, PYRLANG_AVAILABLE
+        from daemon import DaemonClient
+        from watch import WatchManager
+
+        zotonic_root, docker_config = CommandManager.resolve("superleme")
+        if not zotonic_root:
+            return EXIT_USAGE
+        superleme_path = Paths.select().first().superleme_path
+        use_docker = docker_config.get('use_docker', False) if args.docker is None else args.docker
+
+        erlang = None
+        if PYRLANG_AVAILABLE and not DaemonClient().available():
+            erlang = ErlangNode()
+            erlang.start()
+        WatchManager.run(superleme_path, zotonic_root, use_docker, erlang)
+        return EXIT_OK
+
+    @staticmethod
+    def cache_stats(args) -> int:
+        from aedificator.docker import CacheVolumes
+        CacheVolumes.show_stats()
+        return EXIT_OK
+
+    @staticmethod
+    def daemon(args) -> int:
+        from daemon import DaemonClient, DaemonError
+        from daemon.server import DaemonServer
+
+        if args.action == "serve":
+            return DaemonServer().serve()
+        if args.action == "start":
+            return DaemonServer.start()
+
+        if args.action == "jobs":
+            # The jobs table is the record of background jobs; rows of the daemon's
+            # jobs are settled against it (or marked lost when it is gone)
+            from jobs import JobManager
+            ensure_schema(initialize_database(), MODELS)
+            JobManager.show()
+            return EXIT_OK
+
+        client = DaemonClient()
+        if not client.available():
+            console.print("[warning]Daemon não está em execução[/warning]")
+            return EXIT_FAILURE if args.action != "stop" else EXIT_OK
+        try:
+            if args.action == "stop":
+                client.request("shutdown")
+                console.print("[success]Daemon encerrado[/success]")
+            else:
+                status = client.request("status")
+                console.print(f"PID: {status['pid']}  |  ativo há {int(status['uptime'])}s  |  socket: {status['socket']}")
+                console.print(f"Docker: {status['docker'] or 'indisponível'}  |  nó Erlang: {status['erlang_node'] or 'inativo'}")
+                for name, cwd in status['projects'].items():
+                    console.print(f"  {name}: {cwd}")
+                console.print(f"Jobs em execução: {status['jobs']}")
+        except (OSError, DaemonError) as e:
+            console.print(f"[error]Erro ao falar com o daemon: {e}[/error]")
+            return EXIT_FAILURE
+        return EXIT_OK
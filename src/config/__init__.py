@@ -1,5 +1,6 @@
 """Configuration management."""
 
 from .manager import ConfigManager
+from .env_file import EnvFile
 
-__all__ = ['ConfigManager']
+__all__ = ['ConfigManager', 'EnvFile']
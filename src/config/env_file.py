@@ -0,0 +1,91 @@
+import os
+import re
+import tempfile
+from typing import Dict, List, Optional
+
+_ASSIGNMENT = re.compile(r'^(\s*(?:export\s+)?)([A-Za-z_][A-Za-z0-9_]*)(\s*=)(.*)$')
+
+
+def write_atomic(path: str, content: str):
+    """Replace `path` with `content` through a temporary file and a rename, keeping its mode."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class EnvFile:
+    """
+    A docker compose `.env` edited in place.
+
+    Comments, blank lines and key order are kept: a key is updated on the line
+    where it is defined (the last one, which is the one compose uses) and new
+    keys are appended. save() writes through a temporary file and a rename, and
+    only when the content changed, so the file's mtime moves only on real
+    changes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(path, 'r') as f:
+                self._original = f.read()
+        except FileNotFoundError:
+            self._original = None
+        self.lines: List[str] = (self._original or "").splitlines()
+        self._index: Dict[str, int] = {}
+        for idx, line in enumerate(self.lines):
+            match = _ASSIGNMENT.match(line)
+            if match:
+                self._index[match.group(2)] = idx
+
+    def get(self, key: str) -> Optional[str]:
+        if key not in self._index:
+            return None
+        return _ASSIGNMENT.match(self.lines[self._index[key]]).group(4)
+
+    def set(self, key: str, value: str):
+        if key in self._index:
+            idx = self._index[key]
+            prefix, _, equals, _ = _ASSIGNMENT.match(self.lines[idx]).groups()
+            self.lines[idx] = f"{prefix}{key}{equals}{value}"
+        else:
+            self._index[key] = len(self.lines)
+            self.lines.append(f"{key}={value}")
+
+    def update(self, values: Dict[str, Optional[str]]):
+        """Set every key whose value is not None."""
+        for key, value in values.items():
+            if value is not None:
+                self.set(key, value)
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n" if self.lines else ""
+
+    @property
+    def changed(self) -> bool:
+        return self.render() != (self._original or "")
+
+    def save(self) -> bool:
+        """Write the file if its content changed; returns True when it was written."""
+        content = self.render()
+        if content == self._original:
+            return False
+
+        write_atomic(self.path, content)
+        self._original = content
+        return True
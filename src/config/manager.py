@@ -1,95 +1,148 @@
+import hashlib
 import subprocess
 import os
-import json
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from aedificator import console
 from aedificator.paths import get_data_dir
+from aedificator.memory import LanguageVersions
+from aedificator.tracing import traced
+from .env_file import EnvFile, write_atomic
+
+# Site config, relative to the Zotonic root (mounted at CONTAINER_ROOT in the zotonic service)
+SITE_CONFIG_PATH = "apps_user/superleme/superleme/priv/zotonic_site.config"
+CONTAINER_ROOT = "/opt/zotonic"
 
 class ConfigManager:
     """Manages project configuration files and Docker settings."""
 
+    # .env path -> (values, mtime) already written in this process
+    _env_synced: Dict[str, Tuple[Dict[str, str], int]] = {}
+
     @staticmethod
-    def update_docker_versions(cwd: str, docker_config: Optional[Dict] = None):
-        """Update .env file with versions from database config."""
-        if not docker_config:
-            return
+    def env_values(docker_config: Dict, postgres_version: Optional[str] = None) -> Dict[str, str]:
+        """The .env keys that follow the database config."""
+        values = {'POSTGRES_VERSION': postgres_version or docker_config.get('postgres_version')}
+        try:
+            langs = LanguageVersions.parse(docker_config.get('languages'))
+            values['ERLANG_VERSION'] = langs.get('erlang') or None
+            values['ELIXIR_VERSION'] = langs.get('elixir') or None
+            values['NODE_VERSION'] = langs.get('node') or None
+        except Exception:
+            pass
+        return {k: v for k, v in values.items() if v}
 
+    @staticmethod
+    @traced("config.update_docker_versions", "cwd")
+    def update_docker_versions(cwd: str, docker_config: Optional[Dict] = None, postgres_version: Optional[str] = None) -> bool:
+        """
+        Merge the versions from the database config into .env, keeping its other
+        keys and comments. Written only when something changed, and checked once
+        per process for the same values (unless the file was touched since).
+        Returns True when the file was written.
+        """
+        if not docker_config and not postgres_version:
+            return False
+
+        values = ConfigManager.env_values(docker_config or {}, postgres_version)
+        if 'POSTGRES_VERSION' not in values:
+            return False
+
+        path = os.path.join(cwd, '.env')
         try:
-            postgres_version = docker_config.get('postgres_version')
-            if not postgres_version:
-                return
-
-            env_file = os.path.join(cwd, '.env')
-            env_lines = {}
-
-            if os.path.exists(env_file):
-                try:
-                    with open(env_file, 'r') as f:
-                        for line in f:
-                            if '=' in line:
-                                k, v = line.rstrip('\n').split('=', 1)
-                                env_lines[k] = v
-                except Exception:
-                    env_lines = {}
-
-            env_lines['POSTGRES_VERSION'] = postgres_version
-            
-            # Update optional language versions
-            try:
-                langs = json.loads(docker_config.get('languages', '{}'))
-                if langs.get('erlang'): env_lines['ERLANG_VERSION'] = langs.get('erlang')
-                if langs.get('elixir'): env_lines['ELIXIR_VERSION'] = langs.get('elixir')
-                if langs.get('node'):   env_lines['NODE_VERSION'] = langs.get('node')
-            except Exception: pass
-
-            with open(env_file, 'w') as f:
-                for k, v in env_lines.items():
-                    f.write(f"{k}={v}\n")
-
-            console.print(f"[success].env atualizado: POSTGRES_VERSION={postgres_version}[/success]")
+            if ConfigManager._env_synced.get(path) == (values, os.stat(path).st_mtime_ns):
+                return False
+        except OSError:
+            pass
 
-        except Exception as e:
+        try:
+            env_file = EnvFile(path)
+            env_file.update(values)
+            written = env_file.save()
+            ConfigManager._env_synced[path] = (values, os.stat(path).st_mtime_ns)
+        except OSError as e:
             console.print(f"[warning]Erro no .env: {e}[/warning]")
+            return False
+
+        if written:
+            console.print(f"[success].env atualizado: POSTGRES_VERSION={values['POSTGRES_VERSION']}[/success]")
+        return written
 
     @staticmethod
-    def ensure_superleme_config(zotonic_root, superleme_path):
-        """Force-create the correct zotonic_site.config in the container using local template."""
+    def _running_container(zotonic_root: str, service: str = "zotonic") -> Optional[str]:
+        """ID of a running container of the compose service, if any."""
+        try:
+            result = subprocess.run(
+                ["docker", "compose", "ps", "-q", "--status", "running", service],
+                cwd=zotonic_root, capture_output=True, text=True, timeout=10
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        ids = result.stdout.split()
+        return ids[0] if result.returncode == 0 and ids else None
 
-        config_file_path = "/opt/zotonic/apps_user/superleme/superleme/priv/zotonic_site.config"
-        
+    @staticmethod
+    @traced("config.ensure_superleme_config", "zotonic_root")
+    def ensure_superleme_config(zotonic_root, superleme_path):
+        """
+        Write zotonic_site.config from the local template. The compose file
+        bind-mounts the Zotonic root at /opt/zotonic, so the file is written on
+        the host and nothing is done when its content already matches; a
+        running container gets it through `docker compose cp` when the host
+        path is not writable, and a one-off container is the last resort.
+        """
         current_dir = os.path.dirname(os.path.abspath(__file__))
         template_path = os.path.join(current_dir, "templates", "superleme.config")
-        
-        console.print(f"[info]Procurando template em: {template_path}[/info]")
 
         if not os.path.exists(template_path):
             console.print(f"[error]Template não encontrado! Crie o arquivo em: {template_path}[/error]")
             return
 
-        try:
-            console.print("[info]Escrevendo zotonic_site.config no container...[/info]")
+        with open(template_path, 'r') as f:
+            content = f.read()
 
-            # First, ensure the directory exists
-            config_dir = os.path.dirname(config_file_path)
-            mkdir_cmd = f'docker compose run --rm -T zotonic bash -c "mkdir -p {config_dir}"'
+        host_path = os.path.join(zotonic_root, SITE_CONFIG_PATH)
+        container_path = f"{CONTAINER_ROOT}/{SITE_CONFIG_PATH}"
 
-            console.print(f"[info]Criando diretório: {config_dir}[/info]")
-            mkdir_result = subprocess.run(mkdir_cmd, shell=True, cwd=zotonic_root, capture_output=True, text=True)
-
-            if mkdir_result.returncode != 0:
-                console.print(f"[error]Erro ao criar diretório: {mkdir_result.stderr}[/error]")
-                return
+        try:
+            with open(host_path, 'rb') as f:
+                if hashlib.sha256(f.read()).digest() == hashlib.sha256(content.encode()).digest():
+                    console.print("[info]zotonic_site.config já está atualizado[/info]")
+                    return
+        except OSError:
+            pass
 
-            # Now write the config file using cat with stdin redirection
-            # This avoids mounting volumes or copying files manually
-            write_cmd = f'docker compose run --rm -T -i zotonic bash -c "cat > {config_file_path}" < "{template_path}"'
+        try:
+            os.makedirs(os.path.dirname(host_path), exist_ok=True)
+            write_atomic(host_path, content)
+            console.print(f"[success]Configuração escrita em {host_path}[/success]")
+            return
+        except OSError as e:
+            console.print(f"[warning]Não foi possível escrever {host_path} ({e}); usando o container[/warning]")
 
-            result = subprocess.run(write_cmd, shell=True, cwd=zotonic_root)
+        try:
+            container = ConfigManager._running_container(zotonic_root)
+            if container is not None:
+                subprocess.run(
+                    ["docker", "compose", "exec", "-T", "zotonic", "mkdir", "-p", os.path.dirname(container_path)],
+                    cwd=zotonic_root, capture_output=True
+                )
+                result = subprocess.run(
+                    ["docker", "compose", "cp", template_path, f"zotonic:{container_path}"],
+                    cwd=zotonic_root, capture_output=True, text=True
+                )
+            else:
+                with open(template_path, 'rb') as f:
+                    result = subprocess.run(
+                        ["docker", "compose", "run", "--rm", "-T", "zotonic", "bash", "-c",
+                         f'mkdir -p "{os.path.dirname(container_path)}" && cat > "{container_path}"'],
+                        cwd=zotonic_root, stdin=f, capture_output=True
+                    )
 
             if result.returncode == 0:
                 console.print("[success]Configuração escrita com sucesso.[/success]")
             else:
-                console.print("[error]Falha ao escrever arquivo no container.[/error]")
+                stderr = result.stderr if isinstance(result.stderr, str) else result.stderr.decode(errors="replace")
+                console.print(f"[error]Falha ao escrever arquivo no container: {stderr.strip()}[/error]")
 
         except Exception as e:
-            console.print(f"[error]Erro crítico ao gerar config: {e}[/error]")
\ No newline at end of file
+            console.print(f"[error]Erro crítico ao gerar config: {e}[/error]")
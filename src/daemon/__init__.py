@@ -0,0 +1,5 @@
+"""Resident daemon and its unix-socket client (the server lives in daemon.server)."""
+
+from .client import DaemonClient, DaemonJob, DaemonError
+
+__all__ = ['DaemonClient', 'DaemonJob', 'DaemonError']
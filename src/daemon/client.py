@@ -0,0 +1,171 @@
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Iterator, List, Optional
+
+# Standard library only: this module is imported on the CLI fast path, before
+# (and often instead of) rich, peewee and the rest of the application.
+
+
+def socket_path() -> str:
+    """Same location as aedificator.paths.get_daemon_socket(), without importing the aedificator package."""
+    data_dir = os.environ.get("AEDIFICATOR_DATA_DIR") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"
+    )
+    return os.path.join(data_dir, "aedificator.sock")
+
+
+class DaemonError(Exception):
+    pass
+
+
+class DaemonClient:
+    """Talks to the resident daemon: one JSON object per line in each direction."""
+
+    def __init__(self, path: Optional[str] = None, timeout: float = 5.0):
+        self.path = path or socket_path()
+        self.timeout = timeout
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.path)
+        return sock
+
+    def available(self) -> bool:
+        """True when a daemon is listening on the socket."""
+        if not os.path.exists(self.path):
+            return False
+        try:
+            return bool(self.request("ping").get("ok"))
+        except (OSError, DaemonError):
+            return False
+
+    def stream(self, op: str, **params) -> Iterator[Dict]:
+        """Send a request and yield every response line until the daemon closes the connection."""
+        sock = self._connect()
+        try:
+            sock.sendall((json.dumps({"op": op, **params}) + "\n").encode())
+            sock.settimeout(None)
+            reader = sock.makefile("r", encoding="utf-8", errors="replace")
+            for line in reader:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            sock.close()
+
+    def request(self, op: str, **params) -> Dict:
+        """Send a request that has a single response."""
+        for response in self.stream(op, **params):
+            if not response.get("ok", True):
+                raise DaemonError(response.get("error", "erro desconhecido"))
+            return response
+        raise DaemonError("daemon encerrou a conexão sem resposta")
+
+    def run(self, project: str, command: str, use_docker: Optional[bool] = None) -> int:
+        """Run a command in the daemon, printing its output here. Returns the exit code."""
+        job_id = None
+        try:
+            for event in self.stream("run", project=project, command=command, docker=use_docker):
+                kind = event.get("event")
+                if kind == "started":
+                    job_id = event["job"]
+                elif kind == "output":
+                    sys.stdout.write(event["data"])
+                    sys.stdout.flush()
+                elif kind == "exit":
+                    if event.get("log"):
+                        sys.stderr.write(f"Log: {event['log']}\n")
+                    return event["code"]
+                elif kind == "error":
+                    sys.stderr.write(f"{event['error']}\n")
+                    return event.get("code", 1)
+        except KeyboardInterrupt:
+            if job_id is not None:
+                try:
+                    self.request("stop", job=job_id)
+                except (OSError, DaemonError):
+                    pass
+            return 130
+        return 1
+
+    def forward(self, argv: List[str]) -> Optional[int]:
+        """
+        Run `run`/`make` CLI arguments through the daemon.
+
+        Returns None (caller falls back to running locally) when the daemon is not
+        running or the arguments are not a plain `run <project> [--] cmd...` /
+        `make <project> targets...`.
+        """
+        if len(argv) < 3 or argv[0] not in ("run", "make") or not self.available():
+            return None
+
+        action, project, rest = argv[0], argv[1], argv[2:]
+        use_docker = None
+        args = []
+        for idx, arg in enumerate(rest):
+            if arg == "--":
+                args.extend(rest[idx + 1:])
+                break
+            if arg in ("--docker", "--no-docker") and not args:
+                use_docker = arg == "--docker"
+            elif arg.startswith("-") and not args and action == "make":
+                return None
+            else:
+                args.append(arg)
+        if not args:
+            return None
+
+        command = " ".join(args) if action == "run" else "make " + " ".join(args)
+        return self.run(project, command, use_docker)
+
+    def spawn(self, command: str, cwd: str, name: str) -> Optional["DaemonJob"]:
+        """Start an (already wrapped) command as a daemon-owned background job."""
+        try:
+            job = self.request("spawn", command=command, cwd=cwd, name=name)["job"]
+        except (OSError, DaemonError):
+            return None
+        return DaemonJob(self, job)
+
+
+class DaemonJob:
+    """
+    Popen-like handle for a job owned by the daemon.
+
+    `detached` tells the menu not to terminate it on exit: the job outlives the
+    session and its row in the jobs table is listed by `daemon jobs` from any terminal.
+    """
+
+    detached = True
+
+    def __init__(self, client: DaemonClient, info: Dict):
+        self.client = client
+        self.job_id = info["id"]
+        self.pid = info["pid"]
+        self.log = info.get("log")
+        self.returncode = info.get("returncode")
+
+    def poll(self) -> Optional[int]:
+        if self.returncode is None:
+            try:
+                self.returncode = self.client.request("job", job=self.job_id, pid=self.pid)["job"].get("returncode")
+            except (OSError, DaemonError):
+                pass
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"job {self.job_id} ainda em execução")
+            time.sleep(0.2)
+        return self.returncode
+
+    def terminate(self):
+        self.client.request("stop", job=self.job_id, signal=int(signal.SIGTERM), pid=self.pid)
+
+    def kill(self):
+        self.client.request("stop", job=self.job_id, signal=int(signal.SIGKILL), pid=self.pid)
@@ -0,0 +1,329 @@
+import json
+import os
+import signal
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, Optional
+from aedificator import console
+from aedificator.memory import initialize_database, ensure_schema, MODELS
+from aedificator.paths import get_daemon_socket, get_logs_dir
+from config import ConfigManager
+from erlang import ErlangNode, ZotonicRpc
+from executor import Executor
+from history import HistoryManager
+from .client import DaemonClient
+
+CLI_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cli.py")
+
+# `run` project names as recorded by the Executor (phoenix and sl_phoenix are the same project)
+PROJECTS_LOG_PREFIX = {"phoenix": "sl_phoenix"}
+
+# Finished jobs kept in memory, so clients can still read their exit code (op "job")
+MAX_FINISHED_JOBS = 50
+
+
+class Job:
+    """A process started by the daemon in its own process group."""
+
+    def __init__(self, job_id: int, name: str, command: str, cwd: str, process: subprocess.Popen, log: str):
+        self.id = job_id
+        self.name = name
+        self.command = command
+        self.cwd = cwd
+        self.process = process
+        self.log = log
+        self.started_at = time.time()
+
+    def as_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "command": self.command,
+            "cwd": self.cwd,
+            "pid": self.process.pid,
+            "log": self.log,
+            "started_at": self.started_at,
+            "returncode": self.process.poll(),
+        }
+
+    def signal(self, signum: int = signal.SIGTERM):
+        try:
+            os.killpg(self.process.pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            op = request.pop("op")
+            handler = getattr(self.server.daemon, f"op_{op}")
+        except (ValueError, KeyError, AttributeError):
+            self.send({"ok": False, "error": f"requisição inválida: {line[:200]!r}"})
+            return
+        try:
+            handler(self, **request)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:
+            try:
+                self.send({"ok": False, "error": str(e)})
+            except OSError:
+                pass
+
+    def send(self, message: Dict):
+        self.wfile.write((json.dumps(message) + "\n").encode())
+        self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class DaemonServer:
+    """
+    Long-running process behind `cli.py daemon start`.
+
+    It keeps what every invocation would otherwise rebuild: the database
+    connection and resolved project configuration, the Erlang node, the Docker
+    daemon probe, and a table of the jobs it started (which therefore survive
+    the menu or terminal that asked for them).
+    """
+
+    def __init__(self):
+        self.path = get_daemon_socket()
+        self.started_at = time.time()
+        self.projects: Dict[str, Dict] = {}
+        self.docker_version: Optional[str] = None
+        self.erlang = ErlangNode()
+        self.jobs: Dict[int, Job] = {}
+        self._next_job = 1
+        self._lock = threading.Lock()
+        self.server: Optional[_UnixServer] = None
+
+    # -- lifecycle -------------------------------------------------------------
+
+    def serve(self) -> int:
+        if DaemonClient(self.path).available():
+            console.print(f"[warning]Daemon já em execução em {self.path}[/warning]")
+            return 1
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # left behind by a daemon that did not shut down cleanly
+
+        db = initialize_database()
+        ensure_schema(db, MODELS)
+        self.reload()
+        threading.Thread(target=self._probe_docker, daemon=True).start()
+        self.erlang.start()
+
+        self.server = _UnixServer(self.path, _Handler)
+        self.server.daemon = self
+        os.chmod(self.path, 0o600)
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=self.server.shutdown).start())
+
+        console.print(f"[success]Daemon ouvindo em {self.path} (PID: {os.getpid()})[/success]")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server.server_close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            for job in self.jobs.values():
+                if job.process.poll() is None:
+                    job.signal(signal.SIGTERM)
+        return 0
+
+    @staticmethod
+    def start(timeout: float = 10.0) -> int:
+        """Start the daemon detached from the terminal and wait until it accepts connections."""
+        client = DaemonClient()
+        if client.available():
+            console.print(f"[info]Daemon já em execução em {client.path}[/info]")
+            return 0
+
+        command = [sys.executable] if getattr(sys, "frozen", False) else [sys.executable, CLI_PATH]
+        log_path = os.path.join(get_logs_dir(), "daemon.log")
+        with open(log_path, "a") as log:
+            process = subprocess.Popen(
+                command + ["daemon", "serve"],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True
+            )
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if client.available():
+                console.print(f"[success]Daemon iniciado (PID: {process.pid})[/success]")
+                return 0
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+        console.print(f"[error]Daemon não iniciou. Veja {log_path}[/error]")
+        return 1
+
+    # -- state -----------------------------------------------------------------
+
+    def reload(self):
+        """Resolve every configured project (for status; requests resolve their own project again)."""
+        from commands.manager import PROJECTS, CommandManager
+        projects = {}
+        for name in PROJECTS:
+            cwd, docker_config = CommandManager.resolve(name)
+            if cwd:
+                projects[name] = {"cwd": cwd, "docker_config": docker_config}
+        self.projects = projects
+
+    def _probe_docker(self):
+        # The Docker CLI keeps no connection between invocations; what can be kept
+        # warm is the knowledge that the engine answers (and its version)
+        try:
+            result = subprocess.run(
+                ["docker", "version", "--format", "{{.Server.Version}}"],
+                capture_output=True, text=True, timeout=10
+            )
+            self.docker_version = result.stdout.strip() if result.returncode == 0 else None
+        except (OSError, subprocess.TimeoutExpired):
+            self.docker_version = None
+
+    def _launch(self, name: str, command: str, cwd: str, stdout) -> Job:
+        env = os.environ.copy()
+        env['PYTHONUNBUFFERED'] = '1'
+        env['TERM'] = 'xterm-256color'
+        env['FORCE_COLOR'] = '1'
+        with self._lock:
+            job_id = self._next_job
+            self._next_job += 1
+            log = os.path.join(get_logs_dir(), f"{name}_{time.strftime('%Y%m%d_%H%M%S')}_job{job_id}.log")
+            if stdout is None:
+                with open(log, 'w') as log_file:
+                    process = subprocess.Popen(
+                        command, shell=True, cwd=cwd, stdout=log_file, stderr=subprocess.STDOUT,
+                        stdin=subprocess.DEVNULL, executable='/bin/bash', env=env, start_new_session=True
+                    )
+            else:
+                process = subprocess.Popen(
+                    command, shell=True, cwd=cwd, stdout=stdout, stderr=subprocess.STDOUT,
+                    stdin=subprocess.DEVNULL, executable='/bin/bash', bufsize=0, env=env, start_new_session=True
+                )
+            job = Job(job_id, name, command, cwd, process, log)
+            self.jobs[job_id] = job
+            finished = [j for j in self.jobs.values() if j.process.poll() is not None]
+            for old in finished[:-MAX_FINISHED_JOBS]:
+                del self.jobs[old.id]
+        return job
+
+    def _prepare(self, project: str, command: str, use_docker: Optional[bool]):
+        from commands.manager import PROJECTS, CommandManager
+        if project not in PROJECTS:
+            raise ValueError(f"Projeto desconhecido: '{project}'")
+        # Resolved on every request: paths and Docker/version settings change from
+        # the menu while the daemon runs (ConfigCache notices through data_version)
+        cwd, docker_config = CommandManager.resolve(project)
+        if not cwd:
+            self.projects.pop(project, None)
+            raise ValueError(f"Projeto '{project}' não configurado ou caminho inexistente")
+        self.projects[project] = {"cwd": cwd, "docker_config": docker_config}
+        use_docker = docker_config.get('use_docker', False) if use_docker is None else use_docker
+        runs_in_docker = use_docker and Executor._has_docker_compose(cwd)
+        if runs_in_docker:
+            ConfigManager.update_docker_versions(cwd, docker_config)
+        return Executor._wrap_with_docker(command, cwd, use_docker, docker_config), cwd, runs_in_docker
+
+    # -- operations ------------------------------------------------------------
+
+    def op_ping(self, conn):
+        conn.send({"ok": True, "pid": os.getpid()})
+
+    def op_status(self, conn):
+        conn.send({
+            "ok": True,
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started_at,
+            "socket": self.path,
+            "docker": self.docker_version,
+            "erlang_node": self.erlang.node_name if self.erlang.node else None,
+            "projects": {name: info["cwd"] for name, info in self.projects.items()},
+            "jobs": sum(1 for job in self.jobs.values() if job.process.poll() is None),
+        })
+
+    def op_reload(self, conn):
+        self.reload()
+        threading.Thread(target=self._probe_docker, daemon=True).start()
+        conn.send({"ok": True, "projects": {name: info["cwd"] for name, info in self.projects.items()}})
+
+    def op_run(self, conn, project: str, command: str, docker: Optional[bool] = None):
+        """Run in the foreground of the calling client, streaming output; the job dies with the connection."""
+        try:
+            wrapped, cwd, runs_in_docker = self._prepare(project, command, docker)
+        except ValueError as e:
+            conn.send({"event": "error", "error": str(e), "code": 2})
+            return
+
+        job = self._launch(project, wrapped, cwd, subprocess.PIPE)
+        run = HistoryManager.start(PROJECTS_LOG_PREFIX.get(project, project), command, runs_in_docker, False, job.log)
+        output_bytes = output_lines = 0
+        conn.send({"event": "started", "job": job.id, "pid": job.process.pid})
+        try:
+            with open(job.log, 'w', buffering=1, encoding='utf-8', errors='replace') as log_file:
+                for line_bytes in iter(job.process.stdout.readline, b''):
+                    if output_lines == 0:
+                        HistoryManager.first_output(run)
+                    output_lines += 1
+                    output_bytes += len(line_bytes)
+                    line = Executor._safe_decode(line_bytes).replace('\r\n', '\n').replace('\r', '\n')
+                    if not line.endswith('\n'):
+                        line += '\n'
+                    log_file.write(line)
+                    conn.send({"event": "output", "data": line})
+            code = job.process.wait()
+            HistoryManager.finish(run, code, output_bytes, output_lines)
+            conn.send({"event": "exit", "code": code, "log": job.log})
+        except OSError:
+            # Client went away (closed terminal): do not leave the command running unattended
+            job.signal(signal.SIGTERM)
+            HistoryManager.finish(run, job.process.wait(), output_bytes, output_lines)
+
+    def op_zotonic(self, conn, action: str, site: Optional[str] = None, **params):
+        """Call the Zotonic node through the daemon's Erlang node (see erlang.ZotonicRpc)."""
+        result = ZotonicRpc(self.erlang, site=site).execute(action, via_daemon=False, **params)
+        conn.send({"ok": True, "result": result})
+
+    def op_spawn(self, conn, command: str, cwd: str, name: str):
+        """Start an already wrapped command as a background job owned by the daemon."""
+        job = self._launch(name, command, cwd, None)
+        conn.send({"ok": True, "job": job.as_dict()})
+
+    def _job(self, conn, job: int, pid: Optional[int]) -> Optional[Job]:
+        # Job ids restart at 1 with every daemon; the pid tells a row recorded for an
+        # earlier daemon apart from the job that now has its id
+        found = self.jobs.get(job)
+        if found is None or (pid is not None and found.process.pid != pid):
+            conn.send({"ok": False, "error": f"job {job} não encontrado"})
+            return None
+        return found
+
+    def op_job(self, conn, job: int, pid: Optional[int] = None):
+        found = self._job(conn, job, pid)
+        if found is not None:
+            conn.send({"ok": True, "job": found.as_dict()})
+
+    def op_stop(self, conn, job: int, signal: int = int(signal.SIGTERM), pid: Optional[int] = None):
+        found = self._job(conn, job, pid)
+        if found is not None:
+            found.signal(signal)
+            conn.send({"ok": True, "job": found.as_dict()})
+
+    def op_shutdown(self, conn):
+        conn.send({"ok": True})
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
@@ -0,0 +1,7 @@
+"""Erlang distribution: the Pyrlang control node, RPC into the Zotonic node and its VM metrics."""
+
+from .node import ErlangNode, RpcError, PYRLANG_AVAILABLE
+from .rpc import ZotonicRpc
+from .metrics import BeamMonitor
+
+__all__ = ['ErlangNode', 'RpcError', 'ZotonicRpc', 'BeamMonitor', 'PYRLANG_AVAILABLE']
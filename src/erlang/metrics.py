@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+from .node import ErlangNode, RpcError
+from .rpc import ZotonicRpc
+
+# Seconds between samples (each one also spends 1s measuring scheduler utilization in the node)
+BEAM_INTERVAL = float(os.environ.get("AEDIFICATOR_BEAM_INTERVAL", "5"))
+# Processes listed per ranking
+TOP_PROCESSES = 5
+
+
+def _bytes(value: Optional[int]) -> str:
+    from process.sampler import format_bytes
+    return format_bytes(value) if value is not None else "-"
+
+
+class BeamMonitor:
+    """
+    Polls the Zotonic node's VM metrics (ZotonicRpc.metrics) in a thread, for
+    the live view panel; `on_sample` receives every sample (to record it).
+    """
+
+    def __init__(self, rpc: Optional[ZotonicRpc] = None, interval: float = BEAM_INTERVAL,
+                 on_sample: Optional[Callable[[Dict], None]] = None):
+        self.rpc = rpc or ZotonicRpc()
+        self.interval = interval
+        self.on_sample = on_sample
+        self.latest: Optional[Dict] = None
+        self.taken_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def available() -> bool:
+        """True when some Erlang node can make the calls: this process's or the daemon's."""
+        if ErlangNode.current is not None:
+            return True
+        from daemon import DaemonClient
+        return DaemonClient().available()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name="beam-monitor")
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                metrics = self.rpc.execute("metrics", top=TOP_PROCESSES)
+            except RpcError as e:
+                self.error = str(e)
+            else:
+                self.latest, self.taken_at, self.error = metrics, time.time(), None
+                if self.on_sample is not None:
+                    self.on_sample(metrics)
+            self._stop.wait(self.interval)
+
+    def title(self) -> str:
+        age = f" | há {time.time() - self.taken_at:.0f}s" if self.taken_at else ""
+        return f"[bold]BEAM[/bold] {self.rpc.node_name}{age}"
+
+    def render(self):
+        """Rich renderable for the live view panel."""
+        from rich.console import Group
+        from rich.table import Table
+        from rich.text import Text
+
+        if self.latest is None:
+            return Text(f"Aguardando o nó... {self.error or ''}", style="dim")
+
+        metrics = self.latest
+        memory = metrics["memory"]
+        utilization = metrics["scheduler_utilization"]
+        summary = Text(
+            f"Memória {_bytes(memory.get('total'))} (processos {_bytes(memory.get('processes'))}, "
+            f"binários {_bytes(memory.get('binary'))}, ETS {_bytes(memory.get('ets'))}, "
+            f"átomos {_bytes(memory.get('atom'))}, código {_bytes(memory.get('code'))})\n"
+            f"Processos {metrics['processes']} | Portas {metrics['ports']} | "
+            f"Run queue {metrics['run_queue']} {metrics['run_queues']} | "
+            f"Schedulers {'-' if utilization is None else f'{utilization:.0f}%'}"
+        )
+        if self.error:
+            summary.append(f"\n{self.error}", style="red")
+
+        if not metrics["top_reductions"] and not metrics["top_memory"]:
+            return Group(summary, Text("(top de processos requer recon no nó)", style="dim"))
+
+        table = Table(box=None, padding=(0, 1), expand=True)
+        table.add_column("Reduções (acumuladas)", ratio=1)
+        table.add_column("", justify="right")
+        table.add_column("Memória", ratio=1)
+        table.add_column("", justify="right")
+        for idx in range(max(len(metrics["top_reductions"]), len(metrics["top_memory"]))):
+            row = []
+            for key, fmt in (("top_reductions", str), ("top_memory", _bytes)):
+                entries = metrics[key]
+                if idx < len(entries):
+                    row += [f"{entries[idx]['name']} {entries[idx]['pid']}", fmt(entries[idx]['value'])]
+                else:
+                    row += ["", ""]
+            table.add_row(*row)
+        return Group(summary, table)
@@ -0,0 +1,187 @@
+import asyncio
+import concurrent.futures
+import itertools
+import os
+import socket
+import subprocess
+import time
+import threading
+import secrets
+import importlib.util
+from pathlib import Path
+from aedificator import console
+
+# Pyrlang (split into the pyrlang and term packages) and asyncio are imported
+# by the node thread; at start-up only their presence is checked
+PYRLANG_AVAILABLE = (
+    importlib.util.find_spec("pyrlang") is not None
+    and importlib.util.find_spec("term") is not None
+)
+
+DEFAULT_NODE_NAME = "aedificator_ctl@localhost"
+
+# How long rpc() waits for a node that is still booting
+NODE_READY_TIMEOUT = 2.0
+
+
+class RpcError(Exception):
+    """The remote call could not be made or returned {badrpc, Reason}."""
+
+
+class ErlangNode:
+    """Runs Python as a hidden Erlang node (Pyrlang) in a background thread."""
+
+    # The node started by this process, if any (used by ZotonicRpc by default)
+    current = None
+
+    def __init__(self, node_name: str = DEFAULT_NODE_NAME):
+        self.node_name = node_name
+        self.node = None
+        self.thread = None
+        self.cookie = None
+        self.started_at = None
+        self.loop = None
+        self._replies = None
+        self._tags = itertools.count(1)
+
+    def ensure_cookie(self):
+        """
+        Ensures ~/.erlang.cookie exists, has correct permissions (400),
+        and loads it into memory so Python and Erlang share the secret.
+        """
+        cookie_path = Path.home() / ".erlang.cookie"
+        
+        if not cookie_path.exists():
+            console.print("[info]Gerando novo Erlang cookie...[/info]")
+            # Generate a secure random cookie
+            cookie_content = secrets.token_urlsafe(16)
+            with open(cookie_path, 'w') as f:
+                f.write(cookie_content)
+        
+        # Enforce permissions (Erlang requires 400 - read only by owner)
+        try:
+            os.chmod(cookie_path, 0o400)
+        except Exception:
+            pass # Windows or specific FS might ignore this
+        
+        with open(cookie_path, 'r') as f:
+            self.cookie = f.read().strip()
+            
+        return self.cookie
+
+    @staticmethod
+    def ensure_epmd():
+        """Ensures the Erlang Port Mapper Daemon is running."""
+        try:
+            # Try to connect to EPMD port to see if it's running
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            result = sock.connect_ex(('127.0.0.1', 4369))
+            sock.close()
+            
+            if result != 0:
+                console.print("[info]Iniciando EPMD (Erlang Port Mapper Daemon)...[/info]")
+                # Start epmd in daemon mode
+                subprocess.Popen(["epmd", "-daemon"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                time.sleep(0.5) # Give it a moment to bind
+        except Exception as e:
+            console.print(f"[warning]Não foi possível verificar/iniciar EPMD: {e}[/warning]")
+
+    def start(self):
+        """Starts the node in a daemon thread (no-op without Pyrlang or when already started)."""
+        if not PYRLANG_AVAILABLE:
+            return
+
+        if self.thread:
+            return
+
+        # 1. Ensure EPMD is running before anything else
+        ErlangNode.ensure_epmd()
+        
+        # 2. Ensure Cookie
+        cookie = self.ensure_cookie()
+
+        def run_node():
+            try:
+                import asyncio
+                from pyrlang import Node
+            except ImportError as e:
+                console.print(f"[error]Falha ao importar Pyrlang: {e}[/error]")
+                return
+
+            # Create a new event loop for this thread
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+
+            try:
+                # Initialize Python as a hidden node. 
+                self.node = Node(node_name=self.node_name, cookie=cookie)
+                self.loop = loop
+                self.started_at = time.time()
+                self.node.run()
+            except Exception as e:
+                console.print(f"[error]Falha ao iniciar nó Pyrlang: {e}[/error]")
+
+        # Run as daemon
+        ErlangNode.current = self
+        self.thread = threading.Thread(target=run_node, daemon=True)
+        self.thread.start()
+        
+        time.sleep(0.2)
+
+    def rpc(self, remote: str, module: str, function: str, args=(), timeout: float = 5.0):
+        """
+        Call module:function(args) on `remote` through its rex server, like
+        rpc:call/5 from an Erlang shell: one message each way over the existing
+        distribution connection. Raises RpcError.
+        """
+        deadline = time.monotonic() + NODE_READY_TIMEOUT
+        while self.thread and self.loop is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        if self.loop is None:
+            raise RpcError("nó de controle Erlang não iniciado")
+
+        future = asyncio.run_coroutine_threadsafe(self._rpc(remote, module, function, list(args), timeout), self.loop)
+        try:
+            return future.result(timeout + 1)
+        except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
+            future.cancel()
+            raise RpcError(f"sem resposta de {remote} em {timeout:.0f}s")
+
+    async def _rpc(self, remote: str, module: str, function: str, args: list, timeout: float):
+        from term import Atom
+
+        if self._replies is None:
+            self._replies = _reply_process_class()()
+        tag = next(self._tags)
+        reply = self.loop.create_future()
+        self._replies.pending[tag] = reply
+
+        # gen_server:call(rex) by hand: {'$gen_call', {Pid, Tag}, Request}, answered with {Tag, Result}
+        request = (Atom("call"), Atom(module), Atom(function), args, Atom("user"))
+        self.node.send_nowait(self._replies.pid_, (Atom(remote), Atom("rex")), (Atom("$gen_call"), (self._replies.pid_, tag), request))
+        try:
+            result = await asyncio.wait_for(reply, timeout)
+        finally:
+            self._replies.pending.pop(tag, None)
+
+        if isinstance(result, tuple) and len(result) == 2 and result[0] == Atom("badrpc"):
+            raise RpcError(f"badrpc: {result[1]}")
+        return result
+
+
+def _reply_process_class():
+    """Pyrlang process that receives {Tag, Result} replies (defined lazily: Pyrlang is optional)."""
+    from pyrlang.process import Process
+
+    class _Replies(Process):
+        def __init__(self):
+            super().__init__()
+            self.pending = {}
+
+        def handle_one_inbox_message(self, msg):
+            if isinstance(msg, tuple) and len(msg) == 2:
+                future = self.pending.pop(msg[0], None)
+                if future is not None and not future.done():
+                    future.set_result(msg[1])
+
+    return _Replies
@@ -0,0 +1,173 @@
+import os
+import socket
+from typing import Dict, Optional
+from .node import ErlangNode, RpcError
+
+# Zotonic starts as `-sname zotonic001` unless told otherwise
+ZOTONIC_NODE = os.environ.get("AEDIFICATOR_ZOTONIC_NODE") or f"zotonic001@{socket.gethostname().split('.')[0]}"
+ZOTONIC_SITE = os.environ.get("AEDIFICATOR_ZOTONIC_SITE", "superleme")
+
+ACTIONS = ("status", "restart", "reload", "flush", "stop", "recompile", "metrics")
+
+# `bin/zotonic` equivalents, used when the node cannot be reached over distribution
+CLI_COMMANDS = {
+    "status": "status",
+    "restart": "restartsite {site}",
+    "reload": "update",
+    "flush": "flush",
+    "stop": "stop",
+}
+
+
+def charlist(text: str) -> list:
+    """An Erlang string (list of code points), which file and compile functions accept."""
+    return [ord(char) for char in text]
+
+
+def to_python(value):
+    """Erlang terms (atoms, binaries, tuples, maps) as plain, JSON-friendly Python values."""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    if isinstance(value, dict):
+        return {str(to_python(k)): to_python(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_python(item) for item in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return str(value) if isinstance(value, str) else value
+    return str(value)
+
+
+def _process_name(info) -> str:
+    """Registered name, else current function, from recon's [Name | {current_function, MFA}, {initial_call, MFA}]."""
+    details = {}
+    for item in info:
+        if isinstance(item, tuple) and len(item) == 2:
+            details[str(item[0])] = item[1]
+        elif isinstance(item, str) and item != "[]":
+            return item
+    mfa = details.get("current_function") or details.get("initial_call")
+    if isinstance(mfa, tuple) and len(mfa) == 3:
+        return f"{mfa[0]}:{mfa[1]}/{mfa[2]}"
+    return "?"
+
+
+class ZotonicRpc:
+    """
+    Controls the running Zotonic node through the Pyrlang control node.
+
+    Calls go to the local ErlangNode when this process runs one, otherwise to
+    the daemon (which owns the node while it runs). Each call is one
+    distribution round trip instead of a `bin/zotonic` escript or a container
+    start-up.
+    """
+
+    def __init__(self, erlang: Optional[ErlangNode] = None, node_name: str = ZOTONIC_NODE,
+                 site: Optional[str] = None, timeout: float = 5.0):
+        self.erlang = erlang if erlang is not None else ErlangNode.current
+        self.node_name = node_name
+        self.site = site or ZOTONIC_SITE
+        self.timeout = timeout
+
+    def call(self, module: str, function: str, *args):
+        if self.erlang is None or self.erlang.thread is None:
+            raise RpcError("nó de controle Erlang não iniciado")
+        return self.erlang.rpc(self.node_name, module, function, args, self.timeout)
+
+    def execute(self, action: str, via_daemon: bool = True, **params):
+        """Run one of ACTIONS and return its result as plain Python values."""
+        if action not in ACTIONS:
+            raise RpcError(f"ação desconhecida: {action}")
+        if self.erlang is not None and self.erlang.thread is not None:
+            return to_python(getattr(self, action)(**params))
+
+        if via_daemon:
+            from daemon import DaemonClient, DaemonError
+            client = DaemonClient(timeout=self.timeout + 2)
+            if client.available():
+                try:
+                    return client.request("zotonic", action=action, site=self.site, **params)["result"]
+                except (OSError, DaemonError) as e:
+                    raise RpcError(str(e))
+        raise RpcError("nó de controle Erlang não está em execução")
+
+    # -- actions (need a local ErlangNode) ---------------------------------------
+
+    def status(self) -> Dict:
+        from term import Atom
+        uptime_ms, _ = self.call("erlang", "statistics", Atom("wall_clock"))
+        return {
+            "node": self.node_name,
+            "uptime": uptime_ms / 1000,
+            "sites": self.call("z_sites_manager", "get_sites"),
+        }
+
+    def restart(self):
+        from term import Atom
+        return self.call("z_sites_manager", "restart", Atom(self.site))
+
+    def reload(self):
+        """Load every module whose .beam changed on disk (z:ld/0)."""
+        return self.call("z", "ld")
+
+    def flush(self):
+        from term import Atom
+        return self.call("z", "flush", Atom(self.site))
+
+    def stop(self):
+        return self.call("init", "stop")
+
+    def recompile(self, module: str, source: str, outdir: str, include: str):
+        """
+        Compile one module in the node and load it. A loaded module is rebuilt by
+        c:c/1 with the options it was built with (rebar3's, from module_info) and
+        its .beam is replaced where it is; a new one is compiled from `source`
+        (a path as the node sees it) into `outdir`.
+        Returns ['ok', module] or 'error' (messages go to the node's console).
+        """
+        from term import Atom
+        if self.call("code", "is_loaded", Atom(module)) not in (False, "false"):
+            return self.call("c", "c", Atom(module))
+        options = [Atom("debug_info"), (Atom("outdir"), charlist(outdir)), (Atom("i"), charlist(include))]
+        return self.call("c", "c", charlist(source), options)
+
+    def metrics(self, top: int = 5) -> Dict:
+        """
+        VM health: erlang:memory/0, process and port counts, run queue lengths,
+        scheduler utilization over one second (scheduler:utilization/1 blocks
+        that long in the node) and, when recon is in the release, the top
+        processes by reductions and by memory.
+        """
+        from term import Atom
+        run_queues = self.call("erlang", "statistics", Atom("run_queue_lengths"))
+        metrics = {
+            "memory": {str(kind): value for kind, value in self.call("erlang", "memory")},
+            "processes": self.call("erlang", "system_info", Atom("process_count")),
+            "ports": self.call("erlang", "system_info", Atom("port_count")),
+            "run_queue": sum(run_queues),
+            "run_queues": list(run_queues),
+            "scheduler_utilization": None,
+            "top_reductions": [],
+            "top_memory": [],
+        }
+        try:
+            for entry in self.call("scheduler", "utilization", 1):
+                if entry[0] == "total":
+                    metrics["scheduler_utilization"] = entry[1] * 100
+        except RpcError:
+            pass
+        for key, attribute in (("top_reductions", "reductions"), ("top_memory", "memory")):
+            try:
+                rows = self.call("recon", "proc_count", Atom(attribute), top)
+            except RpcError:
+                break  # recon not available
+            metrics[key] = [{"pid": str(pid), "name": _process_name(info), "value": value} for pid, value, info in rows]
+        return metrics
+
+    # -- fallback ----------------------------------------------------------------
+
+    def fallback_command(self, action: str, use_docker: bool) -> str:
+        """Shell command doing the same as `action`, run from the Zotonic root."""
+        if use_docker and action == "stop":
+            return "docker compose down"
+        command = "bin/zotonic " + CLI_COMMANDS[action].format(site=self.site)
+        return f"docker compose exec zotonic {command}" if use_docker else command
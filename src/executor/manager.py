@@ -6,9 +6,11 @@ import re
 from typing import Optional, List, Dict
 from aedificator import console
 from config import ConfigManager
-from process import ProcessManager
 from unidecode import unidecode
 from aedificator.paths import get_logs_dir
+from history import HistoryManager
+from aedificator.tracing import traced, annotate
+from aedificator.profiling import profiled
 
 
 class Executor:
@@ -52,13 +54,17 @@ class Executor:
     def _wrap_with_docker(command: str, cwd: str, use_docker: bool = True, docker_config: Optional[Dict] = None) -> str:
         """Wrap command with docker-compose if needed."""
         if use_docker and Executor._has_docker_compose(cwd):
+            # Shared hex/npm/rebar3 caches, when the compose file does not mount them itself
+            from aedificator.docker.cache import CacheVolumes
+            caches = CacheVolumes.run_flags(cwd)
+            caches = f'{caches} ' if caches else ''
             if 'zotonic' in cwd:
                 if command.startswith('make') or command.startswith('bash') or command.startswith('sh') or command.startswith('mise'):
-                    docker_cmd = f'NO_PROXY=* stdbuf -o0 -e0 docker compose --ansi=always --verbose --progress=plain -f docker-compose.yml run --rm --entrypoint="" -w /opt/zotonic -e NO_PROXY=* -e TERM=xterm-256color zotonic {command}'
+                    docker_cmd = f'NO_PROXY=* stdbuf -o0 -e0 docker compose --ansi=always --verbose --progress=plain -f docker-compose.yml run --rm --entrypoint="" -w /opt/zotonic -e NO_PROXY=* -e TERM=xterm-256color {caches}zotonic {command}'
                 else:   
-                    docker_cmd = f'stdbuf -o0 -e0 docker compose --ansi=always --verbose --progress=plain -f docker-compose.yml run --rm --service-ports -w /opt/zotonic -e TERM=xterm-256color zotonic {command}'
+                    docker_cmd = f'stdbuf -o0 -e0 docker compose --ansi=always --verbose --progress=plain -f docker-compose.yml run --rm --service-ports -w /opt/zotonic -e TERM=xterm-256color {caches}zotonic {command}'
             elif 'phoenix' in cwd:
-                docker_cmd = f'stdbuf -o0 -e0 docker compose --ansi=always --verbose --progress=plain -f docker-compose.yml run --rm --service-ports -w /app -e TERM=xterm-256color app {command}'
+                docker_cmd = f'stdbuf -o0 -e0 docker compose --ansi=always --verbose --progress=plain -f docker-compose.yml run --rm --service-ports -w /app -e TERM=xterm-256color {caches}app {command}'
             else:
                 service = 'app'
                 docker_cmd = f'stdbuf -o0 -e0 docker-compose --ansi=always --verbose exec -e TERM=xterm-256color {service} {command}'
@@ -66,6 +72,16 @@ class Executor:
         return command
 
     @staticmethod
+    def _docker_service(cwd: str) -> Optional[str]:
+        """Compose service whose one-off container _wrap_with_docker starts (None when it uses `exec`)."""
+        if 'zotonic' in cwd:
+            return 'zotonic'
+        if 'phoenix' in cwd:
+            return 'app'
+        return None
+
+    @staticmethod
+    @traced("executor.run_command", "command", "cwd", "use_docker", "background")
     def run_command(command: str, cwd: str, background: bool = False, use_docker: bool = False, docker_config: Optional[Dict] = None) -> Optional[subprocess.Popen]:
         if not os.path.exists(cwd):
             console.print(f"[error]Diretório não encontrado: {cwd}[/error]")
@@ -98,20 +114,15 @@ class Executor:
 
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         log_filename = os.path.join(log_dir, f"{project_name}_{timestamp}.log")
+        runs_in_docker = use_docker and Executor._has_docker_compose(cwd)
+        docker_service = Executor._docker_service(cwd) if runs_in_docker else None
 
         try:
             if background:
-                log_file = open(log_filename, 'w')
-                process = subprocess.Popen(
-                    wrapped_command,
-                    shell=True,
-                    cwd=cwd,
-                    stdout=log_file,
-                    stderr=subprocess.STDOUT,
-                    executable='/bin/bash'
-                )
-                console.print(f"[success]Processo iniciado em background (PID: {process.pid})[/success]")
-                console.print(f"Log: {log_filename}")
+                # Tracked in the jobs table; the daemon owns the job when it is running
+                from jobs import JobManager
+                process, _ = JobManager.launch(project_name, command, wrapped_command, cwd, log_filename,
+                                               runs_in_docker, docker_service)
                 return process
             else:
                 with open(log_filename, 'w', buffering=1, encoding='utf-8', errors='replace') as log_file:
@@ -124,42 +135,64 @@ class Executor:
                     env['TERM'] = 'xterm-256color'
                     env['FORCE_COLOR'] = '1'
 
-                    process = subprocess.Popen(
-                        wrapped_command,
-                        shell=True,
-                        cwd=cwd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        executable='/bin/bash',
-                        bufsize=0,
-                        env=env
-                    )
-
-                    console.print("[info]Aguardando saída do comando...[/info]")
-
+                    run = HistoryManager.start(project_name, command, runs_in_docker, False, log_filename)
+                    process = None
+                    sampler = None
                     line_count = 0
-                    
-                    while True:
-                        line_bytes = process.stdout.readline()
-                        if not line_bytes:
-                            if process.poll() is not None:
-                                break
-                            continue
-                            
-                        line_count += 1
-                        
-                        line_str = Executor._safe_decode(line_bytes)
-                        
-                        line_str = line_str.replace('\r\n', '\n').replace('\r', '\n')
-                        if not line_str.endswith('\n'):
-                            line_str = line_str + '\n'
-                            
-                        print(line_str, end='', flush=True)
-                        log_file.write(line_str)
-                        log_file.flush()
-
-                    process.wait()
-                    returncode = process.returncode
+                    byte_count = 0
+                    # The history row and the sampler thread are closed on Ctrl+C and
+                    # I/O errors too (KeyboardInterrupt is not an Exception)
+                    try:
+                        process = subprocess.Popen(
+                            wrapped_command,
+                            shell=True,
+                            cwd=cwd,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT,
+                            executable='/bin/bash',
+                            bufsize=0,
+                            env=env
+                        )
+
+                        if run is not None:
+                            from process.sampler import ResourceSampler
+                            sampler = ResourceSampler().start()
+                            sampler.add(run.id, process.pid, docker_service)
+
+                        console.print("[info]Aguardando saída do comando...[/info]")
+
+                        with profiled(f"output {project_name}"):
+                            while True:
+                                line_bytes = process.stdout.readline()
+                                if not line_bytes:
+                                    if process.poll() is not None:
+                                        break
+                                    continue
+
+                                if line_count == 0:
+                                    HistoryManager.first_output(run)
+                                line_count += 1
+                                byte_count += len(line_bytes)
+
+                                line_str = Executor._safe_decode(line_bytes)
+
+                                line_str = line_str.replace('\r\n', '\n').replace('\r', '\n')
+                                if not line_str.endswith('\n'):
+                                    line_str = line_str + '\n'
+
+                                print(line_str, end='', flush=True)
+                                log_file.write(line_str)
+                                log_file.flush()
+
+                        process.wait()
+                    finally:
+                        returncode = process.poll() if process is not None else None
+                        resources = None
+                        if sampler is not None:
+                            sampler.stop()
+                            resources = sampler.peaks(run.id)
+                        HistoryManager.finish(run, returncode, byte_count, line_count, resources=resources)
+                    annotate(exit_code=returncode, output_lines=line_count, output_bytes=byte_count)
 
                     if line_count == 0:
                         console.print("[warning]Nenhuma saída foi gerada pelo comando[/warning]")
@@ -169,12 +202,13 @@ class Executor:
                 else:
                     console.print(f"\n[error]Comando falhou com código {returncode}[/error]")
                 console.print(f"Log: {log_filename}")
-                return None
+                return process
         except Exception as e:
             console.print(f"[error]Erro ao executar comando: {e}[/error]")
             return None
 
     @staticmethod
+    @traced("executor.run_multiple", "background")
     def run_multiple(commands: List[tuple], background: bool = True, docker_configs: Optional[Dict[str, Dict]] = None) -> List[subprocess.Popen]:
         if not background:
             processes = []
@@ -186,6 +220,10 @@ class Executor:
 
         console.print(f"[info]Executando {len(commands)} comando(s) simultaneamente...[/info]")
 
+        # CPU/RSS/I-O of each process tree (and its container) for the panel titles and the history
+        from process import ProcessManager, ResourceSampler
+        sampler = ResourceSampler().start()
+
         process_info = []
         for command_tuple in commands:
             command, cwd, use_docker = command_tuple
@@ -227,17 +265,38 @@ class Executor:
                 env=env
             )
 
+            runs_in_docker = use_docker and Executor._has_docker_compose(cwd)
+            sampler.add(len(process_info), process.pid, Executor._docker_service(cwd) if runs_in_docker else None)
             process_info.append({
                 'process': process,
                 'name': project_name,
                 'command': command,
-                'output': []
+                'output': [],
+                'history': HistoryManager.start(project_key or os.path.basename(cwd), command, runs_in_docker)
             })
 
+        # VM metrics of the Zotonic node, when an Erlang node (ours or the daemon's) can reach it
+        beam = None
+        superleme = next((info for info in process_info if info['name'] == 'Superleme'), None)
+        if superleme is not None:
+            from erlang import BeamMonitor
+            if BeamMonitor.available():
+                run = superleme['history']
+                beam = BeamMonitor(on_sample=lambda metrics: HistoryManager.record_beam(run, metrics)).start()
+
         if process_info:
             console.print("[success]Todos os processos iniciados[/success]")
             console.print("[info]Exibindo output em tempo real... Pressione Ctrl+C para parar[/info]\n")
-            ProcessManager.display_live_output(process_info, Executor._safe_decode)
+            ProcessManager.display_live_output(process_info, Executor._safe_decode, sampler, beam)
+        sampler.stop()
+        if beam is not None:
+            beam.stop()
+
+        for idx, info in enumerate(process_info):
+            if info.get('first_output_at') is not None:
+                HistoryManager.first_output(info['history'], info['first_output_at'])
+            HistoryManager.finish(info['history'], info['process'].poll(), info.get('output_bytes', 0),
+                                  info.get('output_lines', 0), info.get('finished_at'), sampler.peaks(idx))
 
         return [p['process'] for p in process_info]
 
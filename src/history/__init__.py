@@ -0,0 +1,5 @@
+"""Command execution history and duration statistics."""
+
+from .manager import HistoryManager
+
+__all__ = ['HistoryManager']
@@ -0,0 +1,305 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from peewee import OperationalError
+from aedificator import console
+from aedificator.memory import CommandRun, BeamSample, database, ensure_schema
+
+# Runs considered by the statistics
+HISTORY_DAYS = 90
+TREND_WEEKS = 8
+_SPARK = "▁▂▃▄▅▆▇█"
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(values)))
+    return values[rank - 1]
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m{seconds:02d}s"
+
+
+class HistoryManager:
+    """
+    Records every command started by the Executor and summarises the durations.
+
+    Recording never gets in the way of the command: without an initialised
+    database (or on any database error) runs are simply not recorded.
+    """
+
+    @staticmethod
+    def save(row):
+        try:
+            row.save()
+        except OperationalError:
+            # run/make skip the schema check at start-up; create/migrate the table on first use
+            ensure_schema(database(), [type(row)])
+            row.save()
+
+    @staticmethod
+    def start(project: str, command: str, use_docker: bool = False, background: bool = False,
+              log_path: Optional[str] = None) -> Optional[CommandRun]:
+        """Insert the row of a run that is starting now."""
+        if database().deferred:
+            return None
+        run = CommandRun(
+            project=project,
+            command=command,
+            use_docker=use_docker,
+            background=background,
+            started_at=datetime.now(),
+            log_path=log_path
+        )
+        run._clock = time.perf_counter()
+        try:
+            HistoryManager.save(run)
+        except Exception:
+            return None
+        return run
+
+    @staticmethod
+    def first_output(run: Optional[CommandRun], at: Optional[float] = None):
+        """Mark when the first output line arrived (time.perf_counter() value; only the first call counts)."""
+        if run is not None and run.first_output is None:
+            run.first_output = (at if at is not None else time.perf_counter()) - run._clock
+
+    @staticmethod
+    def finish(run: Optional[CommandRun], exit_code: Optional[int], output_bytes: int = 0, output_lines: int = 0,
+               at: Optional[float] = None, resources: Optional[Dict] = None):
+        """
+        Complete the row; `at` is the time.perf_counter() value when the process
+        ended (default: now) and `resources` the ResourceSampler.peaks() of the run.
+        """
+        if run is None:
+            return
+        for column, value in (resources or {}).items():
+            setattr(run, column, value)
+        duration = (at if at is not None else time.perf_counter()) - run._clock
+        run.finished_at = run.started_at + timedelta(seconds=duration)
+        run.duration = duration
+        run.exit_code = exit_code
+        run.output_bytes = output_bytes
+        run.output_lines = output_lines
+        try:
+            HistoryManager.save(run)
+        except Exception as e:
+            console.print(f"[warning]Não foi possível salvar o histórico do comando: {e}[/warning]")
+
+    @staticmethod
+    def track(run: Optional[CommandRun], process, docker_service: Optional[str] = None):
+        """Finish the row of a background run when its process exits (output counted from the log)."""
+        if run is None:
+            return
+
+        from process.sampler import ResourceSampler
+        sampler = ResourceSampler().start()
+        sampler.add(run.id, process.pid, docker_service)
+
+        def wait():
+            try:
+                exit_code = process.wait()
+            except Exception:
+                return
+            finally:
+                sampler.stop()
+            output_bytes = output_lines = 0
+            if run.log_path and os.path.exists(run.log_path):
+                with open(run.log_path, 'rb') as f:
+                    for line in f:
+                        output_bytes += len(line)
+                        output_lines += 1
+            HistoryManager.finish(run, exit_code, output_bytes, output_lines, resources=sampler.peaks(run.id))
+
+        threading.Thread(target=wait, daemon=True, name=f"history-{run.id}").start()
+
+    @staticmethod
+    def record_beam(run: Optional[CommandRun], metrics: Dict):
+        """Store one BeamMonitor sample of the node started by `run`."""
+        if database().deferred:
+            return
+        memory = metrics.get("memory", {})
+        sample = BeamSample(
+            run_id=run.id if run is not None else None,
+            taken_at=datetime.now(),
+            memory_total=memory.get("total"),
+            memory_processes=memory.get("processes"),
+            memory_binary=memory.get("binary"),
+            memory_ets=memory.get("ets"),
+            memory_atom=memory.get("atom"),
+            memory_code=memory.get("code"),
+            process_count=metrics.get("processes"),
+            port_count=metrics.get("ports"),
+            run_queue=metrics.get("run_queue"),
+            scheduler_utilization=metrics.get("scheduler_utilization"),
+            top_reductions=json.dumps(metrics.get("top_reductions") or []),
+            top_memory=json.dumps(metrics.get("top_memory") or [])
+        )
+        try:
+            HistoryManager.save(sample)
+        except Exception:
+            pass
+
+    @staticmethod
+    def statistics(days: int = HISTORY_DAYS) -> List[Dict]:
+        """Per (project, command): run count, failures, p50/p95 duration and first output, weekly p50 trend."""
+        since = datetime.now() - timedelta(days=days)
+        trend_start = datetime.now() - timedelta(weeks=TREND_WEEKS)
+        groups: Dict[tuple, Dict] = defaultdict(lambda: {"durations": [], "first_output": [], "failures": 0, "weeks": defaultdict(list), "last": None})
+
+        query = (CommandRun
+                 .select(CommandRun.project, CommandRun.command, CommandRun.started_at, CommandRun.duration,
+                         CommandRun.first_output, CommandRun.exit_code)
+                 .where((CommandRun.started_at >= since) & CommandRun.duration.is_null(False))
+                 .order_by(CommandRun.started_at)
+                 .tuples())
+        for project, command, started_at, duration, first_output, exit_code in query:
+            group = groups[(project, command)]
+            group["durations"].append(duration)
+            if first_output is not None:
+                group["first_output"].append(first_output)
+            if exit_code:
+                group["failures"] += 1
+            if started_at >= trend_start:
+                group["weeks"][(started_at - trend_start).days // 7].append(duration)
+            group["last"] = started_at
+
+        stats = []
+        for (project, command), group in groups.items():
+            durations = sorted(group["durations"])
+            first_output = sorted(group["first_output"])
+            weekly = []
+            for week in range(TREND_WEEKS):
+                values = sorted(group["weeks"].get(week, []))
+                weekly.append(percentile(values, 50))
+            stats.append({
+                "project": project,
+                "command": command,
+                "runs": len(durations),
+                "failures": group["failures"],
+                "p50": percentile(durations, 50),
+                "p95": percentile(durations, 95),
+                "first_output_p50": percentile(first_output, 50),
+                "weekly_p50": weekly,
+                "last": group["last"],
+            })
+        stats.sort(key=lambda s: s["last"], reverse=True)
+        return stats
+
+    @staticmethod
+    def sparkline(values: List[Optional[float]]) -> str:
+        present = [v for v in values if v is not None]
+        if not present:
+            return ""
+        low, high = min(present), max(present)
+        span = (high - low) or 1
+        return "".join(" " if v is None else _SPARK[int((v - low) / span * (len(_SPARK) - 1))] for v in values)
+
+    @staticmethod
+    def show():
+        """Print the per-command duration table."""
+        from rich.table import Table
+
+        stats = HistoryManager.statistics()
+        if not stats:
+            console.print("[warning]Nenhuma execução registrada ainda[/warning]")
+            return
+
+        table = Table(title=f"Histórico de comandos (últimos {HISTORY_DAYS} dias)")
+        table.add_column("Projeto")
+        table.add_column("Comando", overflow="fold")
+        table.add_column("Execuções", justify="right")
+        table.add_column("Falhas", justify="right")
+        table.add_column("p50", justify="right")
+        table.add_column("p95", justify="right")
+        table.add_column("1ª saída (p50)", justify="right")
+        table.add_column(f"Tendência ({TREND_WEEKS} sem.)", no_wrap=True)
+        table.add_column("Última", justify="right")
+        for s in stats:
+            table.add_row(
+                s["project"],
+                s["command"],
+                str(s["runs"]),
+                f"[error]{s['failures']}[/error]" if s["failures"] else "0",
+                format_duration(s["p50"]),
+                format_duration(s["p95"]),
+                format_duration(s["first_output_p50"]),
+                HistoryManager.sparkline(s["weekly_p50"]),
+                s["last"].strftime("%d/%m %H:%M"),
+            )
+        console.print(table)
+
+    @staticmethod
+    def show_trend(project: str, command: str):
+        """Print weekly p50/p95 of one command, with the change from the previous week."""
+        from rich.table import Table
+
+        trend_start = datetime.now() - timedelta(weeks=TREND_WEEKS)
+        weeks: Dict[int, List[float]] = defaultdict(list)
+        query = (CommandRun
+                 .select(CommandRun.started_at, CommandRun.duration)
+                 .where((CommandRun.project == project) & (CommandRun.command == command)
+                        & (CommandRun.started_at >= trend_start) & CommandRun.duration.is_null(False))
+                 .tuples())
+        for started_at, duration in query:
+            weeks[(started_at - trend_start).days // 7].append(duration)
+
+        table = Table(title=f"{project}: {command}")
+        table.add_column("Semana de")
+        table.add_column("Execuções", justify="right")
+        table.add_column("p50", justify="right")
+        table.add_column("p95", justify="right")
+        table.add_column("Variação p50", justify="right")
+        previous = None
+        for week in range(TREND_WEEKS):
+            values = sorted(weeks.get(week, []))
+            if not values:
+                continue
+            p50 = percentile(values, 50)
+            change = ""
+            if previous:
+                delta = (p50 - previous) / previous * 100
+                style = "error" if delta > 10 else "success" if delta < -10 else "info"
+                change = f"[{style}]{delta:+.0f}%[/{style}]"
+            table.add_row(
+                (trend_start + timedelta(weeks=week)).strftime("%d/%m"),
+                str(len(values)),
+                format_duration(p50),
+                format_duration(percentile(values, 95)),
+                change,
+            )
+            previous = p50
+        console.print(table)
+
+    @staticmethod
+    def manage():
+        """Histórico menu: summary table, then an optional drill-down into one command."""
+        import questionary
+
+        while True:
+            HistoryManager.show()
+            stats = HistoryManager.statistics()
+            if not stats:
+                return
+            labels = {f"{s['project']}: {s['command']}": s for s in stats}
+            choice = questionary.select(
+                "Ver tendência semanal de:",
+                choices=list(labels.keys()) + ["Voltar"]
+            ).ask()
+            if not choice or choice == "Voltar":
+                return
+            HistoryManager.show_trend(labels[choice]["project"], labels[choice]["command"])
+            questionary.press_any_key_to_continue("Pressione qualquer tecla para voltar...").ask()
@@ -0,0 +1,5 @@
+"""Background commands as jobs: table, attach/detach and stop."""
+
+from .manager import JobManager
+
+__all__ = ['JobManager']
@@ -0,0 +1,334 @@
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from aedificator import console
+from aedificator.memory import Job, database
+from history import HistoryManager
+
+# Log lines shown when attaching, before following the output
+TAIL_LINES = 40
+# Jobs listed: the running ones, then the most recent
+LIST_LIMIT = 20
+# Seconds between SIGTERM and SIGKILL when stopping a job
+STOP_TIMEOUT = 5.0
+
+STATES = {
+    "running": "[green]executando[/green]",
+    "exited": "concluído",
+    "failed": "[red]falhou[/red]",
+    "stopped": "[yellow]parado[/yellow]",
+    "lost": "[dim]perdido[/dim]",
+}
+
+
+class JobManager:
+    """
+    Background commands as jobs: a row in the jobs table (ID, project, command,
+    state, PID, log) per launch, each job in its own process group writing to
+    its log. Attaching follows the log until the job ends or Ctrl+C, which
+    only detaches.
+
+    With the daemon running, jobs belong to it and outlive the menu; otherwise
+    they are children of this process, stopped when the menu exits.
+    """
+
+    # Job.id -> Popen (or DaemonJob) of the jobs launched by this process
+    _handles: Dict[int, object] = {}
+
+    @staticmethod
+    def launch(project: str, command: str, wrapped_command: str, cwd: str, log_path: str,
+               runs_in_docker: bool = False, docker_service: Optional[str] = None) -> Tuple[object, Optional[Job]]:
+        """
+        Start `wrapped_command` as a job. Returns its Popen-like handle and its row
+        (None when the database is not available yet).
+        """
+        from daemon import DaemonClient
+
+        handle, owner, daemon_job = None, "menu", None
+        client = DaemonClient()
+        if client.available():
+            handle = client.spawn(wrapped_command, cwd, project)
+            if handle is not None:
+                owner, daemon_job, log_path = "daemon", handle.job_id, handle.log
+
+        if handle is None:
+            # Log names have one-second resolution; jobs started together each get their own
+            base, ext = os.path.splitext(log_path)
+            suffix = 1
+            while os.path.exists(log_path):
+                suffix += 1
+                log_path = f"{base}_{suffix}{ext}"
+
+            env = os.environ.copy()
+            env['PYTHONUNBUFFERED'] = '1'
+            env['TERM'] = 'xterm-256color'
+            env['FORCE_COLOR'] = '1'
+            # The child keeps its own descriptor; ours is closed right away
+            with open(log_path, 'w') as log_file:
+                handle = subprocess.Popen(
+                    wrapped_command, shell=True, cwd=cwd, stdout=log_file, stderr=subprocess.STDOUT,
+                    stdin=subprocess.DEVNULL, executable='/bin/bash', env=env, start_new_session=True
+                )
+
+        run = HistoryManager.start(project, command, runs_in_docker, True, log_path)
+        HistoryManager.track(run, handle, docker_service)
+
+        job = None
+        if not database().deferred:
+            job = Job(project=project, command=command, cwd=cwd, pid=handle.pid,
+                      pid_start=JobManager._pid_start(handle.pid), log_path=log_path, owner=owner, daemon_job=daemon_job, run_id=run.id if run is not None else None, started_at=datetime.now())
+            try:
+                HistoryManager.save(job)
+                JobManager._handles[job.id] = handle
+            except Exception:
+                job = None
+        if job is not None and owner == "menu":
+            threading.Thread(target=JobManager._wait, args=(job.id, handle), daemon=True, name=f"job-{job.id}").start()
+
+        label = f"Job #{job.id}" if job is not None else "Processo"
+        where = f"no daemon (job #{daemon_job})" if owner == "daemon" else "em background"
+        console.print(f"[success]{label} iniciado {where}, PID {handle.pid}[/success]")
+        console.print(f"Log: {log_path}")
+        return handle, job
+
+    @staticmethod
+    def job_for(handle) -> Optional[Job]:
+        """Row of a job started by this process, from the handle launch() returned."""
+        for job_id, known in JobManager._handles.items():
+            if known is handle:
+                return Job.get_or_none(Job.id == job_id)
+        return None
+
+    @staticmethod
+    def _finish(job_id: int, exit_code: Optional[int], state: Optional[str] = None):
+        if state is None:
+            if exit_code is None:
+                state = "lost"
+            elif exit_code < 0:
+                state = "stopped"
+            else:
+                state = "exited" if exit_code == 0 else "failed"
+        try:
+            (Job.update(state=state, exit_code=exit_code, finished_at=datetime.now())
+             .where((Job.id == job_id) & (Job.state == "running"))
+             .execute())
+        except Exception:
+            pass
+
+    @staticmethod
+    def _wait(job_id: int, handle):
+        try:
+            exit_code = handle.wait()
+        except Exception:
+            return
+        JobManager._finish(job_id, exit_code)
+
+    @staticmethod
+    def _proc_stat(pid: int) -> Optional[List[str]]:
+        """Fields of /proc/<pid>/stat after the command name (state first); None when unreadable."""
+        try:
+            with open(f"/proc/{pid}/stat", 'r') as f:
+                return f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            return None
+
+    @staticmethod
+    def _start_time(fields: Optional[List[str]]) -> Optional[int]:
+        # Field 22 of the stat line, the 20th after the command name
+        try:
+            return int(fields[19]) if fields else None
+        except (IndexError, ValueError):
+            return None
+
+    @staticmethod
+    def _pid_start(pid: Optional[int]) -> Optional[int]:
+        return JobManager._start_time(JobManager._proc_stat(pid)) if pid else None
+
+    @staticmethod
+    def _pid_alive(pid: Optional[int], start: Optional[int] = None) -> bool:
+        """Whether `pid` runs and, given its start time, is still the process recorded then."""
+        if not pid:
+            return False
+        fields = JobManager._proc_stat(pid)
+        if fields is not None:
+            if fields[0] == "Z":
+                return False
+            return start is None or JobManager._start_time(fields) == start
+        try:
+            os.kill(pid, 0)
+            return True
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+
+    @staticmethod
+    def _daemon_returncode(job: Job):
+        """(known, returncode) of a daemon-owned job; unknown when the daemon is gone or forgot it."""
+        from daemon import DaemonClient, DaemonError
+        client = DaemonClient()
+        if not client.available():
+            return False, None
+        try:
+            return True, client.request("job", job=job.daemon_job, pid=job.pid)["job"].get("returncode")
+        except (OSError, DaemonError):
+            return False, None
+
+    @staticmethod
+    def running(job: Job) -> bool:
+        handle = JobManager._handles.get(job.id)
+        if handle is not None:
+            return handle.poll() is None
+        if job.owner == "daemon":
+            known, returncode = JobManager._daemon_returncode(job)
+            return known and returncode is None
+        return JobManager._pid_alive(job.pid, job.pid_start)
+
+    @staticmethod
+    def refresh():
+        """Settle the state of jobs marked running whose process is gone (other sessions, daemon restarts)."""
+        for job in Job.select().where(Job.state == "running"):
+            handle = JobManager._handles.get(job.id)
+            if handle is not None:
+                if handle.poll() is not None:
+                    JobManager._finish(job.id, handle.returncode)
+            elif job.owner == "daemon":
+                known, returncode = JobManager._daemon_returncode(job)
+                if not known:
+                    JobManager._finish(job.id, None, "lost")
+                elif returncode is not None:
+                    JobManager._finish(job.id, returncode)
+            elif not JobManager._pid_alive(job.pid, job.pid_start):
+                JobManager._finish(job.id, None, "lost")
+
+    @staticmethod
+    def list(limit: int = LIST_LIMIT) -> List[Job]:
+        if database().deferred:
+            return []
+        try:
+            JobManager.refresh()
+            running = list(Job.select().where(Job.state == "running").order_by(Job.started_at))
+            recent = list(Job.select().where(Job.state != "running").order_by(Job.started_at.desc())
+                          .limit(max(limit - len(running), 0)))
+        except Exception:
+            return []
+        return running + recent
+
+    @staticmethod
+    def show() -> List[Job]:
+        from rich.table import Table
+
+        jobs = JobManager.list()
+        if not jobs:
+            console.print("[info]Nenhum job registrado.[/info]")
+            return jobs
+
+        table = Table(title="Jobs")
+        table.add_column("ID", justify="right")
+        table.add_column("Projeto")
+        table.add_column("Comando", overflow="fold")
+        table.add_column("Estado")
+        table.add_column("PID", justify="right")
+        table.add_column("Início")
+        table.add_column("Log")
+        for job in jobs:
+            state = STATES.get(job.state, job.state)
+            if job.exit_code is not None and job.state != "running":
+                state += f" ({job.exit_code})"
+            if job.owner == "daemon":
+                state += " [dim]daemon[/dim]"
+            table.add_row(str(job.id), job.project, job.command, state, str(job.pid or "-"),
+                          job.started_at.strftime("%d/%m %H:%M:%S"), os.path.basename(job.log_path or "-"))
+        console.print(table)
+        return jobs
+
+    @staticmethod
+    def attach(job: Job):
+        """Follow the job's log until it ends; Ctrl+C detaches and leaves the job running."""
+        from executor import Executor
+
+        if not job.log_path or not os.path.exists(job.log_path):
+            console.print(f"[error]Log do job #{job.id} não encontrado: {job.log_path}[/error]")
+            return
+
+        console.print(f"[info]Anexado ao job #{job.id} ({job.project}: {job.command}). Ctrl+C para desanexar.[/info]")
+        console.print(f"Log: {job.log_path}")
+        out = sys.stdout
+        try:
+            with open(job.log_path, 'rb') as f:
+                for line in deque(f, maxlen=TAIL_LINES):
+                    out.write(Executor._safe_decode(line))
+                out.flush()
+
+                idle_since = time.monotonic()
+                while True:
+                    line = f.readline()
+                    if line:
+                        out.write(Executor._safe_decode(line))
+                        idle_since = time.monotonic()
+                        continue
+                    out.flush()
+                    # Check the process only when the log has been quiet for a moment
+                    if time.monotonic() - idle_since > 0.5 and not JobManager.running(job):
+                        for line in f:
+                            out.write(Executor._safe_decode(line))
+                        out.flush()
+                        JobManager.refresh()
+                        job = Job.get_by_id(job.id)
+                        console.print(f"\n[info]Job #{job.id} terminou: {STATES.get(job.state, job.state)}[/info]")
+                        return
+                    time.sleep(0.1)
+        except KeyboardInterrupt:
+            out.flush()
+            console.print(f"\n[info]Desanexado; job #{job.id} continua em execução.[/info]")
+
+    @staticmethod
+    def stop(job: Job, timeout: float = STOP_TIMEOUT) -> bool:
+        """SIGTERM the job's process group, SIGKILL after `timeout`; returns True when it is gone."""
+        if job.owner == "daemon":
+            from daemon import DaemonClient, DaemonError
+            try:
+                client = DaemonClient()
+                client.request("stop", job=job.daemon_job, signal=int(signal.SIGTERM), pid=job.pid)
+                deadline = time.monotonic() + timeout
+                while JobManager.running(job) and time.monotonic() < deadline:
+                    time.sleep(0.2)
+                if JobManager.running(job):
+                    client.request("stop", job=job.daemon_job, signal=int(signal.SIGKILL), pid=job.pid)
+            except (OSError, DaemonError) as e:
+                console.print(f"[error]Erro ao parar o job #{job.id} no daemon: {e}[/error]")
+                return False
+        elif job.id not in JobManager._handles and not JobManager.running(job):
+            # Gone, or its pid now belongs to another process: nothing of the job's to signal
+            JobManager._finish(job.id, None, "lost")
+            return True
+        else:
+            for signum in (signal.SIGTERM, signal.SIGKILL):
+                try:
+                    os.killpg(job.pid, signum)
+                except ProcessLookupError:
+                    break
+                except PermissionError as e:
+                    console.print(f"[error]Sem permissão para parar o job #{job.id}: {e}[/error]")
+                    return False
+                deadline = time.monotonic() + timeout
+                while JobManager.running(job) and time.monotonic() < deadline:
+                    time.sleep(0.1)
+                if not JobManager.running(job):
+                    break
+
+        handle = JobManager._handles.get(job.id)
+        if handle is not None:
+            exit_code = handle.poll()
+        elif job.owner == "daemon":
+            _, exit_code = JobManager._daemon_returncode(job)
+        else:
+            exit_code = None
+        JobManager._finish(job.id, exit_code, "stopped")
+        return not JobManager.running(job)
@@ -4,27 +4,15 @@ import atexit
 import signal
 import sys
 import json
-import subprocess
 import time
-import threading
-import secrets
-import asyncio
-from pathlib import Path
+from contextlib import contextmanager
 from typing import Optional
 
-# Fix for Pyrlang split dependencies
-try:
-    from pyrlang import Node
-    from term import Atom
-    PYRLANG_AVAILABLE = True
-except ImportError:
-    PYRLANG_AVAILABLE = False
-
 from aedificator import console
-from aedificator.memory import DockerConfiguration
-from aedificator.docker import DockerManager
+from aedificator.tracing import span
+from aedificator.profiling import profiled
+from aedificator.memory import DockerConfiguration, ConfigCache, LanguageVersions
 from executor import Executor
-from backup import BackupManager
 from config import ConfigManager
 
 
@@ -38,101 +26,50 @@ class Menu:
         self.docker_configs = docker_configs or {}
         self.processes = []
         
-        # Erlang/Pyrlang State
-        self.py_node = None
-        self.py_node_thread = None
-        self.erlang_cookie = None
-        self.node_name = "aedificator_ctl@localhost"
+        # Erlang/Pyrlang State (the daemon owns the node when it is running)
+        self._erlang = None
+        self.node_owner = None
+
+        # Base images being pulled after a version change (Configurações)
+        self.prefetcher = None
 
         # Register cleanup handlers
         atexit.register(self._cleanup_processes)
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
 
-    def _ensure_cookie(self):
-        """
-        Ensures ~/.erlang.cookie exists, has correct permissions (400),
-        and loads it into memory so Python and Erlang share the secret.
-        """
-        cookie_path = Path.home() / ".erlang.cookie"
-        
-        if not cookie_path.exists():
-            console.print("[info]Gerando novo Erlang cookie...[/info]")
-            # Generate a secure random cookie
-            cookie_content = secrets.token_urlsafe(16)
-            with open(cookie_path, 'w') as f:
-                f.write(cookie_content)
-        
-        # Enforce permissions (Erlang requires 400 - read only by owner)
-        try:
-            os.chmod(cookie_path, 0o400)
-        except Exception:
-            pass # Windows or specific FS might ignore this
-        
-        with open(cookie_path, 'r') as f:
-            self.erlang_cookie = f.read().strip()
-            
-        return self.erlang_cookie
-
-    def _ensure_epmd(self):
-        """Ensures the Erlang Port Mapper Daemon is running."""
-        try:
-            # Try to connect to EPMD port to see if it's running
-            import socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            result = sock.connect_ex(('127.0.0.1', 4369))
-            sock.close()
-            
-            if result != 0:
-                console.print("[info]Iniciando EPMD (Erlang Port Mapper Daemon)...[/info]")
-                # Start epmd in daemon mode
-                subprocess.Popen(["epmd", "-daemon"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                time.sleep(0.5) # Give it a moment to bind
-        except Exception as e:
-            console.print(f"[warning]Não foi possível verificar/iniciar EPMD: {e}[/warning]")
+    @property
+    def erlang(self):
+        """The Erlang control node, created on first use."""
+        if self._erlang is None:
+            from erlang import ErlangNode
+            self._erlang = ErlangNode()
+        return self._erlang
 
     def _start_pyrlang_node(self):
-        """Starts the Python script as a hidden Erlang node in the background."""
-        if not PYRLANG_AVAILABLE:
-            return
-
-        if self.py_node:
+        """Starts the Erlang control node, unless the daemon already owns it."""
+        from daemon import DaemonClient
+        if DaemonClient().available():
+            self.node_owner = "daemon"
             return
+        self.erlang.start()
+        self.node_owner = "menu"
 
-        # 1. Ensure EPMD is running before anything else
-        self._ensure_epmd()
-        
-        # 2. Ensure Cookie
-        cookie = self._ensure_cookie()
-
-        def run_node():
-            # Create a new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            try:
-                # Initialize Python as a hidden node. 
-                self.py_node = Node(node_name=self.node_name, cookie=cookie)
-                self.py_node.run()
-            except Exception as e:
-                console.print(f"[error]Falha ao iniciar nó Pyrlang: {e}[/error]")
-
-        # Run as daemon
-        self.py_node_thread = threading.Thread(target=run_node, daemon=True)
-        self.py_node_thread.start()
-        
-        time.sleep(0.2)
-        
     def show_main_menu(self):
         """Display the main menu and handle user selection."""
-        
+
         # Start the Erlang node immediately on boot
+        from erlang import PYRLANG_AVAILABLE
         if PYRLANG_AVAILABLE:
             self._start_pyrlang_node()
         
         try:
             while True:
                 console.print("\n[info]Menu Principal[/info]")
+                if self.prefetcher is not None:
+                    console.print(f"[dim]{self.prefetcher.status_line()}[/dim]")
+                    if self.prefetcher.done:
+                        self.prefetcher = None
 
                 choice = questionary.select(
                     "Escolha uma categoria:",
@@ -141,34 +78,45 @@ class Menu:
                         "SL Phoenix",
                         "Extensão",
                         "Executar Múltiplos",
+                        "Jobs",
                         "Docker Images",
+                        "Histórico",
                         "Configurações",
                         "Sair"
                     ]
                 ).ask()
 
-                if choice == "Superleme":
-                    self.show_superleme_menu()
-                elif choice == "SL Phoenix":
-                    self.show_sl_phoenix_menu()
-                elif choice == "Extensão":
-                    self.show_extension_menu()
-                elif choice == "Executar Múltiplos":
-                    self.show_combined_menu()
-                elif choice == "Docker Images":
-                    self.show_docker_images_menu()
-                elif choice == "Configurações":
-                    self.show_settings_menu()
-                elif choice == "Sair":
-                    console.print("[info]Saindo...[/info]")
-                    self._cleanup_processes()
-                    break
+                # Per-action profiles with --profile; time spent in prompts costs no CPU
+                with profiled(f"menu {choice}"):
+                    if choice == "Superleme":
+                        self.show_superleme_menu()
+                    elif choice == "SL Phoenix":
+                        self.show_sl_phoenix_menu()
+                    elif choice == "Extensão":
+                        self.show_extension_menu()
+                    elif choice == "Executar Múltiplos":
+                        self.show_combined_menu()
+                    elif choice == "Jobs":
+                        self.show_jobs_menu()
+                    elif choice == "Docker Images":
+                        self.show_docker_images_menu()
+                    elif choice == "Histórico":
+                        from history import HistoryManager
+                        HistoryManager.manage()
+                    elif choice == "Configurações":
+                        self.show_settings_menu()
+                    elif choice == "Sair":
+                        console.print("[info]Saindo...[/info]")
+                        self._cleanup_processes()
+                        break
         except KeyboardInterrupt:
             console.print("\n[warning]Interrompido pelo usuário[/warning]")
             self._cleanup_processes()
 
     def show_superleme_menu(self):
         """Display Superleme project menu."""
+        from backup import BackupManager, RestoreProfiles
+        from aedificator.docker import DockerManager
         console.print("\n[info]Superleme[/info]")
 
         zotonic_root = os.path.dirname(os.path.dirname(self.superleme_path))
@@ -186,52 +134,49 @@ class Menu:
                 "3. Executar (debug mode)",
                 "4. Restaurar Backup do Banco de Dados",
                 "5. Parar (stop)",
+                "6. Nó Zotonic (status, reload, flush, restart)",
+                "7. Modo watch (compilação incremental)",
                 "Voltar"
             ]
         ).ask()
 
         if choice == "1. Reconstruir imagem Docker":
-            if use_docker:
-                console.print("[info]Atualizando receitas Docker (overwrite)...[/info]")
+            with span("superleme.rebuild_image"):
+                if use_docker:
+                    console.print("[info]Atualizando receitas Docker (overwrite)...[/info]")
 
-                dockerfile_path = os.path.join(zotonic_root, "Dockerfile.superleme")
-                compose_path = os.path.join(zotonic_root, "docker-compose.yml")
+                    dockerfile_path = os.path.join(zotonic_root, "Dockerfile.superleme")
+                    compose_path = os.path.join(zotonic_root, "docker-compose.yml")
 
-                DockerManager.generate_superleme_dockerfile(dockerfile_path)
-                DockerManager.generate_docker_compose(compose_path, stack_type='superleme')
+                    DockerManager.generate_superleme_dockerfile(dockerfile_path)
+                    DockerManager.generate_docker_compose(compose_path, stack_type='superleme')
 
-                console.print("[info]Garantindo configuração do site...[/info]")
-                ConfigManager.ensure_superleme_config(zotonic_root, self.superleme_path)
+                    console.print("[info]Garantindo configuração do site...[/info]")
+                    ConfigManager.ensure_superleme_config(zotonic_root, self.superleme_path)
 
-                console.print("[info]Reconstruindo imagem Docker zotonic:latest...[/info]")
-                Executor.run_command("docker compose build --no-cache zotonic", zotonic_root, background=False, use_docker=False)
-            else:
-                console.print("[warning]Docker não está ativo para este projeto.[/warning]")
+                    console.print("[info]Reconstruindo imagem Docker zotonic:latest...[/info]")
+                    Executor.run_command("docker compose build --no-cache zotonic", zotonic_root, background=False, use_docker=False)
+                else:
+                    console.print("[warning]Docker não está ativo para este projeto.[/warning]")
 
         elif choice == "2. Recompilar (Clean & Make)":
-            if use_docker:
-                console.print("[info]Garantindo integridade dos arquivos Docker...[/info]")
-                compose_path = os.path.join(zotonic_root, "docker-compose.yml")
-                DockerManager.generate_docker_compose(compose_path, stack_type='superleme')
-
-                console.print("[warning]Parando containers e removendo volumes Docker...[/warning]")
-                Executor.run_command("docker compose down --volumes --remove-orphans", zotonic_root, background=False, use_docker=False)
-
-                console.print("[info]Removendo volume zotonic_build explicitamente...[/info]")
-                Executor.run_command("docker volume rm zotonic_build 2>/dev/null || true", zotonic_root, background=False, use_docker=False)
-
-                console.print("[info]Criando volume com permissões corretas...[/info]")
-                Executor.run_command("docker compose run --rm --user root zotonic bash -c 'mkdir -p _build && chown -R 1000:1000 _build'", zotonic_root, background=False, use_docker=False)
-
-                console.print("[info]Executando clean build...[/info]")
-                cmd = "docker compose run --rm zotonic bash -c 'make clean && make'"
-            else:
-                cmd = "rm -rf _build && make clean && make"
-            Executor.run_command(cmd, zotonic_root, background=False, use_docker=False, docker_config=docker_config)
+            with span("superleme.recompile"):
+                if use_docker:
+                    console.print("[info]Garantindo integridade dos arquivos Docker...[/info]")
+                    compose_path = os.path.join(zotonic_root, "docker-compose.yml")
+                    DockerManager.generate_docker_compose(compose_path, stack_type='superleme')
+
+                    cmd = self._superleme_recompile_command(zotonic_root)
+                    if cmd is None:
+                        return
+                else:
+                    cmd = "rm -rf _build && make clean && make"
+                Executor.run_command(cmd, zotonic_root, background=False, use_docker=False, docker_config=docker_config)
 
         elif choice == "3. Executar (debug mode)":
-            if PYRLANG_AVAILABLE and self.py_node:
-                console.print(f"[green]Conexão direta ativa: {self.node_name}[/green]")
+            from erlang import PYRLANG_AVAILABLE
+            if PYRLANG_AVAILABLE and (self.erlang.node or self.node_owner == "daemon"):
+                console.print(f"[green]Conexão direta ativa: {self.erlang.node_name}[/green]")
 
             console.print("[info]Iniciando shell Zotonic... (Você pode digitar comandos aqui)[/info]")
 
@@ -246,19 +191,117 @@ class Menu:
             
         elif choice == "4. Restaurar Backup do Banco de Dados":
             if use_docker:
-                console.print("[info]Restaurando backup do banco de dados...[/info]")
-                BackupManager.restore_database(zotonic_root, use_docker)
+                confirmed, profile = RestoreProfiles.select()
+                if confirmed:
+                    console.print("[info]Restaurando backup do banco de dados...[/info]")
+                    BackupManager.restore_database(zotonic_root, use_docker, profile=profile)
             else:
                 console.print("[warning]Restauração de backup disponível apenas no modo Docker.[/warning]")
 
         elif choice == "5. Parar (stop)":
-            if use_docker:
-                Executor.run_command("docker compose down", zotonic_root, background=False, use_docker=False)
-            else:
-                Executor.run_command("bin/zotonic stop", zotonic_root, background=False, use_docker=False)
+            if self._zotonic_action("stop", zotonic_root, use_docker) and use_docker:
+                console.print("[info]Containers de apoio (postgres) continuam ativos; 'docker compose down' os encerra.[/info]")
+
+        elif choice == "6. Nó Zotonic (status, reload, flush, restart)":
+            actions = {
+                "Status": "status",
+                "Recarregar módulos alterados": "reload",
+                "Limpar caches": "flush",
+                "Reiniciar site": "restart",
+            }
+            node_choice = questionary.select("Operação no nó:", choices=list(actions) + ["Voltar"]).ask()
+            if node_choice in actions:
+                self._zotonic_action(actions[node_choice], zotonic_root, use_docker)
+
+        elif choice == "7. Modo watch (compilação incremental)":
+            self._watch_superleme(zotonic_root, use_docker)
+
+    def _watch_superleme(self, zotonic_root: str, use_docker: bool):
+        """Runs watch mode until Ctrl+C, which here ends the watch instead of the menu."""
+        from watch import WatchManager
+        previous = signal.signal(signal.SIGINT, signal.default_int_handler)
+        try:
+            WatchManager.run(self.superleme_path, zotonic_root, use_docker, self.erlang)
+        finally:
+            signal.signal(signal.SIGINT, previous)
+
+    def _superleme_recompile_command(self, zotonic_root: str) -> Optional[str]:
+        """
+        Choose what a Docker recompile invalidates and prepare it. The database
+        and the dependency caches are never touched; the build volume is only
+        dropped when asked for, after listing it. Returns the build command, or
+        None when cancelled.
+        """
+        from aedificator.docker import DockerManager, CACHE_VOLUMES
+
+        mode = questionary.select(
+            "O que deve ser recompilado?",
+            choices=[
+                "Apps do projeto (make clean && make; mantém dependências compiladas)",
+                "Tudo: descartar o volume de build (zotonic_build)",
+                "Voltar"
+            ]
+        ).ask()
+        if mode is None or mode == "Voltar":
+            return None
+        if mode.startswith("Apps do projeto"):
+            console.print("[info]Executando clean build (volumes preservados)...[/info]")
+            return "docker compose run --rm zotonic bash -c 'make clean && make'"
+
+        volumes = DockerManager.project_volumes(zotonic_root)
+        cache_names = {volume for volume, _, _, _ in CACHE_VOLUMES.values()}
+        dropped = [name for key, name in volumes.items() if key == "zotonic_build"]
+        kept = [name for key, name in volumes.items() if key != "zotonic_build"]
+
+        console.print(f"Volumes a remover: [red]{', '.join(dropped) or 'nenhum (ainda não criado)'}[/red]")
+        if kept:
+            labels = [f"{name} (cache)" if name in cache_names else name for name in kept]
+            console.print(f"Volumes preservados: [green]{', '.join(labels)}[/green]")
+        if dropped and not questionary.confirm("Remover e recompilar do zero?", default=True).ask():
+            return None
+
+        if dropped and not DockerManager.remove_volumes(dropped):
+            return None
+
+        console.print("[info]Criando volume com permissões corretas...[/info]")
+        Executor.run_command("docker compose run --rm --user root zotonic bash -c 'mkdir -p _build && chown -R 1000:1000 _build'", zotonic_root, background=False, use_docker=False)
+
+        console.print("[info]Executando build completo...[/info]")
+        return "docker compose run --rm zotonic make"
+
+    def _zotonic_action(self, action: str, zotonic_root: str, use_docker: bool) -> bool:
+        """
+        Runs a ZotonicRpc action on the running node; without a connection, runs
+        the equivalent bin/zotonic (or docker compose) command instead.
+        Returns True when it went through RPC.
+        """
+        from erlang import ZotonicRpc, RpcError
+        rpc = ZotonicRpc(self.erlang)
+        started = time.perf_counter()
+        try:
+            result = rpc.execute(action)
+        except RpcError as e:
+            command = rpc.fallback_command(action, use_docker)
+            console.print(f"[warning]Sem conexão direta com {rpc.node_name} ({e}); executando {command}[/warning]")
+            Executor.run_command(command, zotonic_root, background=False, use_docker=False)
+            return False
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if action == "status":
+            from rich.table import Table
+            table = Table(title=f"{result['node']} | ativo há {int(result['uptime'])}s | {elapsed_ms:.1f} ms")
+            table.add_column("Site")
+            table.add_column("Status")
+            for site, status in sorted(result["sites"].items()):
+                table.add_row(site, str(status))
+            console.print(table)
+        else:
+            console.print(f"[success]{action}: {result} ({elapsed_ms:.1f} ms via {rpc.node_name})[/success]")
+        return True
 
     def show_sl_phoenix_menu(self):
         """Display SL Phoenix project menu."""
+        from aedificator.docker import DockerManager
         console.print("\n[info]SL Phoenix[/info]")
 
         use_docker = self.docker_configs.get('sl_phoenix', {}).get('use_docker', False)
@@ -282,38 +325,40 @@ class Menu:
         ).ask()
 
         if choice == "Reconstruir imagem Docker":
-            if use_docker:
-                console.print("[info]Atualizando receitas Docker (overwrite)...[/info]")
+            with span("sl_phoenix.rebuild_image"):
+                if use_docker:
+                    console.print("[info]Atualizando receitas Docker (overwrite)...[/info]")
                 
-                dockerfile_path = os.path.join(self.sl_phoenix_path, "Dockerfile.phoenix")
-                compose_path = os.path.join(self.sl_phoenix_path, "docker-compose.phoenix.yml")
+                    dockerfile_path = os.path.join(self.sl_phoenix_path, "Dockerfile.phoenix")
+                    compose_path = os.path.join(self.sl_phoenix_path, "docker-compose.phoenix.yml")
                 
-                DockerManager.generate_phoenix_dockerfile(dockerfile_path)
-                DockerManager.generate_docker_compose(compose_path, stack_type='phoenix')
+                    DockerManager.generate_phoenix_dockerfile(dockerfile_path)
+                    DockerManager.generate_docker_compose(compose_path, stack_type='phoenix')
 
-                console.print("[info]Reconstruindo imagem Docker sl_phoenix:latest...[/info]")
-                Executor.run_command("docker compose build --no-cache phoenix", self.sl_phoenix_path, background=False, use_docker=False)
-            else:
-                console.print("[warning]Docker não está ativo para este projeto.[/warning]")
+                    console.print("[info]Reconstruindo imagem Docker sl_phoenix:latest...[/info]")
+                    Executor.run_command("docker compose build --no-cache phoenix", self.sl_phoenix_path, background=False, use_docker=False)
+                else:
+                    console.print("[warning]Docker não está ativo para este projeto.[/warning]")
         elif choice == "Setup Completo":
-            console.print("[info]Executando setup completo do Phoenix...[/info]")
-            console.print("[info]1. Instalando dependências Elixir (mix deps.get)...[/info]")
-            Executor.run_command("mix deps.get", self.sl_phoenix_path, background=False, use_docker=use_docker, docker_config=docker_config)
+            with span("sl_phoenix.setup"):
+                console.print("[info]Executando setup completo do Phoenix...[/info]")
+                console.print("[info]1. Instalando dependências Elixir (mix deps.get)...[/info]")
+                Executor.run_command("mix deps.get", self.sl_phoenix_path, background=False, use_docker=use_docker, docker_config=docker_config)
             
-            console.print("[info]2. Compilando projeto (mix compile)...[/info]")
-            Executor.run_command("mix compile", self.sl_phoenix_path, background=False, use_docker=use_docker, docker_config=docker_config)
+                console.print("[info]2. Compilando projeto (mix compile)...[/info]")
+                Executor.run_command("mix compile", self.sl_phoenix_path, background=False, use_docker=use_docker, docker_config=docker_config)
             
-            console.print("[info]3. Instalando assets Node.js (cd assets && npm install)...[/info]")
-            assets_path = os.path.join(self.sl_phoenix_path, "assets")
-            if os.path.exists(assets_path):
-                Executor.run_command("npm install", assets_path, background=False, use_docker=use_docker, docker_config=docker_config)
-            else:
-                console.print("[warning]Diretório assets não encontrado, pulando npm install[/warning]")
+                console.print("[info]3. Instalando assets Node.js (cd assets && npm install)...[/info]")
+                assets_path = os.path.join(self.sl_phoenix_path, "assets")
+                if os.path.exists(assets_path):
+                    Executor.run_command("npm install", assets_path, background=False, use_docker=use_docker, docker_config=docker_config)
+                else:
+                    console.print("[warning]Diretório assets não encontrado, pulando npm install[/warning]")
             
-            console.print("[info]4. Criando e migrando banco de dados...[/info]")
-            Executor.run_command("mix ecto.setup", self.sl_phoenix_path, background=False, use_docker=use_docker, docker_config=docker_config)
+                console.print("[info]4. Criando e migrando banco de dados...[/info]")
+                Executor.run_command("mix ecto.setup", self.sl_phoenix_path, background=False, use_docker=use_docker, docker_config=docker_config)
             
-            console.print("[success]Setup do Phoenix concluído![/success]")
+                console.print("[success]Setup do Phoenix concluído![/success]")
         elif choice != "Voltar":
             target = choice.replace("make ", "")
             Executor.run_make(target, self.sl_phoenix_path, background=False, use_docker=use_docker, docker_config=docker_config)
@@ -412,8 +457,90 @@ class Menu:
             if bg:
                 self.processes.extend(new_processes)
 
+    def show_jobs_menu(self):
+        """Background jobs: list, start, attach (follow the output) and stop."""
+        from jobs import JobManager
+
+        while True:
+            console.print("\n[info]Jobs[/info]")
+            jobs = JobManager.show()
+            running = [job for job in jobs if job.state == "running"]
+
+            choice = questionary.select(
+                "Escolha uma operação:",
+                choices=[
+                    "Novo job",
+                    "Anexar (acompanhar saída)",
+                    "Parar job",
+                    "Atualizar",
+                    "Voltar"
+                ]
+            ).ask()
+
+            if choice == "Novo job":
+                process = self._start_job()
+                if process is not None:
+                    self.processes.append(process)
+                    job = JobManager.job_for(process)
+                    if job is not None and questionary.confirm("Anexar agora?", default=True).ask():
+                        self._attach_job(job)
+            elif choice == "Anexar (acompanhar saída)":
+                job = self._select_job(jobs, "Anexar a qual job?")
+                if job is not None:
+                    self._attach_job(job)
+            elif choice == "Parar job":
+                job = self._select_job(running, "Parar qual job?")
+                if job is not None:
+                    console.print(f"[info]Parando job #{job.id} (PID {job.pid})...[/info]")
+                    if JobManager.stop(job):
+                        console.print(f"[success]Job #{job.id} parado[/success]")
+            elif choice != "Atualizar":
+                break
+
+    def _select_job(self, jobs: list, message: str):
+        if not jobs:
+            console.print("[warning]Nenhum job disponível.[/warning]")
+            return None
+        choices = [questionary.Choice(f"#{job.id} {job.project}: {job.command} ({job.state})", value=job) for job in jobs]
+        return questionary.select(message, choices=choices + [questionary.Choice("Voltar", value=None)]).ask()
+
+    def _attach_job(self, job):
+        """Follows a job until Ctrl+C, which here detaches instead of ending the menu."""
+        from jobs import JobManager
+        previous = signal.signal(signal.SIGINT, signal.default_int_handler)
+        try:
+            JobManager.attach(job)
+        finally:
+            signal.signal(signal.SIGINT, previous)
+
+    def _start_job(self):
+        """Asks for a project and a command and starts it as a background job."""
+        zotonic_root = os.path.dirname(os.path.dirname(self.superleme_path))
+        superleme_use_docker = self.docker_configs.get('superleme', {}).get('use_docker', False)
+        projects = {
+            "Superleme": (zotonic_root, 'superleme', ["make", "./run.sh" if superleme_use_docker else "bin/zotonic debug"]),
+            "SL Phoenix": (self.sl_phoenix_path, 'sl_phoenix', ["make server", "make test", "make build", "make assets"]),
+            "Extensão": (self.extension_path, None, ["make watch", "make build", "make test"]),
+        }
+
+        project = questionary.select("Projeto:", choices=list(projects) + ["Voltar"]).ask()
+        if project not in projects:
+            return None
+        cwd, key, suggestions = projects[project]
+
+        command = questionary.select("Comando:", choices=suggestions + ["Outro comando...", "Voltar"]).ask()
+        if command == "Outro comando...":
+            command = questionary.text("Comando:").ask()
+        if not command or command == "Voltar":
+            return None
+
+        docker_config = self.docker_configs.get(key) if key else None
+        use_docker = bool(docker_config and docker_config.get('use_docker', False))
+        return Executor.run_command(command, cwd, background=True, use_docker=use_docker, docker_config=docker_config)
+
     def show_settings_menu(self):
         """Display settings menu for configuration."""
+        from backup import BackupManager, RestoreProfiles
         console.print("\n[info]Configurações[/info]")
 
         # Show current Docker status
@@ -430,33 +557,69 @@ class Menu:
                 "Configurações Docker - Superleme",
                 "Configurações Docker - SL Phoenix",
                 "Baixar Novo Backup do Banco",
+                "Perfis de Restauração",
                 "Limpar Processos Docker em Background",
                 "Voltar"
             ]
         ).ask()
 
         if choice == "Versões de Linguagens - Superleme":
-            self._configure_superleme_versions()
+            with self._prefetch_base_images():
+                self._configure_superleme_versions()
         elif choice == "Versões de Linguagens - SL Phoenix":
-            self._configure_phoenix_versions()
+            with self._prefetch_base_images():
+                self._configure_phoenix_versions()
         elif choice == "Configurações Docker - Superleme":
-            self._configure_superleme_docker()
+            with self._prefetch_base_images():
+                self._configure_superleme_docker()
         elif choice == "Configurações Docker - SL Phoenix":
-            self._configure_phoenix_docker()
+            with self._prefetch_base_images():
+                self._configure_phoenix_docker()
         elif choice == "Baixar Novo Backup do Banco":
             BackupManager.download_backup()
+        elif choice == "Perfis de Restauração":
+            RestoreProfiles.manage()
         elif choice == "Limpar Processos Docker em Background":
             self._cleanup_docker_processes()
 
+    @contextmanager
+    def _prefetch_base_images(self):
+        """Pull in the background the base images a settings change brings in, and flag the ones it drops."""
+        from aedificator.docker import ImagePrefetcher
+        try:
+            previous = ImagePrefetcher.base_images(self.docker_configs)
+        except Exception:
+            previous = None
+        yield
+        if previous is None:
+            return
+        try:
+            current = ImagePrefetcher.base_images(self.docker_configs)
+        except Exception as e:
+            console.print(f"[warning]Não foi possível calcular as imagens base: {e}[/warning]")
+            return
+
+        local = ImagePrefetcher.local_images()
+        stale = [image for image in ImagePrefetcher.stale(previous, current) if image in local]
+        if stale:
+            console.print(f"[warning]Imagens não mais referenciadas: {', '.join(stale)}[/warning]")
+            console.print(f"Para liberar espaço: docker image rm {' '.join(stale)}")
+
+        missing = [image for image in current if image not in local]
+        if not missing:
+            return
+        if self.prefetcher is not None and self.prefetcher.add(missing):
+            console.print(f"[info]Adicionadas ao download em andamento: {', '.join(missing)}[/info]")
+        else:
+            self.prefetcher = ImagePrefetcher(missing).start()
+            console.print(f"[info]Baixando em segundo plano: {', '.join(missing)}[/info]")
+
     def _configure_superleme_versions(self):
         """Configure language versions for Superleme."""
         console.print("\n[info]Configuração de Versões - Superleme[/info]")
 
-        try:
-            config = DockerConfiguration.get(DockerConfiguration.project_name == 'superleme')
-            current_langs = json.loads(config.languages) if config.languages else {}
-        except:
-            current_langs = {}
+        current = ConfigCache.get('superleme')
+        current_langs = current.languages if current else LanguageVersions()
 
         erlang_version = questionary.text(
             "Versão do Erlang:",
@@ -487,11 +650,8 @@ class Menu:
         """Configure language versions for SL Phoenix."""
         console.print("\n[info]Configuração de Versões - SL Phoenix[/info]")
 
-        try:
-            config = DockerConfiguration.get(DockerConfiguration.project_name == 'sl_phoenix')
-            current_langs = json.loads(config.languages) if config.languages else {}
-        except:
-            current_langs = {}
+        current = ConfigCache.get('sl_phoenix')
+        current_langs = current.languages if current else LanguageVersions()
 
         elixir_version = questionary.text(
             "Versão do Elixir:",
@@ -529,11 +689,8 @@ class Menu:
         """Configure Docker settings for Superleme."""
         console.print("\n[info]Configuração Docker - Superleme[/info]")
 
-        try:
-            config = DockerConfiguration.get(DockerConfiguration.project_name == 'superleme')
-            current_use_docker = config.use_docker
-        except:
-            current_use_docker = False
+        current = ConfigCache.get('superleme')
+        current_use_docker = current.use_docker if current else False
 
         use_docker = questionary.confirm(
             "Usar Docker para executar Superleme?",
@@ -557,11 +714,8 @@ class Menu:
         """Configure Docker settings for SL Phoenix."""
         console.print("\n[info]Configuração Docker - SL Phoenix[/info]")
 
-        try:
-            config = DockerConfiguration.get(DockerConfiguration.project_name == 'sl_phoenix')
-            current_use_docker = config.use_docker
-        except:
-            current_use_docker = False
+        current = ConfigCache.get('sl_phoenix')
+        current_use_docker = current.use_docker if current else False
 
         use_docker = questionary.confirm(
             "Usar Docker para executar SL Phoenix?",
@@ -683,12 +837,25 @@ class Menu:
             return
 
         for process in self.processes:
+            if getattr(process, "detached", False):
+                # Owned by the daemon: keeps running after the menu exits
+                try:
+                    console.print(f"[info]Job #{process.job_id} (PID {process.pid}) continua no daemon[/info]")
+                except:
+                    pass
+                continue
             try:
                 if process.poll() is None:  # Process is still running
                     try:
                         console.print(f"[warning]Terminando processo PID {process.pid}...[/warning]")
                     except:
                         pass  # Console might be gone during shutdown
+                    from jobs import JobManager
+                    job = JobManager.job_for(process)
+                    if job is not None:
+                        # A job: its whole process group goes, and the jobs table records it
+                        JobManager.stop(job)
+                        continue
                     process.terminate()
                     try:
                         process.wait(timeout=5)
@@ -706,6 +873,7 @@ class Menu:
 
     def show_docker_images_menu(self):
         """Display Docker Images management menu."""
+        from aedificator.docker import DockerManager
         console.print("\n[info]Gerenciamento de Docker Images[/info]")
 
         choice = questionary.select(
@@ -717,6 +885,7 @@ class Menu:
                 "Listar Imagens Locais",
                 "Remover Imagem",
                 "Limpar Imagens Não Utilizadas",
+                "Caches de Dependências (hex, npm, rebar3)",
                 "Voltar"
             ]
         ).ask()
@@ -733,9 +902,13 @@ class Menu:
             self._remove_image_submenu()
         elif choice == "Limpar Imagens Não Utilizadas":
             self._prune_images_submenu()
+        elif choice == "Caches de Dependências (hex, npm, rebar3)":
+            from aedificator.docker import CacheVolumes
+            CacheVolumes.show_stats()
 
     def _generate_dockerfiles_submenu(self):
         """Submenu for generating Dockerfiles."""
+        from aedificator.docker import DockerManager
         console.print("\n[info]Gerar Dockerfiles[/info]")
 
         choice = questionary.select(
@@ -779,6 +952,7 @@ class Menu:
 
     def _build_images_submenu(self):
         """Submenu for building Docker images."""
+        from aedificator.docker import DockerManager
         console.print("\n[info]Build de Imagens Docker[/info]")
 
         choice = questionary.select(
@@ -800,72 +974,15 @@ class Menu:
             default="latest"
         ).ask()
 
-        if choice == "Superleme":
-            zotonic_root = os.path.dirname(os.path.dirname(self.superleme_path))
-            dockerfile_path = os.path.join(zotonic_root, "Dockerfile.superleme")
-
-            # Check if Dockerfile exists
-            if not os.path.exists(dockerfile_path):
-                console.print("[warning]Dockerfile não encontrado. Gerando...[/warning]")
-                DockerManager.generate_superleme_dockerfile(dockerfile_path)
-
-            # Load build args from DB config
-            super_config = DockerManager.load_config_from_db("superleme")
-            langs = json.loads(super_config.get('languages', '{}'))
-            build_args = {
-                'POSTGRES_VERSION': super_config.get('postgres_version'),
-                'ERLANG_VERSION': langs.get('erlang')
-            }
-
-            DockerManager.build_image(dockerfile_path, "zotonic", image_tag, zotonic_root, build_args)
-
-        elif choice == "SL Phoenix":
-            dockerfile_path = os.path.join(self.sl_phoenix_path, "Dockerfile.phoenix")
-
-            # Check if Dockerfile exists
-            if not os.path.exists(dockerfile_path):
-                console.print("[warning]Dockerfile não encontrado. Gerando...[/warning]")
-                DockerManager.generate_phoenix_dockerfile(dockerfile_path)
-
-            # Load build args for Phoenix
-            phoenix_config = DockerManager.load_config_from_db("sl_phoenix")
-            phoenix_langs = json.loads(phoenix_config.get('languages', '{}'))
-            build_args = {
-                'ELIXIR_VERSION': phoenix_langs.get('elixir'),
-                'ERLANG_VERSION': phoenix_langs.get('erlang'),
-                'NODE_VERSION': phoenix_langs.get('node')
-            }
-            DockerManager.build_image(dockerfile_path, "sl_phoenix", image_tag, self.sl_phoenix_path, build_args)
-
-        elif choice == "Ambos (Superleme + Phoenix)":
-            # Build Superleme
-            zotonic_root = os.path.dirname(os.path.dirname(self.superleme_path))
-            superleme_dockerfile = os.path.join(zotonic_root, "Dockerfile.superleme")
-
-            if not os.path.exists(superleme_dockerfile):
-                console.print("[warning]Dockerfile do Superleme não encontrado. Gerando...[/warning]")
-                DockerManager.generate_superleme_dockerfile(superleme_dockerfile)
-
-            # Build Superleme with args
-            super_config = DockerManager.load_config_from_db("superleme")
-            super_langs = json.loads(super_config.get('languages', '{}'))
-            build_args = {'POSTGRES_VERSION': super_config.get('postgres_version'), 'ERLANG_VERSION': super_langs.get('erlang')}
-            DockerManager.build_image(superleme_dockerfile, "zotonic", image_tag, zotonic_root, build_args)
-
-            # Build Phoenix
-            phoenix_dockerfile = os.path.join(self.sl_phoenix_path, "Dockerfile.phoenix")
-
-            if not os.path.exists(phoenix_dockerfile):
-                console.print("[warning]Dockerfile do Phoenix não encontrado. Gerando...[/warning]")
-                DockerManager.generate_phoenix_dockerfile(phoenix_dockerfile)
-
-            phoenix_config = DockerManager.load_config_from_db("sl_phoenix")
-            phoenix_langs = json.loads(phoenix_config.get('languages', '{}'))
-            build_args = {'ELIXIR_VERSION': phoenix_langs.get('elixir'), 'ERLANG_VERSION': phoenix_langs.get('erlang'), 'NODE_VERSION': phoenix_langs.get('node')}
-            DockerManager.build_image(phoenix_dockerfile, "sl_phoenix", image_tag, self.sl_phoenix_path, build_args)
+        zotonic_root = os.path.dirname(os.path.dirname(self.superleme_path))
+        if choice in ("Superleme", "Ambos (Superleme + Phoenix)"):
+            DockerManager.build_project_image("superleme", zotonic_root, image_tag)
+        if choice in ("SL Phoenix", "Ambos (Superleme + Phoenix)"):
+            DockerManager.build_project_image("sl_phoenix", self.sl_phoenix_path, image_tag)
 
     def _push_images_submenu(self):
         """Submenu for pushing Docker images to registry."""
+        from aedificator.docker import DockerManager
         console.print("\n[info]Push para Registry[/info]")
 
         # Ask for registry
@@ -905,6 +1022,7 @@ class Menu:
 
     def _remove_image_submenu(self):
         """Submenu for removing Docker images."""
+        from aedificator.docker import DockerManager
         console.print("\n[info]Remover Imagem Docker[/info]")
 
         # List images first
@@ -941,6 +1059,7 @@ class Menu:
 
     def _prune_images_submenu(self):
         """Submenu for pruning unused Docker images."""
+        from aedificator.docker import DockerManager
         console.print("\n[info]Limpar Imagens Não Utilizadas[/info]")
 
         all_images = questionary.confirm(
@@ -0,0 +1,213 @@
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+from aedificator.memory import ProjectLocation
+from .scanner import MAX_DEPTH, SKIP_DIRS, ProjectScanner, default_search_roots, directory_matches
+from .inotify import Inotify, IN_MOVED_FROM, IN_MOVED_TO, IN_ONLYDIR
+
+KEYS = list(MAX_DEPTH)
+
+# Candidate rows kept per project
+MAX_CANDIDATES = 5
+# Directories listed when looking around a vanished location before a full scan
+NEIGHBOURHOOD_BUDGET = 20000
+NEIGHBOURHOOD_DEPTH = 3
+
+# The superleme app lives at <checkout>/apps_user/superleme; the checkout is what gets moved
+_ANCHOR_LEVELS = {"superleme_path": 2}
+
+
+def _anchor(key: str, path: str) -> str:
+    for _ in range(_ANCHOR_LEVELS.get(key, 0)):
+        path = os.path.dirname(path)
+    return path
+
+
+class LocationCache:
+    """
+    Project locations remembered in the database, with directory fingerprints.
+
+    Lookups try, in order: the cached candidates (a directory whose inode and
+    mtime did not change is accepted without listing it), the neighbourhood of
+    each candidate (its nearest existing ancestor and that ancestor's parent,
+    matching by inode so a renamed or moved checkout is recognised), and only
+    then a full ProjectScanner pass.
+    """
+
+    _watcher: Optional[threading.Thread] = None
+
+    @staticmethod
+    def fingerprint(path: str):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_dev, st.st_ino, st.st_mtime_ns
+
+    @staticmethod
+    def record(key: str, path: str):
+        """Store `path` as the newest candidate for `key`."""
+        fp = LocationCache.fingerprint(path)
+        if fp is None:
+            return
+        device, inode, mtime = fp
+        row = ProjectLocation.get_or_none((ProjectLocation.key == key) & (ProjectLocation.path == path))
+        if row is None:
+            row = ProjectLocation(key=key, path=path)
+        row.device = device
+        row.inode = inode
+        row.mtime = mtime
+        row.last_seen = datetime.now()
+        row.save()
+
+        stale = LocationCache.candidates(key)[MAX_CANDIDATES:]
+        for old in stale:
+            old.delete_instance()
+
+    @staticmethod
+    def remember(paths: Dict[str, Optional[str]]):
+        """Record the locations in use for this session."""
+        with ProjectLocation._meta.database.atomic():
+            for key, path in paths.items():
+                if path:
+                    LocationCache.record(key, path)
+
+    @staticmethod
+    def candidates(key: str) -> List[ProjectLocation]:
+        return list(
+            ProjectLocation.select()
+            .where(ProjectLocation.key == key)
+            .order_by(ProjectLocation.last_seen.desc())
+        )
+
+    @staticmethod
+    def _is_valid(row: ProjectLocation) -> bool:
+        fp = LocationCache.fingerprint(row.path)
+        if fp is None:
+            return False
+        if fp == (row.device, row.inode, row.mtime):
+            return True
+        return directory_matches(row.path, row.key)
+
+    @staticmethod
+    def _search_neighbourhood(row: ProjectLocation) -> Optional[str]:
+        """Look for a moved/renamed location next to where it used to be."""
+        anchor = os.path.dirname(row.path)
+        while anchor != os.path.dirname(anchor) and not os.path.isdir(anchor):
+            anchor = os.path.dirname(anchor)
+        areas = [anchor]
+        if os.path.dirname(anchor) != anchor:
+            areas.append(os.path.dirname(anchor))
+
+        max_depth = NEIGHBOURHOOD_DEPTH + _ANCHOR_LEVELS.get(row.key, 0)
+        basename = os.path.basename(row.path)
+        by_name = None
+        seen = set()
+        budget = NEIGHBOURHOOD_BUDGET
+        work = deque((area, 0) for area in areas)
+
+        while work and budget > 0:
+            path, depth = work.popleft()
+            if path in seen:
+                continue
+            seen.add(path)
+            budget -= 1
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        try:
+                            if not entry.is_dir(follow_symlinks=False) or entry.name in SKIP_DIRS:
+                                continue
+                            # DirEntry.inode() comes from readdir, no extra stat
+                            # Same directory (inode) moved around; a renamed checkout may no
+                            # longer satisfy the name-based matcher, so the old basename also counts
+                            if entry.inode() == row.inode and entry.stat(follow_symlinks=False).st_dev == row.device:
+                                if entry.name == basename or directory_matches(entry.path, row.key):
+                                    return entry.path
+                            if by_name is None and entry.name == basename and directory_matches(entry.path, row.key):
+                                by_name = entry.path
+                            if depth < max_depth:
+                                work.append((entry.path, depth + 1))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return by_name
+
+    @staticmethod
+    def locate(keys: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        """Find `keys` (default: all projects), falling back to a full scan only for misses."""
+        keys = keys if keys is not None else KEYS
+        found: Dict[str, Optional[str]] = {key: None for key in KEYS}
+
+        for key in keys:
+            rows = LocationCache.candidates(key)
+            for row in rows:
+                if LocationCache._is_valid(row):
+                    found[key] = row.path
+                    break
+            else:
+                for row in rows:
+                    moved = LocationCache._search_neighbourhood(row)
+                    if moved:
+                        found[key] = moved
+                        break
+
+        missing = [key for key in keys if not found[key]]
+        if missing:
+            found.update(ProjectScanner().scan(missing))
+
+        LocationCache.remember({key: found[key] for key in keys})
+        return found
+
+    @staticmethod
+    def watch(paths: Dict[str, Optional[str]]):
+        """
+        Follow renames of the project checkouts for the rest of the session (Linux only).
+
+        Parent directories of the checkouts and the default search roots are
+        watched; a move between any of them updates the cached location, so the
+        next start finds it without scanning.
+        """
+        if LocationCache._watcher is not None or not Inotify.available():
+            return
+        paths = dict(paths)
+        anchors = {key: _anchor(key, path) for key, path in paths.items() if path}
+        if not anchors:
+            return
+
+        try:
+            inotify = Inotify()
+        except OSError:
+            return
+        directories = {os.path.dirname(anchor) for anchor in anchors.values()}
+        directories.update(root for root in default_search_roots() if os.path.isdir(root))
+        for directory in directories:
+            inotify.add_watch(directory, IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR)
+
+        def run():
+            pending: Dict[int, str] = {}
+            while inotify.watched():
+                for event in inotify.read(timeout=1.0):
+                    source = os.path.join(event.path, event.name)
+                    if event.mask & IN_MOVED_FROM:
+                        pending[event.cookie] = source
+                    elif event.mask & IN_MOVED_TO and event.cookie in pending:
+                        old = pending.pop(event.cookie)
+                        for key, anchor in list(anchors.items()):
+                            if anchor == old or anchor.startswith(old + os.sep):
+                                new_anchor = source + anchor[len(old):]
+                                suffix = paths[key][len(anchor):]
+                                anchors[key] = new_anchor
+                                paths[key] = new_anchor + suffix
+                                try:
+                                    LocationCache.record(key, paths[key])
+                                except Exception:
+                                    pass
+                if len(pending) > 100:
+                    pending.clear()
+
+        LocationCache._watcher = threading.Thread(target=run, daemon=True, name="location-watch")
+        LocationCache._watcher.start()
@@ -0,0 +1,117 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+from typing import Dict, List, NamedTuple, Optional
+
+# Event masks from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_ONLYDIR = 0x01000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class InotifyEvent(NamedTuple):
+    path: str  # Watched directory the event happened in
+    name: str  # Entry name inside `path` ("" for events on the directory itself)
+    mask: int
+    cookie: int  # Pairs IN_MOVED_FROM with IN_MOVED_TO
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = _load_libc()
+
+
+class Inotify:
+    """
+    Minimal ctypes wrapper around Linux inotify.
+
+    `available()` is False on systems without inotify (e.g. macOS); callers
+    should fall back to polling or skip watching.
+    """
+
+    def __init__(self):
+        if not Inotify.available():
+            raise OSError("inotify não disponível neste sistema")
+        self.fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        self._paths: Dict[int, str] = {}
+
+    @staticmethod
+    def available() -> bool:
+        return _libc is not None
+
+    def add_watch(self, path: str, mask: int) -> Optional[int]:
+        """Watch `path`; returns the watch descriptor or None when it cannot be watched."""
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            return None
+        self._paths[wd] = path
+        return wd
+
+    def remove_watch(self, wd: int):
+        _libc.inotify_rm_watch(self.fd, wd)
+        self._paths.pop(wd, None)
+
+    def watched(self) -> List[str]:
+        return list(self._paths.values())
+
+    def read(self, timeout: Optional[float] = None) -> List[InotifyEvent]:
+        """Wait up to `timeout` seconds and return the pending events."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            path = self._paths.get(wd)
+            if mask & IN_IGNORED:
+                self._paths.pop(wd, None)
+                continue
+            if path is not None:
+                events.append(InotifyEvent(path, name, mask, cookie))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+            self._paths.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,11 +1,11 @@
 import subprocess
 import tempfile
 import os
-import json
 import questionary
 from pathlib import Path
 from aedificator import console
 from aedificator.memory import Paths
+from .scanner import ProjectScanner
 
 
 class Pathing:
@@ -15,115 +15,10 @@ class Pathing:
     @staticmethod
     def auto_detect_folders():
         """Automatically detect the three main folders based on patterns.
-        Searches /home/devel first, then falls back to entire /home directory.
+        Searches /home/devel first, then the user's home, then the rest of /home.
         Returns a dict with keys: superleme_path, sl_phoenix_path, extension_path.
         """
-        detected = {
-            "superleme_path": None,
-            "sl_phoenix_path": None,
-            "extension_path": None,
-        }
-
-        # Search locations in priority order
-        # Start with user's home directory for better detection after moves
-        user_home = os.path.expanduser("~")
-        search_roots = ["/home/devel", user_home, "/home"]
-
-        for search_root in search_roots:
-            if not os.path.exists(search_root):
-                continue
-
-            # Only search if we haven't found all folders yet
-            if all(detected.values()):
-                break
-
-            # Search for superleme folder (inside zotonic/apps_user)
-            if not detected["superleme_path"]:
-                try:
-                    for root, dirs, files in os.walk(search_root):
-                        # Limit depth to avoid excessive searching
-                        depth = root[len(search_root) :].count(os.sep)
-                        if depth > 5:
-                            dirs[:] = []
-                            continue
-
-                        if root.endswith(
-                            os.path.join("zotonic", "apps_user", "superleme")
-                        ):
-                            detected["superleme_path"] = root
-                            break
-                except PermissionError:
-                    pass
-
-            # Search for sl_phoenix folder (Phoenix/Elixir project)
-            if not detected["sl_phoenix_path"]:
-                try:
-                    for root, dirs, files in os.walk(search_root):
-                        depth = root[len(search_root) :].count(os.sep)
-                        if depth > 3:
-                            dirs[:] = []
-                            continue
-
-                        # Check if directory name contains phoenix or is sl_phoenix
-                        if (
-                            "phoenix" in os.path.basename(root).lower()
-                            or os.path.basename(root) == "sl_phoenix"
-                        ):
-                            # Verify it's a Phoenix project
-                            if "mix.exs" in files or "lib" in dirs:
-                                detected["sl_phoenix_path"] = root
-                                break
-                except PermissionError:
-                    pass
-
-            # Search for extension folder (Chrome extension - specifically plugin-simulacao)
-            if not detected["extension_path"]:
-                try:
-                    for root, dirs, files in os.walk(search_root):
-                        depth = root[len(search_root) :].count(os.sep)
-                        if depth > 3:
-                            dirs[:] = []
-                            continue
-
-                        # Check if it's the plugin-simulacao Chrome extension
-                        if "package.json" in files:
-                            try:
-                                pkg_path = os.path.join(root, "package.json")
-                                with open(pkg_path, "r") as f:
-                                    pkg = json.load(f)
-
-                                    # Check for specific Chrome extension indicators
-                                    name = pkg.get("name", "")
-                                    description = pkg.get("description", "").lower()
-                                    dev_deps = pkg.get("devDependencies", {})
-
-                                    # Match plugin-simulacao or similar Chrome extension projects
-                                    is_chrome_extension = (
-                                        "plugin" in name.lower()
-                                        or (
-                                            "chrome" in description
-                                            and "extension" in description
-                                        )
-                                        or "@types/chrome" in dev_deps
-                                        or "chrome-types" in dev_deps
-                                    )
-
-                                    # Also verify popup.html exists (Chrome extension specific)
-                                    has_popup = "popup.html" in files
-
-                                    if is_chrome_extension and has_popup:
-                                        detected["extension_path"] = root
-                                        break
-                            except (json.JSONDecodeError, IOError):
-                                pass
-                except PermissionError:
-                    pass
-
-            # If we found everything in /home/devel, no need to search /home
-            if all(detected.values()):
-                break
-
-        return detected
+        return ProjectScanner().scan()
 
     @staticmethod
     def select_folder():
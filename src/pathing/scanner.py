@@ -0,0 +1,200 @@
+import json
+import os
+import queue
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Directories that never contain the projects we look for and are usually huge
+SKIP_DIRS = frozenset({
+    "node_modules", "_build", "deps", ".git", ".hg", ".svn",
+    ".cache", "__pycache__", ".venv", "venv", ".elixir_ls", ".hex", ".mix",
+    ".npm", ".cargo", ".rustup", ".asdf", ".local", ".vscode-server",
+})
+
+# Maximum depth (below the search root) at which each project is looked for
+MAX_DEPTH = {
+    "superleme_path": 5,
+    "sl_phoenix_path": 3,
+    "extension_path": 3,
+}
+
+_SUPERLEME_SUFFIX = os.sep + os.path.join("zotonic", "apps_user", "superleme")
+
+
+def default_search_roots() -> List[str]:
+    """Search locations in priority order (user's home before the whole /home)."""
+    return ["/home/devel", os.path.expanduser("~"), "/home"]
+
+
+def dedupe_roots(roots: List[str]) -> List[Tuple[str, List[str]]]:
+    """
+    Drop missing, repeated and already-covered roots.
+
+    Returns `(root, exclude)` pairs in priority order, where `exclude` lists the
+    higher-priority roots nested inside `root`, which are skipped when scanning it.
+    A nested root is always scanned with a larger depth budget than its parent
+    would give it, so skipping it loses nothing.
+    """
+    result: List[Tuple[str, List[str]]] = []
+    for root in roots:
+        root = os.path.normpath(os.path.abspath(root))
+        if not os.path.isdir(root):
+            continue
+        if any(root == seen or root.startswith(seen.rstrip(os.sep) + os.sep) for seen, _ in result):
+            continue
+        nested = [seen for seen, _ in result if seen.startswith(root.rstrip(os.sep) + os.sep)]
+        result.append((root, nested))
+    return result
+
+
+def _is_chrome_extension(package_json: str) -> bool:
+    try:
+        with open(package_json, "r") as f:
+            pkg = json.load(f)
+    except (json.JSONDecodeError, IOError, UnicodeDecodeError):
+        return False
+    if not isinstance(pkg, dict):
+        return False
+
+    name = str(pkg.get("name", ""))
+    description = str(pkg.get("description", "")).lower()
+    dev_deps = pkg.get("devDependencies", {}) or {}
+    return (
+        "plugin" in name.lower()
+        or ("chrome" in description and "extension" in description)
+        or "@types/chrome" in dev_deps
+        or "chrome-types" in dev_deps
+    )
+
+
+def match_directory(path: str, depth: int, files: set, dirs: set, wanted: set) -> List[str]:
+    """Return which of the `wanted` project keys `path` matches."""
+    found = []
+    if "superleme_path" in wanted and depth <= MAX_DEPTH["superleme_path"] and path.endswith(_SUPERLEME_SUFFIX):
+        found.append("superleme_path")
+
+    if "sl_phoenix_path" in wanted and depth <= MAX_DEPTH["sl_phoenix_path"]:
+        basename = os.path.basename(path)
+        if "phoenix" in basename.lower() and ("mix.exs" in files or "lib" in dirs):
+            found.append("sl_phoenix_path")
+
+    # popup.html is a cheap set lookup; only then is package.json read
+    if (
+        "extension_path" in wanted
+        and depth <= MAX_DEPTH["extension_path"]
+        and "popup.html" in files
+        and "package.json" in files
+        and _is_chrome_extension(os.path.join(path, "package.json"))
+    ):
+        found.append("extension_path")
+    return found
+
+
+def list_directory(path: str):
+    """Return (files, dirs) name sets of a directory; dirs include symlinks to directories."""
+    files = set()
+    dirs = set()
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                (dirs if entry.is_dir() else files).add(entry.name)
+            except OSError:
+                continue
+    return files, dirs
+
+
+def directory_matches(path: str, key: str) -> bool:
+    """Check whether `path` is still a valid location for project `key`."""
+    try:
+        files, dirs = list_directory(path)
+    except OSError:
+        return False
+    return key in match_directory(path, 0, files, dirs, {key})
+
+
+class ProjectScanner:
+    """
+    Single-pass search for the Superleme, Phoenix and extension folders.
+
+    Each directory is listed once with os.scandir and tested against all three
+    matchers. Directories are processed by a small pool of threads sharing a
+    work queue (scandir releases the GIL, so listings overlap). Roots are
+    scanned in priority order and the scan stops once every project is found.
+    """
+
+    def __init__(self, roots: Optional[List[str]] = None, workers: Optional[int] = None):
+        self.roots = roots if roots is not None else default_search_roots()
+        self.workers = workers or min(8, (os.cpu_count() or 2) * 2)
+        self.max_depth = max(MAX_DEPTH.values())
+
+    def scan(self, keys: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        """Search for `keys` (default: all three projects); missing ones map to None."""
+        detected: Dict[str, Optional[str]] = {key: None for key in (keys or MAX_DEPTH)}
+        for root, exclude in dedupe_roots(self.roots):
+            wanted = {key for key, value in detected.items() if value is None}
+            if not wanted:
+                break
+            for key, path in self._scan_root(root, set(exclude), wanted).items():
+                detected[key] = path
+        return detected
+
+    def _scan_root(self, root: str, exclude: set, wanted: set) -> Dict[str, str]:
+        """Scan one root; for each key keep the shallowest match (ties by path)."""
+        matches: Dict[str, Tuple[int, str]] = {}
+        lock = threading.Lock()
+        work: "queue.Queue[Optional[Tuple[str, int]]]" = queue.Queue()
+        work.put((root, 0))
+
+        def scan_directory(path: str, depth: int):
+            files = set()
+            dirs = set()
+            children = []
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir():
+                                dirs.add(entry.name)
+                                if (
+                                    depth < self.max_depth
+                                    and entry.name not in SKIP_DIRS
+                                    and not entry.is_symlink()
+                                    and entry.path not in exclude
+                                ):
+                                    children.append(entry.path)
+                            else:
+                                files.add(entry.name)
+                        except OSError:
+                            continue
+            except OSError:
+                return
+
+            found = match_directory(path, depth, files, dirs, wanted)
+            if found:
+                with lock:
+                    for key in found:
+                        if key not in matches or (depth, path) < matches[key]:
+                            matches[key] = (depth, path)
+            for child in children:
+                work.put((child, depth + 1))
+
+        def worker():
+            while True:
+                item = work.get()
+                try:
+                    if item is None:
+                        return
+                    scan_directory(*item)
+                finally:
+                    work.task_done()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        work.join()
+        for _ in threads:
+            work.put(None)
+        for thread in threads:
+            thread.join()
+
+        return {key: path for key, (_, path) in matches.items()}
@@ -1,5 +1,6 @@
 """Process management."""
 
 from .manager import ProcessManager
+from .sampler import ResourceSampler
 
-__all__ = ['ProcessManager']
+__all__ = ['ProcessManager', 'ResourceSampler']
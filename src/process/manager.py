@@ -5,18 +5,24 @@ import time
 from typing import List, Dict
 from aedificator import console
 from rich.live import Live
-from rich.layout import Layout
 from rich.panel import Panel
 from rich.text import Text
 from aedificator.paths import get_logs_dir
+from aedificator.profiling import profiled
 
 
 class ProcessManager:
     """Manages background processes and live output display."""
 
     @staticmethod
-    def display_live_output(process_info: List[Dict], safe_decode_fn):
-        """Display live output from multiple processes with split-screen layout."""
+    def display_live_output(process_info: List[Dict], safe_decode_fn, sampler=None, beam=None):
+        """
+        Display live output from multiple processes with split-screen layout.
+
+        With a ResourceSampler (processes added under their index in
+        process_info), panel titles also show CPU, RSS and I/O of each run.
+        With a BeamMonitor, a panel below them shows the Zotonic VM metrics.
+        """
         log_dir = get_logs_dir()
 
         log_files = []
@@ -28,15 +34,22 @@ class ProcessManager:
             log_files.append(log_filename)
             console.print(f"Log para {proc_info['name']}: {log_filename}")
 
+        # rich.layout pulls in rich.pretty and attrs; only needed once something runs
+        from rich.layout import Layout
+
         layout = Layout()
+        panes = layout
+        if beam is not None:
+            layout.split_column(Layout(name="processes"), Layout(name="beam", size=12))
+            panes = layout["processes"]
 
         if len(process_info) == 2:
-            layout.split_row(
+            panes.split_row(
                 Layout(name="left"),
                 Layout(name="right")
             )
         else:
-            layout.split_column(*[Layout(name=f"proc{i}") for i in range(len(process_info))])
+            panes.split_column(*[Layout(name=f"proc{i}") for i in range(len(process_info))])
 
         def read_output(proc_info):
             try:
@@ -44,6 +57,11 @@ class ProcessManager:
                     if not line_bytes:
                         break
 
+                    if 'first_output_at' not in proc_info:
+                        proc_info['first_output_at'] = time.perf_counter()
+                    proc_info['output_bytes'] = proc_info.get('output_bytes', 0) + len(line_bytes)
+                    proc_info['output_lines'] = proc_info.get('output_lines', 0) + 1
+
                     line_str = safe_decode_fn(line_bytes)
                     line_stripped = line_str.rstrip()
 
@@ -55,6 +73,9 @@ class ProcessManager:
                         proc_info['output'].pop(0)
             except Exception:
                 pass
+            proc_info['finished_at'] = time.perf_counter()
+            if sampler is not None:
+                sampler.finish(process_info.index(proc_info))
 
         threads = []
         for proc_info in process_info:
@@ -63,31 +84,39 @@ class ProcessManager:
             threads.append(thread)
 
         try:
-            with Live(layout, console=console, refresh_per_second=4) as live:
-                while any(p['process'].poll() is None for p in process_info):
-                    for idx, proc_info in enumerate(process_info):
-                        output_text = Text.from_ansi(
-                            "".join([line + "\n" for line in proc_info['output'][-30:]])
-                        )
-
-                        status = "Running" if proc_info['process'].poll() is None else f"Exited ({proc_info['process'].returncode})"
-                        status_style = "green" if proc_info['process'].poll() is None else "red"
-
-                        panel = Panel(
-                            output_text,
-                            title=f"[bold]{proc_info['name']}[/bold] - [{status_style}]{status}[/{status_style}]",
-                            subtitle=f"{proc_info['command']}",
-                            border_style="cyan" if proc_info['process'].poll() is None else "red"
-                        )
-
-                        if len(process_info) == 2:
-                            layout["left" if idx == 0 else "right"].update(panel)
-                        else:
-                            layout[f"proc{idx}"].update(panel)
-
-                    time.sleep(0.25)
-
-                time.sleep(1)
+            with profiled("live_output"):
+                with Live(layout, console=console, refresh_per_second=4) as live:
+                    while any(p['process'].poll() is None for p in process_info):
+                        for idx, proc_info in enumerate(process_info):
+                            output_text = Text.from_ansi(
+                                "".join([line + "\n" for line in proc_info['output'][-30:]])
+                            )
+
+                            status = "Running" if proc_info['process'].poll() is None else f"Exited ({proc_info['process'].returncode})"
+                            status_style = "green" if proc_info['process'].poll() is None else "red"
+
+                            title = f"[bold]{proc_info['name']}[/bold] - [{status_style}]{status}[/{status_style}]"
+                            if sampler is not None and proc_info['process'].poll() is None:
+                                title += f" | {sampler.describe(sampler.current(idx))}"
+
+                            panel = Panel(
+                                output_text,
+                                title=title,
+                                subtitle=f"{proc_info['command']}",
+                                border_style="cyan" if proc_info['process'].poll() is None else "red"
+                            )
+
+                            if len(process_info) == 2:
+                                layout["left" if idx == 0 else "right"].update(panel)
+                            else:
+                                layout[f"proc{idx}"].update(panel)
+
+                        if beam is not None:
+                            layout["beam"].update(Panel(beam.render(), title=beam.title(), border_style="magenta"))
+
+                        time.sleep(0.25)
+
+                    time.sleep(1)
 
         except KeyboardInterrupt:
             console.print("\n[warning]Interrompido pelo usuário[/warning]")
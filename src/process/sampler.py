@@ -0,0 +1,288 @@
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+_SIZE = re.compile(r'([\d.]+)\s*([kKMGT]?i?B)')
+_UNITS = {
+    "B": 1, "kB": 1000, "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3, "TB": 1000 ** 4,
+    "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3, "TiB": 1024 ** 4,
+}
+
+# How long to wait for `docker compose run` to create the container of a run
+CONTAINER_WAIT = 60
+
+
+def parse_size(text: str) -> int:
+    """'512MiB' -> bytes, as printed by docker stats."""
+    match = _SIZE.search(text or "")
+    if not match:
+        return 0
+    return int(float(match.group(1)) * _UNITS.get(match.group(2), 1))
+
+
+def format_bytes(value: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(value) < 1024 or unit == "GiB":
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+
+
+@dataclass
+class ResourceUsage:
+    """Latest sample of one run; CPU is in percent of one core (can exceed 100)."""
+    cpu: float = 0.0
+    rss: int = 0
+    processes: int = 0
+    read_rate: float = 0.0  # bytes/s
+    write_rate: float = 0.0
+    container_cpu: Optional[float] = None
+    container_mem: Optional[int] = None
+
+
+class _Tracked:
+    def __init__(self, pid: int, docker_service: Optional[str]):
+        self.pid = pid
+        self.docker_service = docker_service
+        self.usage = ResourceUsage()
+        self.cpu_times: Dict[int, int] = {}
+        self.io: Dict[int, tuple] = {}
+        self.peak_cpu = 0.0
+        self.peak_rss = 0
+        self.read_bytes = 0
+        self.write_bytes = 0
+        self.container_peak_cpu: Optional[float] = None
+        self.container_peak_mem: Optional[int] = None
+        self.done = False
+
+
+class ResourceSampler:
+    """
+    Samples CPU, RSS and disk I/O of whole process trees (children of a spawned
+    shell included) from /proc, plus `docker stats` of the container started by
+    a docker compose run. One thread walks /proc for every tracked run, so the
+    cost does not grow with the number of panels.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self._tracked: Dict[object, _Tracked] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def available() -> bool:
+        return os.path.isdir("/proc/self")
+
+    def add(self, key, pid: int, docker_service: Optional[str] = None):
+        """Track the process tree rooted at `pid`; `docker_service` also follows that compose service's one-off container."""
+        tracked = _Tracked(pid, docker_service)
+        with self._lock:
+            self._tracked[key] = tracked
+        if docker_service:
+            threading.Thread(target=self._follow_container, args=(tracked,), daemon=True,
+                             name=f"docker-stats-{docker_service}").start()
+
+    def start(self):
+        if self._thread is None and self.available():
+            self._thread = threading.Thread(target=self._run, daemon=True, name="resource-sampler")
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for tracked in self._tracked.values():
+            tracked.done = True
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+
+    def finish(self, key):
+        """Stop following one run (its process exited)."""
+        if key in self._tracked:
+            self._tracked[key].done = True
+
+    def current(self, key) -> Optional[ResourceUsage]:
+        tracked = self._tracked.get(key)
+        return tracked.usage if tracked else None
+
+    def peaks(self, key) -> Dict:
+        """Peak values of a run, named like the CommandRun columns."""
+        tracked = self._tracked.get(key)
+        if tracked is None:
+            return {}
+        return {
+            "peak_cpu": round(tracked.peak_cpu, 1),
+            "peak_rss": tracked.peak_rss,
+            "io_read_bytes": tracked.read_bytes,
+            "io_write_bytes": tracked.write_bytes,
+            "container_peak_cpu": tracked.container_peak_cpu,
+            "container_peak_mem": tracked.container_peak_mem,
+        }
+
+    @staticmethod
+    def describe(usage: Optional[ResourceUsage]) -> str:
+        """Short text for panel titles."""
+        if usage is None:
+            return ""
+        text = f"CPU {usage.cpu:.0f}% | RSS {format_bytes(usage.rss)} | I/O {format_bytes(usage.read_rate + usage.write_rate)}/s"
+        if usage.container_cpu is not None:
+            text += f" | container CPU {usage.container_cpu:.0f}% MEM {format_bytes(usage.container_mem or 0)}"
+        return text
+
+    # -- /proc -----------------------------------------------------------------
+
+    @staticmethod
+    def _read_stats() -> Dict[int, tuple]:
+        """pid -> (ppid, utime + stime in ticks, rss in bytes) for every process."""
+        stats = {}
+        with os.scandir("/proc") as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(f"/proc/{entry.name}/stat", "rb") as f:
+                        data = f.read()
+                except OSError:
+                    continue
+                # The command name may contain spaces and parentheses; fields start after the last ')'
+                fields = data[data.rfind(b")") + 2:].split()
+                try:
+                    stats[int(entry.name)] = (int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21]) * _PAGE_SIZE)
+                except (IndexError, ValueError):
+                    continue
+        return stats
+
+    @staticmethod
+    def _read_io(pid: int) -> Optional[tuple]:
+        try:
+            with open(f"/proc/{pid}/io") as f:
+                values = dict(line.split(": ") for line in f.read().splitlines())
+            return int(values["read_bytes"]), int(values["write_bytes"])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _sample(self, stats: Dict[int, tuple], elapsed: float):
+        children: Dict[int, list] = {}
+        for pid, (ppid, _, _) in stats.items():
+            children.setdefault(ppid, []).append(pid)
+
+        for tracked in list(self._tracked.values()):
+            if tracked.done:
+                continue
+            tree, pending = [], [tracked.pid]
+            while pending:
+                pid = pending.pop()
+                if pid in stats:
+                    tree.append(pid)
+                    pending.extend(children.get(pid, ()))
+
+            cpu_ticks = rss = read = write = 0
+            cpu_times, io = {}, {}
+            for pid in tree:
+                _, ticks, pid_rss = stats[pid]
+                previous = tracked.cpu_times.get(pid)
+                if previous is not None:
+                    cpu_ticks += ticks - previous
+                elif tracked.cpu_times:
+                    cpu_ticks += ticks  # started since the last sample
+                cpu_times[pid] = ticks
+                rss += pid_rss
+                counters = self._read_io(pid)
+                if counters:
+                    previous = tracked.io.get(pid, (0, 0))
+                    read += max(counters[0] - previous[0], 0)
+                    write += max(counters[1] - previous[1], 0)
+                    io[pid] = counters
+            first = not tracked.cpu_times
+            tracked.cpu_times, tracked.io = cpu_times, io
+
+            usage = tracked.usage
+            usage.processes = len(tree)
+            usage.rss = rss
+            tracked.peak_rss = max(tracked.peak_rss, rss)
+            tracked.read_bytes += read
+            tracked.write_bytes += write
+            if not first:
+                usage.cpu = cpu_ticks / _CLOCK_TICKS / elapsed * 100
+                usage.read_rate = read / elapsed
+                usage.write_rate = write / elapsed
+                tracked.peak_cpu = max(tracked.peak_cpu, usage.cpu)
+
+    def _run(self):
+        last = time.monotonic()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            try:
+                self._sample(self._read_stats(), max(now - last, 1e-3))
+            except OSError:
+                pass
+            last = now
+            self._stop.wait(self.interval)
+
+    # -- docker ----------------------------------------------------------------
+
+    def _container_ids(self, service: str) -> set:
+        result = subprocess.run(
+            ["docker", "ps", "-q", "--no-trunc",
+             "--filter", f"label=com.docker.compose.service={service}",
+             "--filter", "label=com.docker.compose.oneoff=True"],
+            capture_output=True, text=True, timeout=10
+        )
+        return set(result.stdout.split()) if result.returncode == 0 else set()
+
+    def _follow_container(self, tracked: _Tracked):
+        """Wait for the one-off container of this run, then stream its `docker stats`."""
+        try:
+            # Containers that already existed belong to other runs; `compose run`
+            # takes well over a second to create its own, so this baseline is safe
+            existing = self._container_ids(tracked.docker_service)
+            container = None
+            deadline = time.monotonic() + CONTAINER_WAIT
+            while not tracked.done and not self._stop.is_set() and time.monotonic() < deadline:
+                new = self._container_ids(tracked.docker_service) - existing
+                if new:
+                    container = sorted(new)[0]
+                    break
+                self._stop.wait(self.interval)
+            if container is None:
+                return
+
+            stats = subprocess.Popen(
+                ["docker", "stats", "--format", "{{json .}}", container],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return
+
+        try:
+            for line in stats.stdout:
+                if tracked.done or self._stop.is_set():
+                    break
+                # Streaming output clears the screen between refreshes
+                start = line.find("{")
+                if start < 0:
+                    continue
+                try:
+                    data = json.loads(line[start:])
+                except ValueError:
+                    continue
+                cpu = float(data.get("CPUPerc", "0").rstrip("%") or 0)
+                mem = parse_size(data.get("MemUsage", "").split("/")[0])
+                tracked.usage.container_cpu = cpu
+                tracked.usage.container_mem = mem
+                tracked.container_peak_cpu = max(tracked.container_peak_cpu or 0.0, cpu)
+                tracked.container_peak_mem = max(tracked.container_peak_mem or 0, mem)
+        finally:
+            stats.terminate()
+            try:
+                stats.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                stats.kill()
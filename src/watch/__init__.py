@@ -0,0 +1,6 @@
+"""Watch mode: incremental compile and hot code load of Superleme."""
+
+from .manager import WatchManager
+from .watcher import SourceWatcher
+
+__all__ = ['WatchManager', 'SourceWatcher']
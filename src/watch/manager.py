@@ -0,0 +1,162 @@
+import os
+import re
+import subprocess
+import time
+from typing import List, Optional
+from aedificator import console
+from erlang import ZotonicRpc, RpcError
+from .watcher import SourceWatcher
+
+ERLANG_SUFFIXES = (".erl", ".hrl")
+TEMPLATE_SUFFIXES = (".tpl", ".dtl")
+
+# The checkout is mounted here in the zotonic container (docker-compose.yml.j2)
+CONTAINER_ROOT = "/opt/zotonic"
+# rebar3 layout, relative to the Zotonic root
+LIB_DIR = os.path.join("_build", "default", "lib")
+
+_INCLUDE = re.compile(rb'^\s*-include(?:_lib)?\s*\(\s*"([^"]+)"', re.MULTILINE)
+
+
+class WatchManager:
+    """
+    Watch mode for Superleme: on every save, recompile only the changed modules
+    (and the modules including a changed header) inside the running node and
+    load them; changed templates flush the site caches.
+
+    Without a connection to the node, modules are compiled with erlc in the
+    running zotonic container (or locally) and left for z:ld() to load.
+    """
+
+    @staticmethod
+    def _node_path(path: str, zotonic_root: str, use_docker: bool) -> str:
+        """`path` as the Zotonic node sees it."""
+        if not use_docker:
+            return path
+        return CONTAINER_ROOT + "/" + os.path.relpath(path, zotonic_root).replace(os.sep, "/")
+
+    @staticmethod
+    def _dependents(header: str, app_path: str) -> List[str]:
+        """.erl files of the app that include `header`."""
+        name = os.path.basename(header).encode()
+        dependents = []
+        for dirpath, dirnames, filenames in os.walk(app_path):
+            dirnames[:] = [d for d in dirnames if d not in ("_build", ".git", "node_modules")]
+            for filename in filenames:
+                if not filename.endswith(".erl"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    with open(path, "rb") as f:
+                        includes = _INCLUDE.findall(f.read())
+                except OSError:
+                    continue
+                if any(os.path.basename(include) == name for include in includes):
+                    dependents.append(path)
+        return dependents
+
+    @staticmethod
+    def _modules(changed: List[str], app_path: str) -> List[str]:
+        sources = set()
+        for path in changed:
+            if path.endswith(".erl") and os.path.exists(path):
+                sources.add(path)
+            elif path.endswith(".hrl"):
+                sources.update(WatchManager._dependents(path, app_path))
+        return sorted(sources)
+
+    @staticmethod
+    def _container(service: str = "zotonic") -> Optional[str]:
+        """ID of a running container of the compose service (the one-off `compose run` included)."""
+        try:
+            result = subprocess.run(
+                ["docker", "ps", "-q", "--filter", f"label=com.docker.compose.service={service}"],
+                capture_output=True, text=True, timeout=10
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        ids = result.stdout.split()
+        return ids[0] if result.returncode == 0 and ids else None
+
+    @staticmethod
+    def _erlc(sources: List[str], app_path: str, zotonic_root: str, use_docker: bool) -> bool:
+        """Compile with erlc into the app's ebin, in the running container or locally."""
+        app = os.path.basename(app_path.rstrip(os.sep))
+        command = [
+            "erlc", "+debug_info",
+            "-o", os.path.join(LIB_DIR, app, "ebin"),
+            "-I", os.path.relpath(os.path.join(app_path, "include"), zotonic_root),
+            "-I", LIB_DIR,
+        ] + [os.path.relpath(source, zotonic_root) for source in sources]
+        env = dict(os.environ, ERL_LIBS=LIB_DIR)  # parse transforms and behaviours of the deps
+
+        if use_docker:
+            container = WatchManager._container()
+            if container is None:
+                console.print("[error]Container zotonic não está em execução[/error]")
+                return False
+            command = ["docker", "exec", "-w", CONTAINER_ROOT, "-e", f"ERL_LIBS={LIB_DIR}", container] + command
+
+        try:
+            result = subprocess.run(command, cwd=zotonic_root, env=env, capture_output=True, text=True, errors="replace")
+        except OSError as e:
+            console.print(f"[error]Não foi possível executar erlc: {e}[/error]")
+            return False
+        output = (result.stdout + result.stderr).strip()
+        if output:
+            console.print(output, markup=False, highlight=False)
+        return result.returncode == 0
+
+    @staticmethod
+    def _apply(batch: List[str], rpc: ZotonicRpc, superleme_path: str, zotonic_root: str, use_docker: bool):
+        started = time.perf_counter()
+        console.print(f"[info]Alterado: {', '.join(os.path.relpath(p, superleme_path) for p in batch)}[/info]")
+
+        sources = WatchManager._modules(batch, superleme_path)
+        app = os.path.basename(superleme_path.rstrip(os.sep))
+        outdir = WatchManager._node_path(os.path.join(zotonic_root, LIB_DIR, app, "ebin"), zotonic_root, use_docker)
+        include = WatchManager._node_path(os.path.join(superleme_path, "include"), zotonic_root, use_docker)
+
+        pending = list(sources)
+        while pending:
+            source = pending[0]
+            module = os.path.basename(source)[:-len(".erl")]
+            try:
+                result = rpc.execute("recompile", module=module,
+                                     source=WatchManager._node_path(source, zotonic_root, use_docker),
+                                     outdir=outdir, include=include)
+            except RpcError as e:
+                console.print(f"[warning]Sem conexão com {rpc.node_name} ({e}); compilando com erlc[/warning]")
+                if WatchManager._erlc(pending, superleme_path, zotonic_root, use_docker):
+                    console.print("[success]Compilado; carregue no shell do Zotonic com z:ld().[/success]")
+                break
+            if result == ["ok", module]:
+                console.print(f"[success]{module} recompilado e carregado[/success]")
+            else:
+                console.print(f"[error]{module}: erro de compilação (detalhes no console do nó Zotonic)[/error]")
+            pending.pop(0)
+
+        if any(path.endswith(TEMPLATE_SUFFIXES) for path in batch):
+            try:
+                rpc.execute("flush")
+                console.print("[success]Caches do site limpos (templates)[/success]")
+            except RpcError as e:
+                console.print(f"[warning]Templates alterados, mas sem conexão para limpar caches: {e}[/warning]")
+
+        console.print(f"Pronto em {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    @staticmethod
+    def run(superleme_path: str, zotonic_root: str, use_docker: bool, erlang=None):
+        """Watch until Ctrl+C."""
+        if not SourceWatcher.available():
+            console.print("[error]inotify não disponível neste sistema; modo watch requer Linux[/error]")
+            return
+
+        rpc = ZotonicRpc(erlang)
+        with SourceWatcher(superleme_path, ERLANG_SUFFIXES + TEMPLATE_SUFFIXES) as watcher:
+            console.print(f"[info]Observando {superleme_path} ({watcher.directories()} diretórios); Ctrl+C para sair[/info]")
+            try:
+                for batch in watcher.batches():
+                    WatchManager._apply(batch, rpc, superleme_path, zotonic_root, use_docker)
+            except KeyboardInterrupt:
+                console.print("\n[info]Modo watch encerrado[/info]")
@@ -0,0 +1,76 @@
+import os
+import time
+from typing import Iterator, List, Set
+from pathing.inotify import (
+    Inotify, IN_CLOSE_WRITE, IN_CREATE, IN_DELETE, IN_ISDIR, IN_MOVED_TO, IN_ONLYDIR
+)
+
+# Quiet time that ends a batch (an editor save is several events in a few ms)
+DEBOUNCE = 0.1
+# A batch is processed after this long even if events keep coming (git checkout, formatter runs)
+MAX_BATCH_DELAY = 1.0
+
+SKIP_DIRS = {"_build", ".git", "node_modules", "deps", ".rebar3", "_checkouts", "logs"}
+
+_FILE_EVENTS = IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE
+_DIR_EVENTS = IN_CREATE | IN_MOVED_TO
+
+
+class SourceWatcher:
+    """
+    Recursive inotify watch of a source tree, yielding debounced batches of
+    changed files with the given suffixes. Directories created later are
+    watched as they appear.
+    """
+
+    def __init__(self, root: str, suffixes: tuple):
+        self.root = root
+        self.suffixes = suffixes
+        self.inotify = Inotify()
+        self._add_tree(root)
+
+    @staticmethod
+    def available() -> bool:
+        return Inotify.available()
+
+    def _add_tree(self, top: str):
+        for dirpath, dirnames, _ in os.walk(top):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+            self.inotify.add_watch(dirpath, _FILE_EVENTS | _DIR_EVENTS | IN_ONLYDIR)
+
+    def directories(self) -> int:
+        return len(self.inotify.watched())
+
+    def batches(self) -> Iterator[List[str]]:
+        """Yield sorted lists of changed (or deleted) files; runs until the watch is closed."""
+        pending: Set[str] = set()
+        first = last = 0.0
+        while self.inotify.fd >= 0:
+            timeout = None if not pending else max(0.0, min(last + DEBOUNCE, first + MAX_BATCH_DELAY) - time.monotonic())
+            for event in self.inotify.read(timeout=timeout):
+                path = os.path.join(event.path, event.name)
+                if event.mask & IN_ISDIR:
+                    if event.mask & _DIR_EVENTS and event.name not in SKIP_DIRS and not event.name.startswith("."):
+                        self._add_tree(path)
+                    continue
+                if not event.name.endswith(self.suffixes) or event.name.startswith(".#"):
+                    continue
+                now = time.monotonic()
+                if not pending:
+                    first = now
+                pending.add(path)
+                last = now
+
+            now = time.monotonic()
+            if pending and (now >= last + DEBOUNCE or now >= first + MAX_BATCH_DELAY):
+                batch, pending = sorted(pending), set()
+                yield batch
+
+    def close(self):
+        self.inotify.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()